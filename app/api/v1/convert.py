@@ -1,43 +1,222 @@
 import io
 import time
 import uuid
+from collections.abc import Iterator
 from typing import cast
 from fastapi import APIRouter, Depends, File, Form, HTTPException, Request, status, UploadFile
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import StreamingResponse
 
+from app.builders.formats import DEFAULT_EXPORT_FORMAT, ExportFormat, get_export_format
 from app.config import settings
+from app.core.cancellation import CancellationToken
+from app.logging_config import get_logger
 from app.dependencies import (
+    get_disconnect_token,
     get_or_create_current_user,
+    get_or_create_current_user_async,
     get_user_repo,
-    get_conversion_repo,
+    get_async_conversion_repo,
     get_audit_repo,
+    get_conversion_repo,
     get_conversion_service,
+    get_unit_of_work,
+    get_usage_repo,
 )
 from app.models.user import User
 from app.models.conversion import Conversion
 from app.repositories.user_repository import UserRepository
-from app.repositories.conversion_repository import ConversionRepository
+from app.repositories.conversion_repository import AsyncConversionRepository, ConversionRepository
 from app.repositories.audit_log_repository import AuditLogRepository
-from app.services.conversion import ConversionService, ConversionError
-from app.services.usage_limits import check_can_convert, UsageLimitExceeded
+from app.repositories.usage_counter_repository import UsageCounterRepository
 from app.services.audit import log_audit
+from app.services.conversion import ConversionService, ConversionError
+from app.services.conversion_jobs import ConversionJob, JobQueueFull, get_job_runner
+from app.services.usage_limits import (
+    QuotaReservation,
+    UsageLimitExceeded,
+    check_can_convert,
+    release_conversion,
+    reserve_conversion,
+)
+from app.policies import get_usage_policy
 from app.services import download_cache
-from app.services.page_selection import parse_pages, validate_pages
+from app.services.page_selection import format_pages, parse_pages, validate_pages
+from app.services.unit_of_work import ConversionUnitOfWork
+from app.services.upload import PdfUpload, UploadTooLarge, read_pdf_upload
+from app.schemas.conversion import ConversionJobStatus
+from app.strategies.table_extraction import ParsedDocument
 
 router = APIRouter()
+logger = get_logger("app.convert")
 
 ALLOWED_CONTENT_TYPE = "application/pdf"
 
 
+def _read_upload(file: UploadFile, detail_as_message: bool = False) -> PdfUpload:
+    """Spool the upload in chunks, rejecting with 413 as soon as it crosses max_pdf_bytes."""
+    try:
+        return read_pdf_upload(file, settings.max_pdf_bytes)
+    except UploadTooLarge as e:
+        raise HTTPException(
+            status_code=status.HTTP_413_CONTENT_TOO_LARGE,
+            detail={"message": str(e)} if detail_as_message else str(e),
+        )
+
+
+def _resolve_format(output_format: str | None) -> ExportFormat:
+    """Validate the requested output format before any work is done on the upload."""
+    try:
+        fmt = get_export_format(output_format)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    if not fmt.available:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Output format '{fmt.name}' is not available on this server.",
+        )
+    return fmt
+
+
+def _resolve_on_timeout(on_timeout: str) -> bool:
+    """`on_timeout` request option: True to accept a partial result when the budget runs out."""
+    value = (on_timeout or "error").lower()
+    if value not in ("error", "partial"):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="on_timeout must be 'error' or 'partial'.",
+        )
+    return value == "partial"
+
+
+def _attachment_name(filename: str, fmt: ExportFormat) -> str:
+    return (filename.rsplit(".", 1)[0] if "." in filename else filename) + "." + fmt.extension
+
+
+def _open_for_conversion(
+    conversion_service: ConversionService,
+    upload: PdfUpload,
+    content_type: str | None,
+    pages: str | None,
+    plan: str,
+) -> tuple[ParsedDocument, list[int] | None]:
+    """Open and validate the PDF once and resolve the page selection for the user's plan.
+
+    The document takes ownership of `upload`. Raises HTTPException on invalid input; the
+    returned document must be closed by the caller.
+    """
+    try:
+        document = conversion_service.open_document(upload.buffer)
+    except ConversionError as e:
+        upload.close()
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=e.message)
+    document.resources.callback(upload.close)
+
+    try:
+        # Validate PDF early (corruption, absolute page cap)
+        try:
+            conversion_service.validate_pdf(document, content_type, max_pages=settings.max_pdf_pages)
+            total_pages = conversion_service.get_page_count(document)
+        except ConversionError as e:
+            if e.code == "FILE_TOO_LARGE":
+                raise HTTPException(status_code=status.HTTP_413_CONTENT_TOO_LARGE, detail=e.message)
+            if e.code == "PAGE_LIMIT_EXCEEDED":
+                raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=e.message)
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=e.message)
+
+        free_max_pages = settings.free_max_pdf_pages
+        selected_pages: list[int] | None = None
+        if pages and pages.strip():
+            try:
+                sel = parse_pages(pages).pages
+                validate_pages(sel, total_pages=total_pages, max_selected=free_max_pages if plan.upper() != "PRO" else None)
+                selected_pages = sel
+            except ValueError:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail={"message": "Invalid page selection.", "total_pages": total_pages},
+                )
+        else:
+            if plan.upper() != "PRO" and total_pages > free_max_pages:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail={
+                        "message": f"Free plan supports up to {free_max_pages} pages per conversion. Select pages or upgrade to Pro.",
+                        "total_pages": total_pages,
+                        "max_pages": free_max_pages,
+                    },
+                )
+    except HTTPException:
+        document.close()
+        raise
+    return document, selected_pages
+
+
+def _stream_and_record(
+    chunks: Iterator[bytes],
+    *,
+    conversion: Conversion,
+    fmt: ExportFormat,
+    start: float,
+    uow: ConversionUnitOfWork,
+    reservation: QuotaReservation,
+    ip: str | None,
+    user_agent: str | None,
+    cancellation: CancellationToken | None = None,
+) -> Iterator[bytes]:
+    """
+    Pass output chunks through to the response. The outcome is recorded once the output
+    is fully rendered: a render error is a failed conversion and a client that goes away
+    (disconnect, interrupted download) a cancelled one, not a success with a truncated file.
+    Only a success keeps the quota slot in `reservation`. The outcome is staged in `uow`,
+    which commits it after the response has been sent.
+    """
+    user_id = cast(uuid.UUID, conversion.user_id)
+
+    def record(status_str: str, action: str, error_message: str | None = None) -> None:
+        conversion.status = status_str
+        if error_message is not None:
+            conversion.error_message = error_message
+        conversion.duration_ms = int((time.perf_counter() - start) * 1000)
+        uow.add_conversion(conversion)
+        if status_str != "success":
+            uow.release_quota(reservation)
+        uow.audit(user_id, action, ip=ip, user_agent=user_agent)
+
+    try:
+        for chunk in chunks:
+            if cancellation is not None and cancellation.cancelled:
+                # Nobody is reading: stop rendering instead of finishing the file.
+                record("cancelled", "CONVERSION_CANCELLED", cancellation.reason)
+                return
+            yield chunk
+    except GeneratorExit:
+        record("cancelled", "CONVERSION_CANCELLED", "Download interrupted before the file was complete.")
+        raise
+    except BaseException as e:
+        logger.exception("Rendering output failed conversion=%s format=%s", conversion.id, fmt.name)
+        record("failed", "CONVERSION_FAILED", (str(e) or type(e).__name__)[:1024])
+        raise
+    record("success", "CONVERSION_SUCCESS")
+
+
+def _client_meta(request: Request) -> tuple[str | None, str | None]:
+    ip = request.client.host if request.client else None
+    user_agent = request.headers.get("user-agent")
+    if "x-forwarded-for" in request.headers:
+        ip = request.headers["x-forwarded-for"].split(",")[0].strip()
+    return ip, user_agent
+
+
 @router.post("/convert/pdf-info")
 def pdf_info(
     file: UploadFile = File(...),
     current_user: User = Depends(get_or_create_current_user),
-    conversion_repo: ConversionRepository = Depends(get_conversion_repo),
+    usage_repo: UsageCounterRepository = Depends(get_usage_repo),
     conversion_service: ConversionService = Depends(get_conversion_service),
 ):
     """Inspect a PDF (page count) to drive UI decisions (free/pro)."""
-    check_can_convert(current_user, conversion_repo)
+    check_can_convert(current_user, usage_repo)
 
     if file.content_type and file.content_type.lower() != ALLOWED_CONTENT_TYPE:
         raise HTTPException(
@@ -45,18 +224,17 @@ def pdf_info(
             detail={"message": "Only application/pdf is accepted."},
         )
 
-    content = file.file.read()
-    if len(content) > settings.max_pdf_bytes:
-        raise HTTPException(
-            status_code=status.HTTP_413_REQUEST_ENTITY,
-            detail={
-                "message": f"File too large. Maximum size is {settings.max_pdf_bytes // (1024 * 1024)} MB.",
-            },
-        )
+    upload = _read_upload(file, detail_as_message=True)
 
-    # Absolute validation (corruption, absolute page cap)
-    conversion_service.validate_pdf(content, file.content_type, max_pages=settings.max_pdf_pages)
-    total_pages = conversion_service.get_page_count(content)
+    # Absolute validation (corruption, encryption, absolute page cap). Only the document
+    # structure is probed; no page is parsed here.
+    try:
+        with upload, conversion_service.open_document(upload.buffer) as document:
+            conversion_service.validate_pdf(document, file.content_type, max_pages=settings.max_pdf_pages)
+            total_pages = conversion_service.get_page_count(document)
+    except ConversionError as e:
+        code = status.HTTP_413_CONTENT_TOO_LARGE if e.code == "FILE_TOO_LARGE" else status.HTTP_400_BAD_REQUEST
+        raise HTTPException(status_code=code, detail={"message": e.message})
 
     plan = cast(str, current_user.plan)
     free_max = settings.free_max_pdf_pages
@@ -78,21 +256,36 @@ def pdf_to_excel(
     request: Request,
     file: UploadFile = File(...),
     pages: str | None = Form(None),
+    output_format: str = Form(DEFAULT_EXPORT_FORMAT, alias="format"),
+    on_timeout: str = Form("error"),
     current_user: User = Depends(get_or_create_current_user),
     user_repo: UserRepository = Depends(get_user_repo),
-    conversion_repo: ConversionRepository = Depends(get_conversion_repo),
     audit_repo: AuditLogRepository = Depends(get_audit_repo),
+    usage_repo: UsageCounterRepository = Depends(get_usage_repo),
+    uow: ConversionUnitOfWork = Depends(get_unit_of_work),
     conversion_service: ConversionService = Depends(get_conversion_service),
+    cancellation: CancellationToken = Depends(get_disconnect_token),
 ):
-    """Accept PDF upload, return XLSX stream. Does not store PDF."""
+    """
+    Accept PDF upload, return XLSX stream. Does not store PDF.
+    `format` selects another output: csv-zip, parquet or arrow (Arrow IPC stream).
+    If the client disconnects, extraction stops at the next page and the conversion is
+    recorded as cancelled.
+    Extraction has a time budget by plan: past it, `on_timeout=error` (default) answers 504
+    and `on_timeout=partial` returns the finished pages, listing the rest in X-Missing-Pages.
+    Only the quota reservation is committed during the request; the conversion row, outcome
+    audit event and any quota release are written in one transaction after the response.
+    """
     user_id = cast(uuid.UUID, current_user.id)
-    ip = request.client.host if request.client else None
-    user_agent = request.headers.get("user-agent")
-    if "x-forwarded-for" in request.headers:
-        ip = request.headers["x-forwarded-for"].split(",")[0].strip()
+    ip, user_agent = _client_meta(request)
+    fmt = _resolve_format(output_format)
+    allow_partial = _resolve_on_timeout(on_timeout)
+    time_budget_sec = get_usage_policy(cast(str, current_user.plan)).conversion_time_budget_sec()
 
+    # Not part of the outcome: goes through the buffered audit writer.
     log_audit(audit_repo, user_id, "CONVERSION_REQUEST", ip=ip, user_agent=user_agent)
-    check_can_convert(current_user, conversion_repo)
+    # Cheap early rejection; the slot itself is reserved once the upload is validated.
+    check_can_convert(current_user, usage_repo)
 
     if file.content_type and file.content_type.lower() != ALLOWED_CONTENT_TYPE:
         raise HTTPException(
@@ -100,161 +293,300 @@ def pdf_to_excel(
             detail="Only application/pdf is accepted.",
         )
 
-    content = file.file.read()
-    size_bytes = len(content)
+    upload = _read_upload(file)
+    size_bytes = upload.size
     filename = file.filename or "document.pdf"
 
-    if size_bytes > settings.max_pdf_bytes:
-        raise HTTPException(
-            status_code=status.HTTP_413_REQUEST_ENTITY,
-            detail=f"File too large. Maximum size is {settings.max_pdf_bytes // (1024 * 1024)} MB.",
-        )
+    document, selected_pages = _open_for_conversion(
+        conversion_service, upload, file.content_type, pages, cast(str, current_user.plan)
+    )
 
-    # Validate PDF early (corruption, absolute page cap)
-    try:
-        conversion_service.validate_pdf(content, file.content_type, max_pages=settings.max_pdf_pages)
-        total_pages = conversion_service.get_page_count(content)
-    except ConversionError as e:
-        if e.code == "FILE_TOO_LARGE":
-            raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY, detail=e.message)
-        if e.code == "PAGE_LIMIT_EXCEEDED":
-            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=e.message)
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=e.message)
+    with document:
+        reservation = reserve_conversion(current_user, usage_repo)
+        conversion_id = uuid.uuid4()
+        start = time.perf_counter()
+        status_str = "success"
+        duration_ms = 0
 
-    conversion_id = uuid.uuid4()
-    start = time.perf_counter()
-    status_str = "success"
-    duration_ms = 0
-    plan = cast(str, current_user.plan)
-    free_max_pages = settings.free_max_pdf_pages
-    selected_pages: list[int] | None = None
-    if pages and pages.strip():
         try:
-            sel = parse_pages(pages).pages
-            validate_pages(sel, total_pages=total_pages, max_selected=free_max_pages if plan.upper() != "PRO" else None)
-            selected_pages = sel
-        except ValueError:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail={"message": "Invalid page selection.", "total_pages": total_pages},
+            chunks, duration_sec = conversion_service.convert_to_excel_stream(
+                document,
+                filename,
+                content_type=file.content_type,
+                pages=selected_pages,
+                output_format=fmt.name,
+                # Allow short-lived re-download from history UI (same bytes as the result cache).
+                on_complete=lambda data: download_cache.put(conversion_id, data, output_format=fmt.name),
+                cancellation=cancellation,
+                time_budget_sec=time_budget_sec,
+                allow_partial=allow_partial,
             )
-    else:
-        if plan.upper() != "PRO" and total_pages > free_max_pages:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail={
-                    "message": f"Free plan supports up to {free_max_pages} pages per conversion. Select pages or upgrade to Pro.",
-                    "total_pages": total_pages,
-                    "max_pages": free_max_pages,
-                },
+            duration_ms = int(duration_sec * 1000)
+        except ConversionError as e:
+            cancelled = e.code == "CANCELLED"
+            status_str = "cancelled" if cancelled else "failed"
+            error_message = (e.message or str(e))[:1024]
+            duration_ms = int((time.perf_counter() - start) * 1000)
+            uow.add_conversion(
+                Conversion(
+                    id=conversion_id,
+                    user_id=user_id,
+                    filename=filename,
+                    size_bytes=size_bytes,
+                    status=status_str,
+                    duration_ms=duration_ms,
+                    error_message=error_message,
+                )
             )
-
-    try:
-        xlsx_bytes, duration_sec = conversion_service.convert_to_excel(
-            content,
-            filename,
-            content_type=file.content_type,
-            pages=selected_pages,
-        )
-        duration_ms = int(duration_sec * 1000)
-    except ConversionError as e:
-        status_str = "failed"
-        error_message = (e.message or str(e))[:1024]
-        duration_ms = int((time.perf_counter() - start) * 1000)
-        conversion_repo.create(
-            Conversion(
-                id=conversion_id,
-                user_id=user_id,
-                filename=filename,
-                size_bytes=size_bytes,
-                status=status_str,
-                duration_ms=duration_ms,
-                error_message=error_message,
+            uow.release_quota(reservation)
+            action = "CONVERSION_CANCELLED" if cancelled else "CONVERSION_FAILED"
+            uow.audit(user_id, action, ip=ip, user_agent=user_agent)
+            if cancelled:
+                # Client Closed Request: nobody reads this, but it keeps access logs honest.
+                raise HTTPException(status_code=499, detail=e.message)
+            if e.code == "FILE_TOO_LARGE" or e.code == "PAGE_LIMIT_EXCEEDED":
+                raise HTTPException(
+                    status_code=status.HTTP_413_CONTENT_TOO_LARGE if e.code == "FILE_TOO_LARGE" else status.HTTP_400_BAD_REQUEST,
+                    detail=e.message,
+                )
+            if e.code == "DEADLINE_EXCEEDED":
+                raise HTTPException(
+                    status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+                    detail={"message": e.message, "missing_pages": format_pages(document.missing_pages)},
+                )
+            if e.code == "NO_TABLE_DETECTED":
+                raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=e.message)
+            raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=e.message)
+        except UsageLimitExceeded:
+            raise
+        except HTTPException:
+            raise
+        except Exception as e:
+            status_str = "failed"
+            error_message = str(e)[:1024]
+            duration_ms = int((time.perf_counter() - start) * 1000)
+            uow.add_conversion(
+                Conversion(
+                    id=conversion_id,
+                    user_id=user_id,
+                    filename=filename,
+                    size_bytes=size_bytes,
+                    status=status_str,
+                    duration_ms=duration_ms,
+                    error_message=error_message,
+                )
             )
-        )
-        log_audit(audit_repo, user_id, "CONVERSION_FAILED", ip=ip, user_agent=user_agent)
-        if e.code == "FILE_TOO_LARGE" or e.code == "PAGE_LIMIT_EXCEEDED":
+            uow.release_quota(reservation)
+            uow.audit(user_id, "CONVERSION_FAILED", ip=ip, user_agent=user_agent)
             raise HTTPException(
-                status_code=status.HTTP_413_REQUEST_ENTITY if e.code == "FILE_TOO_LARGE" else status.HTTP_400_BAD_REQUEST,
-                detail=e.message,
-            )
-        if e.code == "NO_TABLE_DETECTED":
-            raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=e.message)
-        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=e.message)
-    except UsageLimitExceeded:
-        raise
-    except HTTPException:
-        raise
-    except Exception as e:
-        status_str = "failed"
-        error_message = str(e)[:1024]
-        duration_ms = int((time.perf_counter() - start) * 1000)
-        conversion_repo.create(
-            Conversion(
-                id=conversion_id,
-                user_id=user_id,
-                filename=filename,
-                size_bytes=size_bytes,
-                status=status_str,
-                duration_ms=duration_ms,
-                error_message=error_message,
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Conversion failed. The PDF may be unsupported or corrupted.",
             )
-        )
-        log_audit(audit_repo, user_id, "CONVERSION_FAILED", ip=ip, user_agent=user_agent)
+
+    missing_pages = format_pages(document.missing_pages) if document.missing_pages else None
+    # Recorded (success or failed) once the output has been rendered and sent.
+    conversion = Conversion(
+        id=conversion_id,
+        user_id=user_id,
+        filename=filename,
+        size_bytes=size_bytes,
+        status=status_str,
+        duration_ms=duration_ms,
+        error_message=f"Time budget exceeded; pages not converted: {missing_pages}" if missing_pages else None,
+    )
+    out_name = _attachment_name(filename, fmt)
+    headers = {
+        "Content-Disposition": f'attachment; filename="{out_name}"',
+        "X-Conversion-Id": str(conversion_id),
+    }
+    if document.skipped_pages:
+        # Pages the pre-screen ruled out without table detection (to audit the heuristic).
+        headers["X-Skipped-Pages"] = format_pages(document.skipped_pages)
+    if missing_pages:
+        # Partial result (on_timeout=partial): these pages were not reached in time.
+        headers["X-Missing-Pages"] = missing_pages
+    return StreamingResponse(
+        _stream_and_record(
+            chunks,
+            conversion=conversion,
+            fmt=fmt,
+            start=start,
+            uow=uow,
+            reservation=reservation,
+            ip=ip,
+            user_agent=user_agent,
+            cancellation=cancellation,
+        ),
+        media_type=fmt.media_type,
+        headers=headers,
+    )
+
+
+@router.post("/convert/jobs", status_code=status.HTTP_202_ACCEPTED, response_model=ConversionJobStatus)
+def submit_conversion_job(
+    request: Request,
+    file: UploadFile = File(...),
+    pages: str | None = Form(None),
+    output_format: str = Form(DEFAULT_EXPORT_FORMAT, alias="format"),
+    on_timeout: str = Form("error"),
+    current_user: User = Depends(get_or_create_current_user),
+    conversion_repo: ConversionRepository = Depends(get_conversion_repo),
+    audit_repo: AuditLogRepository = Depends(get_audit_repo),
+    usage_repo: UsageCounterRepository = Depends(get_usage_repo),
+    uow: ConversionUnitOfWork = Depends(get_unit_of_work),
+    conversion_service: ConversionService = Depends(get_conversion_service),
+) -> ConversionJobStatus:
+    """
+    Queue a PDF to XLSX conversion and return its job id right away. Poll the job for progress.
+    The plan's time budget and `on_timeout` apply as in pdf-to-excel (see `missing_pages`).
+    """
+    user_id = cast(uuid.UUID, current_user.id)
+    ip, user_agent = _client_meta(request)
+    fmt = _resolve_format(output_format)
+    allow_partial = _resolve_on_timeout(on_timeout)
+
+    # Not part of the outcome: goes through the buffered audit writer.
+    log_audit(audit_repo, user_id, "CONVERSION_REQUEST", ip=ip, user_agent=user_agent)
+    check_can_convert(current_user, usage_repo)
+
+    if file.content_type and file.content_type.lower() != ALLOWED_CONTENT_TYPE:
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Conversion failed. The PDF may be unsupported or corrupted.",
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Only application/pdf is accepted.",
         )
 
-    conversion_repo.create(
+    upload = _read_upload(file)
+    filename = file.filename or "document.pdf"
+    document, selected_pages = _open_for_conversion(
+        conversion_service, upload, file.content_type, pages, cast(str, current_user.plan)
+    )
+    # The job holds a quota slot from now on; the runner records the outcome and releases
+    # the slot if the conversion fails.
+    try:
+        reservation = reserve_conversion(current_user, usage_repo)
+    except UsageLimitExceeded:
+        document.close()
+        raise
+    conversion_id = uuid.uuid4()
+    uow.add_conversion(
         Conversion(
             id=conversion_id,
             user_id=user_id,
             filename=filename,
-            size_bytes=size_bytes,
-            status=status_str,
-            duration_ms=duration_ms,
+            size_bytes=upload.size,
+            status="pending",
+            duration_ms=None,
             error_message=None,
         )
     )
-    log_audit(audit_repo, user_id, "CONVERSION_SUCCESS", ip=ip, user_agent=user_agent)
+    # The runner updates the pending row when the job ends, so it must exist before submit.
+    try:
+        uow.commit()
+    except Exception:
+        document.close()
+        release_conversion(reservation, usage_repo)
+        raise
+    try:
+        job = get_job_runner().submit(
+            document=document,
+            user_id=user_id,
+            filename=filename,
+            pages=selected_pages,
+            content_type=file.content_type,
+            size_bytes=upload.size,
+            conversion_id=conversion_id,
+            output_format=fmt.name,
+            ip=ip,
+            user_agent=user_agent,
+            time_budget_sec=get_usage_policy(cast(str, current_user.plan)).conversion_time_budget_sec(),
+            allow_partial=allow_partial,
+            reservation=reservation,
+        )
+    except JobQueueFull:
+        document.close()
+        conversion_repo.delete_by_id_and_user(conversion_id, user_id)
+        release_conversion(reservation, usage_repo)
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Conversion queue is full. Please retry shortly.",
+            headers={"Retry-After": "5"},
+        )
+    return ConversionJobStatus.model_validate(job, from_attributes=True)
 
-    # Allow short-lived re-download from history UI.
-    download_cache.put(conversion_id, xlsx_bytes)
 
-    out_name = (filename.rsplit(".", 1)[0] if "." in filename else filename) + ".xlsx"
-    return StreamingResponse(
-        io.BytesIO(xlsx_bytes),
-        media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-        headers={
-            "Content-Disposition": f'attachment; filename="{out_name}"',
-            "X-Conversion-Id": str(conversion_id),
-        },
-    )
+def _get_own_job(job_id: uuid.UUID, current_user: User) -> ConversionJob:
+    job = get_job_runner().store.get(str(job_id))
+    if not job or job.user_id != str(current_user.id):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job not found")
+    return job
+
+
+@router.get("/convert/jobs/{job_id}", response_model=ConversionJobStatus)
+def get_conversion_job(
+    job_id: uuid.UUID,
+    current_user: User = Depends(get_or_create_current_user),
+) -> ConversionJobStatus:
+    """Report job status and page progress."""
+    job = _get_own_job(job_id, current_user)
+    return ConversionJobStatus.model_validate(job, from_attributes=True)
+
+
+@router.get("/convert/jobs/{job_id}/result")
+def get_conversion_job_result(
+    job_id: uuid.UUID,
+    current_user: User = Depends(get_or_create_current_user),
+):
+    """Stream the output file of a finished job."""
+    job = _get_own_job(job_id, current_user)
+    if job.status == "failed":
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=job.error)
+    if job.status != "success":
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail={"message": "Conversion is not finished yet.", "status": job.status},
+        )
+    xlsx_bytes = get_job_runner().store.get_result(job.id)
+    if not xlsx_bytes:
+        raise HTTPException(
+            status_code=status.HTTP_410_GONE,
+            detail="Download expired. Please convert the PDF again.",
+        )
+
+    fmt = get_export_format(job.output_format)
+    out_name = _attachment_name(job.filename, fmt)
+    headers = {
+        "Content-Disposition": f'attachment; filename="{out_name}"',
+        "X-Conversion-Id": str(job.conversion_id),
+    }
+    if job.missing_pages:
+        headers["X-Missing-Pages"] = format_pages(job.missing_pages)
+    return StreamingResponse(io.BytesIO(xlsx_bytes), media_type=fmt.media_type, headers=headers)
 
 
 @router.get("/convert/{conversion_id}/download")
-def download_converted_xlsx(
+async def download_converted_xlsx(
     conversion_id: uuid.UUID,
-    current_user: User = Depends(get_or_create_current_user),
-    conversion_repo: ConversionRepository = Depends(get_conversion_repo),
+    current_user: User = Depends(get_or_create_current_user_async),
+    conversion_repo: AsyncConversionRepository = Depends(get_async_conversion_repo),
 ):
     """Re-download a recently converted XLSX (short-lived cache)."""
-    conv = conversion_repo.get_by_id(conversion_id)
+    conv = await conversion_repo.get_by_id(conversion_id)
     user_id = cast(uuid.UUID, current_user.id)
     if not conv or cast(uuid.UUID, conv.user_id) != user_id:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not found")
 
-    xlsx_bytes = download_cache.get(conversion_id)
-    if not xlsx_bytes:
+    # The cache may sit behind a blocking socket (local/redis backends) and decompresses.
+    cached = await run_in_threadpool(download_cache.get_item, conversion_id)
+    if not cached:
         raise HTTPException(
             status_code=status.HTTP_410_GONE,
             detail="Download expired. Please convert the PDF again.",
         )
 
-    out_name = (conv.filename.rsplit(".", 1)[0] if "." in conv.filename else conv.filename) + ".xlsx"
+    fmt = get_export_format(cached.output_format)
+    out_name = _attachment_name(conv.filename, fmt)
     return StreamingResponse(
-        io.BytesIO(xlsx_bytes),
-        media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+        io.BytesIO(cached.data),
+        media_type=fmt.media_type,
         headers={"Content-Disposition": f'attachment; filename="{out_name}"'},
     )
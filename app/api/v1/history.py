@@ -1,48 +1,91 @@
+import base64
+import json
+from datetime import datetime
 from fastapi import APIRouter, Depends, HTTPException, Query, status
-from typing import cast
+from typing import Literal, cast
 from uuid import UUID
 
-from app.dependencies import get_or_create_current_user, get_conversion_repo
+from app.dependencies import get_async_conversion_repo, get_or_create_current_user_async
+from app.models.conversion import Conversion
 from app.models.user import User
-from app.repositories.conversion_repository import ConversionRepository
+from app.repositories.conversion_repository import AsyncConversionRepository
 from app.schemas.conversion import ConversionItem, ConversionList
 
 router = APIRouter()
 
 
+def _encode_cursor(row: Conversion) -> str:
+    created_at = cast(datetime, row.created_at)
+    raw = json.dumps({"t": created_at.isoformat(), "id": str(row.id)}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> tuple[datetime, UUID]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        data = json.loads(raw)
+        return datetime.fromisoformat(data["t"]), UUID(data["id"])
+    except (ValueError, KeyError, TypeError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor.")
+
+
 @router.get("/history", response_model=ConversionList)
-def history(
-    current_user: User = Depends(get_or_create_current_user),
-    conversion_repo: ConversionRepository = Depends(get_conversion_repo),
+async def history(
+    current_user: User = Depends(get_or_create_current_user_async),
+    conversion_repo: AsyncConversionRepository = Depends(get_async_conversion_repo),
     limit: int = Query(20, ge=1, le=100),
-    offset: int = Query(0, ge=0),
+    cursor: str | None = Query(None, description="`next_cursor` of the previous page."),
+    offset: int = Query(0, ge=0, deprecated=True, description="Use `cursor`; deep offsets scan every skipped row."),
+    total: Literal["exact", "estimate", "none"] = Query(
+        "estimate", description="exact: COUNT(*); estimate: planner estimate; none: omit."
+    ),
 ):
-    """List conversions for the current user (Repository)."""
+    """List conversions for the current user, newest first (keyset pagination)."""
     user_id = cast(UUID, current_user.id)
-    total = conversion_repo.count_by_user(user_id)
-    rows = conversion_repo.list_by_user(user_id, limit=limit, offset=offset)
-    return ConversionList(items=[ConversionItem.model_validate(r) for r in rows], total=total)
+    before = _decode_cursor(cursor) if cursor else None
+    # One extra row tells whether there is a next page.
+    rows = await conversion_repo.list_by_user(
+        user_id, limit=limit + 1, offset=0 if before else offset, before=before
+    )
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    count: int | None = None
+    is_estimate = False
+    if before is None and offset == 0 and not has_more and total != "none":
+        count = len(rows)  # the whole history fits on the first page
+    elif total == "exact":
+        count = await conversion_repo.count_by_user(user_id)
+    elif total == "estimate":
+        count = await conversion_repo.estimate_count_by_user(user_id)
+        is_estimate = True
+    return ConversionList(
+        items=[ConversionItem.model_validate(r) for r in rows],
+        total=count,
+        total_is_estimate=is_estimate,
+        next_cursor=_encode_cursor(rows[-1]) if has_more else None,
+    )
 
 
 @router.delete("/history/{conversion_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_conversion(
+async def delete_conversion(
     conversion_id: UUID,
-    current_user: User = Depends(get_or_create_current_user),
-    conversion_repo: ConversionRepository = Depends(get_conversion_repo),
+    current_user: User = Depends(get_or_create_current_user_async),
+    conversion_repo: AsyncConversionRepository = Depends(get_async_conversion_repo),
 ):
     """Delete a single conversion if it belongs to the current user."""
     user_id = cast(UUID, current_user.id)
-    if not conversion_repo.delete_by_id_and_user(conversion_id, user_id):
+    if not await conversion_repo.delete_by_id_and_user(conversion_id, user_id):
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Conversion not found")
     return None
 
 
 @router.delete("/history", status_code=status.HTTP_200_OK)
-def delete_all_conversions(
-    current_user: User = Depends(get_or_create_current_user),
-    conversion_repo: ConversionRepository = Depends(get_conversion_repo),
+async def delete_all_conversions(
+    current_user: User = Depends(get_or_create_current_user_async),
+    conversion_repo: AsyncConversionRepository = Depends(get_async_conversion_repo),
 ):
     """Delete all conversions for the current user. Returns count deleted."""
     user_id = cast(UUID, current_user.id)
-    deleted = conversion_repo.delete_all_by_user(user_id)
+    deleted = await conversion_repo.delete_all_by_user(user_id)
     return {"deleted": deleted}
@@ -1,3 +1,18 @@
-from app.builders.excel_builder import ExcelExportBuilder
+from app.builders.base import ExportBuilder
+from app.builders.columnar import ArrowIpcExportBuilder, CsvZipExportBuilder, ParquetExportBuilder
+from app.builders.excel_builder import ExcelExportBuilder, WriteOnlyExcelExportBuilder
+from app.builders.formats import EXPORT_FORMATS, ExportFormat, get_export_format
+from app.builders.xlsx_stream import StreamingXlsxBuilder
 
-__all__ = ["ExcelExportBuilder"]
+__all__ = [
+    "ExportBuilder",
+    "ExcelExportBuilder",
+    "WriteOnlyExcelExportBuilder",
+    "StreamingXlsxBuilder",
+    "CsvZipExportBuilder",
+    "ParquetExportBuilder",
+    "ArrowIpcExportBuilder",
+    "EXPORT_FORMATS",
+    "ExportFormat",
+    "get_export_format",
+]
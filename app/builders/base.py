@@ -0,0 +1,28 @@
+"""Builder abstraction shared by all export formats (XLSX, CSV-zip, Parquet, Arrow)."""
+
+from abc import ABC, abstractmethod
+from collections.abc import Iterator
+from typing import Any
+
+
+class ExportBuilder(ABC):
+    """Build an export file step by step: sheets (one per page) holding tables."""
+
+    @abstractmethod
+    def add_sheet(self, name: str) -> "ExportBuilder":
+        """Start a new sheet; following tables belong to it."""
+        ...
+
+    @abstractmethod
+    def add_table(self, rows: list[list[Any]]) -> "ExportBuilder":
+        """Append a table (list of rows) to the current sheet."""
+        ...
+
+    @abstractmethod
+    def build(self) -> bytes:
+        """Return the whole file as bytes."""
+        ...
+
+    def iter_bytes(self) -> Iterator[bytes]:
+        """Yield the file in chunks. Builders that can stream override this."""
+        yield self.build()
@@ -0,0 +1,179 @@
+"""Builders for data-pipeline formats: CSV-in-zip, Parquet and Arrow IPC stream.
+
+Tables are kept as extracted rows until `iter_bytes()`, then written incrementally.
+Parquet and Arrow need `pyarrow` (optional extra `columnar`); it is imported lazily so
+the XLSX-only deployment does not have to install it.
+"""
+
+from __future__ import annotations
+
+import csv
+import io
+import re
+from collections.abc import Iterator
+from typing import Any
+
+from app.builders.base import ExportBuilder
+from app.builders.zip_stream import ChunkSink, iter_zip
+
+# Encode CSV text after this many rows so large tables never sit in one string.
+_CSV_ROWS_PER_PIECE = 512
+# Buffer this many rows before writing a Parquet row group.
+_PARQUET_ROW_GROUP_ROWS = 64 * 1024
+
+
+class _TableCollector(ExportBuilder):
+    """Collect (sheet name, rows) pairs; subclasses decide how to serialize them."""
+
+    def __init__(self) -> None:
+        self._tables: list[tuple[str, list[list[Any]]]] = []
+        self._sheet: str | None = None
+
+    def add_sheet(self, name: str) -> "_TableCollector":
+        self._sheet = name
+        return self
+
+    def add_table(self, rows: list[list[Any]]) -> "_TableCollector":
+        if not rows:
+            return self
+        if self._sheet is None:
+            self.add_sheet("Sheet")
+        self._tables.append((self._sheet, rows))
+        return self
+
+    def build(self) -> bytes:
+        return b"".join(self.iter_bytes())
+
+
+class CsvZipExportBuilder(_TableCollector):
+    """One CSV file per table inside a zip archive, e.g. `page_3_table_1.csv`."""
+
+    def __init__(self, deflate_level: int = 6) -> None:
+        super().__init__()
+        self._deflate_level = deflate_level
+
+    def _entry_names(self) -> Iterator[str]:
+        counters: dict[str, int] = {}
+        for sheet, _ in self._tables:
+            slug = re.sub(r"[^0-9A-Za-z]+", "_", sheet).strip("_").lower() or "sheet"
+            counters[slug] = counters.get(slug, 0) + 1
+            yield f"{slug}_table_{counters[slug]}.csv"
+
+    @staticmethod
+    def _iter_csv(rows: list[list[Any]]) -> Iterator[bytes]:
+        buf = io.StringIO()
+        writer = csv.writer(buf, lineterminator="\r\n")
+        for i, row in enumerate(rows, start=1):
+            writer.writerow(["" if cell is None else cell for cell in row])
+            if i % _CSV_ROWS_PER_PIECE == 0:
+                yield buf.getvalue().encode("utf-8")
+                buf.seek(0)
+                buf.truncate()
+        if buf.tell():
+            yield buf.getvalue().encode("utf-8")
+
+    def iter_bytes(self) -> Iterator[bytes]:
+        entries = (
+            (name, self._iter_csv(rows))
+            for name, (_, rows) in zip(self._entry_names(), self._tables)
+        )
+        return iter_zip(entries, deflate_level=self._deflate_level)
+
+
+def _import_pyarrow():
+    try:
+        import pyarrow
+    except ImportError as e:
+        raise RuntimeError("This output format requires pyarrow (install the 'columnar' extra).") from e
+    return pyarrow
+
+
+class _ArrowBuilder(_TableCollector):
+    """
+    Long layout shared by Parquet and Arrow: one record per table row with columns
+    `sheet`, `table` (1-based within the sheet), `row` (0-based) and `c0..cN`
+    (nullable strings; N is the widest table).
+    """
+
+    def __init__(self) -> None:
+        self._pa = _import_pyarrow()
+        super().__init__()
+
+    def _schema(self):
+        pa = self._pa
+        width = max((len(row) for _, rows in self._tables for row in rows), default=0)
+        fields = [
+            pa.field("sheet", pa.string(), nullable=False),
+            pa.field("table", pa.int32(), nullable=False),
+            pa.field("row", pa.int32(), nullable=False),
+        ]
+        fields.extend(pa.field(f"c{i}", pa.string()) for i in range(width))
+        return pa.schema(fields)
+
+    def _iter_batches(self, schema):
+        pa = self._pa
+        width = len(schema) - 3
+        counters: dict[str, int] = {}
+        for sheet, rows in self._tables:
+            counters[sheet] = counters.get(sheet, 0) + 1
+            n = len(rows)
+            columns = [
+                pa.array([sheet] * n, pa.string()),
+                pa.array([counters[sheet]] * n, pa.int32()),
+                pa.array(range(n), pa.int32()),
+            ]
+            for i in range(width):
+                columns.append(
+                    pa.array(
+                        [
+                            None if i >= len(row) or row[i] is None else str(row[i])
+                            for row in rows
+                        ],
+                        pa.string(),
+                    )
+                )
+            yield pa.RecordBatch.from_arrays(columns, schema=schema)
+
+
+class ParquetExportBuilder(_ArrowBuilder):
+    """Single Parquet file (long layout, see `_ArrowBuilder`)."""
+
+    def __init__(self, compression: str = "zstd") -> None:
+        super().__init__()
+        self._compression = compression
+
+    def iter_bytes(self) -> Iterator[bytes]:
+        import pyarrow.parquet as pq
+
+        schema = self._schema()
+        sink = ChunkSink()
+        pending: list[Any] = []
+        pending_rows = 0
+        with pq.ParquetWriter(sink, schema, compression=self._compression) as writer:
+            for batch in self._iter_batches(schema):
+                pending.append(batch)
+                pending_rows += batch.num_rows
+                if pending_rows >= _PARQUET_ROW_GROUP_ROWS:
+                    writer.write_table(self._pa.Table.from_batches(pending, schema=schema))
+                    pending, pending_rows = [], 0
+                    yield sink.drain()
+            if pending:
+                writer.write_table(self._pa.Table.from_batches(pending, schema=schema))
+        tail = sink.drain()
+        if tail:
+            yield tail
+
+
+class ArrowIpcExportBuilder(_ArrowBuilder):
+    """Arrow IPC stream (one record batch per table; long layout, see `_ArrowBuilder`)."""
+
+    def iter_bytes(self) -> Iterator[bytes]:
+        schema = self._schema()
+        sink = ChunkSink()
+        with self._pa.ipc.new_stream(sink, schema) as writer:
+            for batch in self._iter_batches(schema):
+                writer.write_batch(batch)
+                yield sink.drain()
+        tail = sink.drain()
+        if tail:
+            yield tail
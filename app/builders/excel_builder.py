@@ -7,8 +7,13 @@ from openpyxl import Workbook
 from openpyxl.utils.dataframe import dataframe_to_rows
 import pandas as pd
 
+from app.builders.base import ExportBuilder
 
-class ExcelExportBuilder:
+# Hard row limit of an Excel worksheet.
+EXCEL_MAX_ROWS = 1_048_576
+
+
+class ExcelExportBuilder(ExportBuilder):
     """Build an XLSX file by adding sheets and tables."""
 
     def __init__(self) -> None:
@@ -47,3 +52,70 @@ class ExcelExportBuilder:
         self._wb.save(buffer)
         buffer.seek(0)
         return buffer.getvalue()
+
+
+class WriteOnlyExcelExportBuilder(ExportBuilder):
+    """
+    Build an XLSX with openpyxl's write-only workbook: rows are appended as they come, with
+    no DataFrame step and no random-access cell model. Same layout as ExcelExportBuilder
+    (column-index header row per table, one blank row between tables).
+
+    When a sheet reaches `max_rows`, output rolls over to "<name> (2)", "<name> (3)", ...
+    and the current table's header row is repeated there.
+    """
+
+    def __init__(self, max_rows: int = EXCEL_MAX_ROWS) -> None:
+        self._wb = Workbook(write_only=True)
+        self._max_rows = max_rows
+        self._current_sheet = None
+        self._sheet_name = ""
+        self._sheet_part = 1
+        self._rows_in_sheet = 0
+
+    def add_sheet(self, name: str) -> "WriteOnlyExcelExportBuilder":
+        """Start a new sheet (max 31 chars for name)."""
+        self._sheet_name = (name or "Sheet")[:31]
+        self._sheet_part = 1
+        self._open_sheet(self._sheet_name)
+        return self
+
+    def _open_sheet(self, title: str) -> None:
+        self._current_sheet = self._wb.create_sheet(title=title)
+        self._rows_in_sheet = 0
+
+    def _roll_over(self) -> None:
+        self._sheet_part += 1
+        suffix = f" ({self._sheet_part})"
+        self._open_sheet(self._sheet_name[: 31 - len(suffix)] + suffix)
+
+    def _append(self, row: list[Any]) -> None:
+        self._current_sheet.append(row)
+        self._rows_in_sheet += 1
+
+    def add_table(self, rows: list[list[Any]]) -> "WriteOnlyExcelExportBuilder":
+        """Append a table (list of rows) to the current sheet. First row is header."""
+        if not self._current_sheet:
+            self.add_sheet("Sheet1")
+        if not rows:
+            return self
+        width = max(len(row) for row in rows)
+        header = list(range(width))
+        # Need room for blank separator + header + one data row, else start the next part.
+        if self._rows_in_sheet and self._rows_in_sheet + 3 > self._max_rows:
+            self._roll_over()
+        elif self._rows_in_sheet:
+            self._append([])
+        self._append(header)
+        for row in rows:
+            if self._rows_in_sheet >= self._max_rows:
+                self._roll_over()
+                self._append(header)
+            padding = [""] * (width - len(row))
+            self._append(["" if value is None else value for value in row] + padding)
+        return self
+
+    def build(self) -> bytes:
+        """Return XLSX file as bytes."""
+        buffer = io.BytesIO()
+        self._wb.save(buffer)
+        return buffer.getvalue()
@@ -0,0 +1,73 @@
+"""Output formats: name -> media type, file extension and builder factory."""
+
+from __future__ import annotations
+
+import importlib.util
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from app.builders.base import ExportBuilder
+from app.builders.columnar import ArrowIpcExportBuilder, CsvZipExportBuilder, ParquetExportBuilder
+from app.builders.excel_builder import ExcelExportBuilder, WriteOnlyExcelExportBuilder
+from app.builders.xlsx_stream import StreamingXlsxBuilder
+from app.config import settings
+
+XLSX_MEDIA_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+
+@dataclass(frozen=True)
+class ExportFormat:
+    name: str
+    media_type: str
+    extension: str
+    factory: Callable[[], ExportBuilder]
+    # Optional module the builder needs (None = always available).
+    requires: str | None = None
+
+    @property
+    def available(self) -> bool:
+        return self.requires is None or importlib.util.find_spec(self.requires) is not None
+
+    def new_builder(self) -> ExportBuilder:
+        return self.factory()
+
+
+def _xlsx_builder() -> ExportBuilder:
+    if settings.xlsx_writer == "openpyxl":
+        return ExcelExportBuilder()
+    if settings.xlsx_writer == "write_only":
+        return WriteOnlyExcelExportBuilder()
+    return StreamingXlsxBuilder(deflate_level=settings.xlsx_deflate_level)
+
+
+EXPORT_FORMATS: dict[str, ExportFormat] = {
+    f.name: f
+    for f in (
+        ExportFormat("xlsx", XLSX_MEDIA_TYPE, "xlsx", _xlsx_builder),
+        ExportFormat(
+            "csv-zip",
+            "application/zip",
+            "zip",
+            lambda: CsvZipExportBuilder(deflate_level=settings.xlsx_deflate_level),
+        ),
+        ExportFormat(
+            "parquet", "application/vnd.apache.parquet", "parquet", ParquetExportBuilder, "pyarrow"
+        ),
+        ExportFormat(
+            "arrow", "application/vnd.apache.arrow.stream", "arrows", ArrowIpcExportBuilder, "pyarrow"
+        ),
+    )
+}
+
+DEFAULT_EXPORT_FORMAT = "xlsx"
+
+
+def get_export_format(name: str | None) -> ExportFormat:
+    """Look up an output format by name (case-insensitive). Raises ValueError if unknown."""
+    key = (name or DEFAULT_EXPORT_FORMAT).strip().lower()
+    try:
+        return EXPORT_FORMATS[key]
+    except KeyError:
+        raise ValueError(
+            f"Unknown output format '{name}'. Supported: {', '.join(EXPORT_FORMATS)}."
+        ) from None
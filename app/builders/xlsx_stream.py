@@ -0,0 +1,251 @@
+"""Builder: lightweight XLSX writer that streams the archive as it is generated.
+
+Worksheet XML is produced row by row and zipped on the fly; strings are deduplicated into
+a sharedStrings part written after the last sheet. Nothing but the extracted rows and the
+string table is held in memory, and the first zip chunk is ready before the last sheet is
+rendered. Layout matches ExcelExportBuilder (column-index header row per table, blank row
+between tables), with the same sheet roll-over as WriteOnlyExcelExportBuilder.
+"""
+
+from __future__ import annotations
+
+import re
+from collections.abc import Iterator
+from typing import Any
+from xml.sax.saxutils import escape, quoteattr
+
+from openpyxl.utils import get_column_letter
+
+from app.builders.base import ExportBuilder
+from app.builders.excel_builder import EXCEL_MAX_ROWS
+from app.builders.zip_stream import iter_zip
+
+# Rows rendered per XML piece handed to the zip writer.
+_ROWS_PER_PIECE = 512
+
+# Characters XML 1.0 cannot carry (openpyxl rejects them with IllegalCharacterError).
+_ILLEGAL_XML_CHARS = re.compile(r"[\x00-\x08\x0b\x0c\x0e-\x1f￾￿]")
+
+_NS_MAIN = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+_NS_REL = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+_NS_PKG_REL = "http://schemas.openxmlformats.org/package/2006/relationships"
+_XML_DECL = '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+
+_STYLES_XML = (
+    _XML_DECL
+    + f'<styleSheet xmlns="{_NS_MAIN}">'
+    '<fonts count="1"><font><sz val="11"/><name val="Calibri"/></font></fonts>'
+    '<fills count="2"><fill><patternFill patternType="none"/></fill>'
+    '<fill><patternFill patternType="gray125"/></fill></fills>'
+    '<borders count="1"><border><left/><right/><top/><bottom/><diagonal/></border></borders>'
+    '<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>'
+    '<cellXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/></cellXfs>'
+    '<cellStyles count="1"><cellStyle name="Normal" xfId="0" builtinId="0"/></cellStyles>'
+    "</styleSheet>"
+)
+
+# Sheet segments: ("header", width) | ("blank",) | ("rows", rows, start, end, width)
+_Segment = tuple[Any, ...]
+
+
+class _SharedStrings:
+    def __init__(self) -> None:
+        self._index: dict[str, int] = {}
+        self.refs = 0
+
+    def add(self, value: str) -> int:
+        self.refs += 1
+        idx = self._index.get(value)
+        if idx is None:
+            idx = self._index[value] = len(self._index)
+        return idx
+
+    def iter_xml(self) -> Iterator[bytes]:
+        yield (
+            _XML_DECL + f'<sst xmlns="{_NS_MAIN}" count="{self.refs}" uniqueCount="{len(self._index)}">'
+        ).encode("utf-8")
+        piece: list[str] = []
+        # dicts keep insertion order, which is the index order.
+        for value in self._index:
+            text = escape(_ILLEGAL_XML_CHARS.sub("", value))
+            if value != value.strip():
+                piece.append(f'<si><t xml:space="preserve">{text}</t></si>')
+            else:
+                piece.append(f"<si><t>{text}</t></si>")
+            if len(piece) >= _ROWS_PER_PIECE:
+                yield "".join(piece).encode("utf-8")
+                piece.clear()
+        piece.append("</sst>")
+        yield "".join(piece).encode("utf-8")
+
+
+class _Sheet:
+    def __init__(self, title: str) -> None:
+        self.title = title
+        self.segments: list[_Segment] = []
+
+
+class StreamingXlsxBuilder(ExportBuilder):
+    """Build an XLSX by adding sheets and tables; render it lazily with iter_bytes()."""
+
+    def __init__(self, deflate_level: int = 6, max_rows: int = EXCEL_MAX_ROWS) -> None:
+        self._deflate_level = deflate_level
+        self._max_rows = max_rows
+        self._sheets: list[_Sheet] = []
+        self._titles: set[str] = set()
+        self._current_sheet: _Sheet | None = None
+        self._sheet_name = ""
+        self._sheet_part = 1
+        self._rows_in_sheet = 0
+
+    def _unique_title(self, title: str) -> str:
+        candidate, n = title, 1
+        while candidate.lower() in self._titles:
+            suffix = str(n)
+            candidate = title[: 31 - len(suffix)] + suffix
+            n += 1
+        self._titles.add(candidate.lower())
+        return candidate
+
+    def _open_sheet(self, title: str) -> None:
+        self._current_sheet = _Sheet(self._unique_title(title))
+        self._sheets.append(self._current_sheet)
+        self._rows_in_sheet = 0
+
+    def _roll_over(self) -> None:
+        self._sheet_part += 1
+        suffix = f" ({self._sheet_part})"
+        self._open_sheet(self._sheet_name[: 31 - len(suffix)] + suffix)
+
+    def add_sheet(self, name: str) -> "StreamingXlsxBuilder":
+        """Start a new sheet (max 31 chars for name)."""
+        self._sheet_name = (name or "Sheet")[:31]
+        self._sheet_part = 1
+        self._open_sheet(self._sheet_name)
+        return self
+
+    def add_table(self, rows: list[list[Any]]) -> "StreamingXlsxBuilder":
+        """Append a table (list of rows) to the current sheet. First row is header."""
+        if not self._current_sheet:
+            self.add_sheet("Sheet1")
+        if not rows:
+            return self
+        width = max(len(row) for row in rows)
+        if self._rows_in_sheet and self._rows_in_sheet + 3 > self._max_rows:
+            self._roll_over()
+        elif self._rows_in_sheet:
+            self._add_segment(("blank",), 1)
+        start = 0
+        while start < len(rows):
+            if self._rows_in_sheet >= self._max_rows:
+                self._roll_over()
+            self._add_segment(("header", width), 1)
+            end = min(len(rows), start + self._max_rows - self._rows_in_sheet)
+            self._add_segment(("rows", rows, start, end, width), end - start)
+            start = end
+        return self
+
+    def _add_segment(self, segment: _Segment, row_count: int) -> None:
+        assert self._current_sheet is not None
+        self._current_sheet.segments.append(segment)
+        self._rows_in_sheet += row_count
+
+    def _iter_sheet_xml(self, sheet: _Sheet, strings: _SharedStrings) -> Iterator[bytes]:
+        yield (_XML_DECL + f'<worksheet xmlns="{_NS_MAIN}"><sheetData>').encode("utf-8")
+        letters: list[str] = []
+        piece: list[str] = []
+        r = 0
+        for segment in sheet.segments:
+            kind = segment[0]
+            if kind == "blank":
+                r += 1
+                continue
+            width = segment[1] if kind == "header" else segment[4]
+            while len(letters) < width:
+                letters.append(get_column_letter(len(letters) + 1))
+            if kind == "header":
+                r += 1
+                cells = "".join(f'<c r="{letters[i]}{r}"><v>{i}</v></c>' for i in range(width))
+                piece.append(f'<row r="{r}">{cells}</row>')
+                continue
+            _, rows, start, end, _ = segment
+            for row in rows[start:end]:
+                r += 1
+                cells = []
+                for i, value in enumerate(row):
+                    if value is None or value == "":
+                        continue
+                    if isinstance(value, (int, float)) and not isinstance(value, bool):
+                        cells.append(f'<c r="{letters[i]}{r}"><v>{value}</v></c>')
+                    else:
+                        cells.append(f'<c r="{letters[i]}{r}" t="s"><v>{strings.add(str(value))}</v></c>')
+                piece.append(f'<row r="{r}">{"".join(cells)}</row>')
+                if len(piece) >= _ROWS_PER_PIECE:
+                    yield "".join(piece).encode("utf-8")
+                    piece.clear()
+        piece.append("</sheetData></worksheet>")
+        yield "".join(piece).encode("utf-8")
+
+    def _package_parts(self) -> Iterator[tuple[str, Iterator[bytes] | list[bytes]]]:
+        if not self._sheets:
+            self._open_sheet("Sheet1")
+        n = len(self._sheets)
+        overrides = "".join(
+            f'<Override PartName="/xl/worksheets/sheet{i}.xml" '
+            'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+            for i in range(1, n + 1)
+        )
+        content_types = (
+            _XML_DECL
+            + '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+            '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+            '<Default Extension="xml" ContentType="application/xml"/>'
+            '<Override PartName="/xl/workbook.xml" '
+            'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+            f"{overrides}"
+            '<Override PartName="/xl/styles.xml" '
+            'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+            '<Override PartName="/xl/sharedStrings.xml" '
+            'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sharedStrings+xml"/>'
+            "</Types>"
+        )
+        root_rels = (
+            _XML_DECL
+            + f'<Relationships xmlns="{_NS_PKG_REL}">'
+            f'<Relationship Id="rId1" Type="{_NS_REL}/officeDocument" Target="xl/workbook.xml"/>'
+            "</Relationships>"
+        )
+        sheets = "".join(
+            f'<sheet name={quoteattr(sheet.title)} sheetId="{i}" r:id="rId{i}"/>'
+            for i, sheet in enumerate(self._sheets, start=1)
+        )
+        workbook = _XML_DECL + f'<workbook xmlns="{_NS_MAIN}" xmlns:r="{_NS_REL}"><sheets>{sheets}</sheets></workbook>'
+        workbook_rels = (
+            _XML_DECL
+            + f'<Relationships xmlns="{_NS_PKG_REL}">'
+            + "".join(
+                f'<Relationship Id="rId{i}" Type="{_NS_REL}/worksheet" Target="worksheets/sheet{i}.xml"/>'
+                for i in range(1, n + 1)
+            )
+            + f'<Relationship Id="rId{n + 1}" Type="{_NS_REL}/styles" Target="styles.xml"/>'
+            + f'<Relationship Id="rId{n + 2}" Type="{_NS_REL}/sharedStrings" Target="sharedStrings.xml"/>'
+            + "</Relationships>"
+        )
+        yield "[Content_Types].xml", [content_types.encode("utf-8")]
+        yield "_rels/.rels", [root_rels.encode("utf-8")]
+        yield "xl/workbook.xml", [workbook.encode("utf-8")]
+        yield "xl/_rels/workbook.xml.rels", [workbook_rels.encode("utf-8")]
+        yield "xl/styles.xml", [_STYLES_XML.encode("utf-8")]
+        strings = _SharedStrings()
+        for i, sheet in enumerate(self._sheets, start=1):
+            yield f"xl/worksheets/sheet{i}.xml", self._iter_sheet_xml(sheet, strings)
+        # Written last so it holds every string referenced by the sheets above.
+        yield "xl/sharedStrings.xml", strings.iter_xml()
+
+    def iter_bytes(self) -> Iterator[bytes]:
+        """Yield the XLSX file as zip chunks while it is generated."""
+        return iter_zip(self._package_parts(), deflate_level=self._deflate_level)
+
+    def build(self) -> bytes:
+        """Return XLSX file as bytes."""
+        return b"".join(self.iter_bytes())
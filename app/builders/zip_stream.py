@@ -0,0 +1,70 @@
+"""Incremental zip output: archive bytes are handed out in chunks while entries are written."""
+
+from __future__ import annotations
+
+import zipfile
+from collections.abc import Iterable, Iterator
+
+# Hand out output once this much has accumulated.
+_CHUNK_BYTES = 64 * 1024
+
+
+class ChunkSink:
+    """
+    Write-only, non-seekable file object that buffers output until `drain()`.
+
+    zipfile writes data descriptors to it; the Parquet and Arrow writers use it as their sink.
+    """
+
+    closed = False
+
+    def __init__(self) -> None:
+        self._parts: list[bytes] = []
+        self.size = 0
+
+    def write(self, data: bytes) -> int:
+        if data:
+            self._parts.append(bytes(data))
+            self.size += len(data)
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        # Output is handed out by drain(); closing only ends the writer.
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._parts)
+        self._parts.clear()
+        self.size = 0
+        return data
+
+
+def zip_compression(level: int) -> tuple[int, int | None]:
+    """Map a deflate level (0 = store only) to zipfile (compression, compresslevel)."""
+    if level <= 0:
+        return zipfile.ZIP_STORED, None
+    return zipfile.ZIP_DEFLATED, min(level, 9)
+
+
+def iter_zip(entries: Iterable[tuple[str, Iterable[bytes]]], deflate_level: int = 6) -> Iterator[bytes]:
+    """
+    Yield a zip archive in chunks. `entries` is (name, pieces); pieces are written in order
+    and may be produced lazily, so no entry needs to exist in full.
+    """
+    compression, compresslevel = zip_compression(deflate_level)
+    sink = ChunkSink()
+    with zipfile.ZipFile(sink, mode="w", compression=compression, compresslevel=compresslevel) as zf:
+        for name, pieces in entries:
+            with zf.open(name, mode="w") as entry:
+                for piece in pieces:
+                    entry.write(piece)
+                    if sink.size >= _CHUNK_BYTES:
+                        yield sink.drain()
+            if sink.size >= _CHUNK_BYTES:
+                yield sink.drain()
+    tail = sink.drain()
+    if tail:
+        yield tail
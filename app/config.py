@@ -10,6 +10,22 @@ def _url_without_pgbouncer(url: str) -> str:
     return f"{base}?{new_query}" if new_query else base
 
 
+# Async drivers by URL scheme (SQLite for tests and local runs).
+_ASYNC_DRIVERS = {"postgresql": "postgresql+asyncpg", "postgres": "postgresql+asyncpg", "sqlite": "sqlite+aiosqlite"}
+
+
+def _async_url(url: str) -> str:
+    """Same database through its async driver. asyncpg takes libpq's `sslmode` as `ssl`."""
+    url = _url_without_pgbouncer(url)
+    scheme, sep, rest = url.partition("://")
+    scheme = _ASYNC_DRIVERS.get(scheme.split("+")[0], scheme)
+    if "?" in rest and scheme == "postgresql+asyncpg":
+        base, _, query = rest.partition("?")
+        parts = ["ssl=" + p.split("=", 1)[1] if p.startswith("sslmode=") else p for p in query.split("&")]
+        rest = f"{base}?{'&'.join(parts)}"
+    return f"{scheme}{sep}{rest}"
+
+
 class Settings(BaseSettings):
     model_config = SettingsConfigDict(
         env_file=".env",
@@ -19,10 +35,34 @@ class Settings(BaseSettings):
 
     # Database
     database_url: str = "postgresql://localhost/tabular"
+    # Connection pool of each engine (every worker has a sync and an async one).
+    # "queue" keeps up to size + overflow connections open; "null" opens one per checkout
+    # and leaves pooling to PgBouncer (transaction mode)
+    db_pool_mode: str = "queue"
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    # Seconds to wait for a free connection before failing the request
+    db_pool_timeout_sec: float = 30.0
+    # Reconnect connections older than this (seconds, -1 = never); keep it under the
+    # server's or proxy's idle timeout
+    db_pool_recycle_sec: int = 1800
+    # Bearer token for operational endpoints (GET /health/pool, /health/cache); empty = 404
+    ops_token: str = ""
 
     # Supabase Auth
     supabase_url: str = ""
     supabase_jwt_secret: str = ""
+    # Verified JWT payloads kept in memory until their `exp` (entries, 0 = verify every request)
+    jwt_cache_max_entries: int = 10_000
+    # Authenticated user rows kept in memory for a short while, so dashboard polling does
+    # not reload the user on every request (entries, 0 = always load from the database)
+    user_cache_max_entries: int = 10_000
+    user_cache_ttl_sec: int = 30
+    # RS256/ES256 signing keys: refreshed in the background after this age; an unknown `kid`
+    # refetches at most once per interval. A local JWKS file replaces the Supabase endpoint.
+    jwks_ttl_sec: int = 10 * 60
+    jwks_refetch_min_interval_sec: int = 30
+    supabase_jwks_file: str = ""
 
     # CORS (comma-separated origins, e.g. http://localhost:3000,https://app.tabular.com)
     cors_origins: str = "http://localhost:3000"
@@ -39,6 +79,69 @@ class Settings(BaseSettings):
     # Plan limits (FREE)
     free_max_pdf_pages: int = 20
 
+    # Wall-clock budget for extracting one conversion, per plan (seconds, 0 = unbounded).
+    # Enforced between pages; see the `on_timeout` request option.
+    free_conversion_time_budget_sec: float = 60
+    pro_conversion_time_budget_sec: float = 600
+
+    # Table extraction process pool (0 workers = extract in the request thread)
+    extraction_workers: int = 0
+    # Pages per pool task; documents that fit in one chunk are extracted in-process.
+    extraction_chunk_pages: int = 10
+    # Per-worker rlimits (0 = no limit). A worker that crosses them is killed, not the API process.
+    extraction_worker_memory_mb: int = 2048
+    extraction_worker_cpu_seconds: int = 120
+    # Skip pages whose content draws no ruled cell before running table detection.
+    extraction_prescreen: bool = True
+
+    # XLSX writer: "streaming" (native, zip chunks straight into the response),
+    # "write_only" (openpyxl write-only workbook) or "openpyxl" (in-memory workbook)
+    xlsx_writer: str = "streaming"
+    # Deflate level for the streaming writer (0 = store only, for CPU-bound nodes)
+    xlsx_deflate_level: int = 6
+
+    # Conversion result cache: output bytes keyed by PDF hash + pages + extractor + format
+    # (derived output only, in memory; 0 = disabled)
+    result_cache_max_bytes: int = 256 * 1024 * 1024
+    # Per-page extracted tables keyed by PDF hash + page, so overlapping page selections
+    # of the same document only extract new pages (0 = disabled)
+    page_cache_max_bytes: int = 64 * 1024 * 1024
+
+    # Short-lived "download again" cache: "memory" (this process), "local" (node-local KV
+    # server, shared by all workers) or "redis" (Redis-compatible server at redis_url).
+    # Byte budget applies to "memory" (0 = unbounded); zlib level 0 = store as is.
+    download_cache_backend: str = "memory"
+    download_cache_max_bytes: int = 256 * 1024 * 1024
+    download_cache_ttl_sec: int = 10 * 60
+    download_cache_compress_level: int = 0
+
+    # Async conversion jobs (submit / poll / fetch)
+    jobs_workers: int = 2
+    jobs_queue_size: int = 16
+    # How long job status and results stay available after the last update.
+    jobs_ttl_sec: int = 10 * 60
+    # "memory" (this process), "local" (node-local KV server shared by all workers) or "redis"
+    jobs_backend: str = "memory"
+
+    # Audit log writer: events are queued and inserted in batches by a background thread,
+    # at audit_batch_size events or every audit_flush_interval_sec. When the queue stays full
+    # for audit_enqueue_timeout_sec the caller writes its event itself (0 = always synchronous).
+    audit_queue_size: int = 10_000
+    audit_batch_size: int = 200
+    audit_flush_interval_sec: float = 1.0
+    audit_enqueue_timeout_sec: float = 0.05
+
+    # Node-local KV server (python -m app.services.local_kv)
+    local_kv_address: str = "127.0.0.1:8765"
+    # Required for the "local" backends: the manager protocol unpickles what it receives, so
+    # the key is what keeps other local processes out. Use a long random secret.
+    local_kv_authkey: str = ""
+    # Byte budget of the KV server (least recently used keys are evicted; 0 = unbounded)
+    local_kv_max_bytes: int = 1024 * 1024 * 1024
+
+    # Redis-compatible server for the "redis" backends (redis://[:password@]host[:port][/db])
+    redis_url: str = "redis://127.0.0.1:6379/0"
+
     @property
     def cors_origins_list(self) -> list[str]:
         return [o.strip() for o in self.cors_origins.split(",") if o.strip()]
@@ -47,5 +150,15 @@ class Settings(BaseSettings):
     def database_url_psycopg2(self) -> str:
         return _url_without_pgbouncer(self.database_url)
 
+    @property
+    def database_url_async(self) -> str:
+        return _async_url(self.database_url)
+
+    @property
+    def database_pgbouncer(self) -> bool:
+        """DATABASE_URL carries `pgbouncer=true` (e.g. Supabase's transaction pooler)."""
+        _, _, query = self.database_url.partition("?")
+        return any(p.strip().lower() == "pgbouncer=true" for p in query.split("&"))
+
 
 settings = Settings()
@@ -1,27 +1,23 @@
 import hashlib
-import json
 import os
 import time
 from pathlib import Path
-from urllib.request import Request, urlopen
 
 from jose import JWTError, jwt
 from jose.exceptions import ExpiredSignatureError, JWTClaimsError
-from jose.utils import base64url_decode
-
-from cryptography.hazmat.primitives.asymmetric import ec, rsa
-from cryptography.hazmat.primitives.serialization import Encoding, PublicFormat
 
 from app.config import settings
+from app.core.cache import ByteBudgetLRU
+from app.core.jwks import JwksKeyStore, fetch_jwks_url, load_jwks_file
 from app.logging_config import get_logger
 
 
 logger = get_logger("app.auth")
 _warned_missing_secret = False
 
-_jwks_cache: dict | None = None
-_jwks_cache_at: float = 0.0
-_JWKS_TTL_SEC = 10 * 60
+# Verified payloads by full-token SHA-256, each kept until the token's `exp`. Every entry
+# is charged 1, so the byte budget is an entry cap (JWT_CACHE_MAX_ENTRIES, 0 = disabled).
+_verified_tokens: ByteBudgetLRU[str, dict] = ByteBudgetLRU(settings.jwt_cache_max_entries, sizeof=lambda _p: 1)
 
 
 def _token_fingerprint(token: str) -> str:
@@ -29,73 +25,53 @@ def _token_fingerprint(token: str) -> str:
     return hashlib.sha256(token.encode("utf-8", errors="ignore")).hexdigest()[:12]
 
 
-def _load_jwks() -> dict | None:
-    """Fetch and cache Supabase JWKS used for RS256 verification."""
-    global _jwks_cache, _jwks_cache_at
-
-    now = time.monotonic()
-    if _jwks_cache and (now - _jwks_cache_at) < _JWKS_TTL_SEC:
-        return _jwks_cache
-
+def _fetch_jwks() -> dict:
+    if settings.supabase_jwks_file:
+        return load_jwks_file(settings.supabase_jwks_file)
     if not settings.supabase_url:
-        return None
-
+        raise ValueError("SUPABASE_URL is not set")
     # Supabase public JWKS (no auth required)
-    url = settings.supabase_url.rstrip("/") + "/auth/v1/.well-known/jwks.json"
-    try:
-        req = Request(url, headers={"Accept": "application/json"})
-        with urlopen(req, timeout=3) as res:  # noqa: S310
-            body = res.read().decode("utf-8", errors="replace")
-        data = json.loads(body)
-        if not isinstance(data, dict) or "keys" not in data:
-            logger.warning("JWKS fetch ok but shape unexpected url=%s", url)
-            return None
-        _jwks_cache = data
-        _jwks_cache_at = now
-        return _jwks_cache
-    except Exception as e:
-        logger.warning("JWKS fetch failed url=%s err=%s", url, type(e).__name__)
-        return None
+    return fetch_jwks_url(settings.supabase_url.rstrip("/") + "/auth/v1/.well-known/jwks.json")
+
 
+# Signing keys for RS256/ES256, parsed once per fetch and refreshed in the background.
+_jwks_store = JwksKeyStore(
+    _fetch_jwks,
+    ttl_sec=settings.jwks_ttl_sec,
+    refetch_interval_sec=settings.jwks_refetch_min_interval_sec,
+)
 
-def _rsa_pem_from_jwk(key: dict) -> str:
-    n_raw = key.get("n")
-    e_raw = key.get("e")
-    if not isinstance(n_raw, str) or not isinstance(e_raw, str):
-        raise ValueError("Invalid RSA jwk")
 
-    n = int.from_bytes(base64url_decode(n_raw.encode("utf-8")), "big")
-    e = int.from_bytes(base64url_decode(e_raw.encode("utf-8")), "big")
-    pub = rsa.RSAPublicNumbers(e, n).public_key()
-    pem = pub.public_bytes(Encoding.PEM, PublicFormat.SubjectPublicKeyInfo)
-    return pem.decode("utf-8")
+def verify_supabase_jwt(token: str) -> dict | None:
+    """
+    Verify JWT signed by Supabase and return payload (sub, email, etc.) or None.
 
+    Verified payloads are cached until the token expires, so polling with the same token
+    skips signature verification (and its logging). Rejections are not cached.
+    """
+    cached = cached_supabase_jwt(token)
+    if cached is not None:
+        return cached
+    payload = _verify_supabase_jwt(token)
+    if payload is not None:
+        exp = payload.get("exp")
+        ttl = exp - time.time() if isinstance(exp, (int, float)) else 0
+        if ttl > 0:
+            _verified_tokens.put(_cache_key(token), dict(payload), ttl_sec=ttl)
+    return payload
 
-def _ec_pem_from_jwk(key: dict) -> str:
-    crv = key.get("crv")
-    x_raw = key.get("x")
-    y_raw = key.get("y")
-    if crv != "P-256" or not isinstance(x_raw, str) or not isinstance(y_raw, str):
-        raise ValueError("Invalid EC jwk")
 
-    x = int.from_bytes(base64url_decode(x_raw.encode("utf-8")), "big")
-    y = int.from_bytes(base64url_decode(y_raw.encode("utf-8")), "big")
-    pub = ec.EllipticCurvePublicNumbers(x, y, ec.SECP256R1()).public_key()
-    pem = pub.public_bytes(Encoding.PEM, PublicFormat.SubjectPublicKeyInfo)
-    return pem.decode("utf-8")
+def cached_supabase_jwt(token: str) -> dict | None:
+    """Payload of a token verified earlier and not yet expired, or None. Never verifies."""
+    cached = _verified_tokens.get(_cache_key(token))
+    return dict(cached) if cached is not None else None
 
 
-def _public_pem_from_jwk(key: dict) -> str:
-    kty = key.get("kty")
-    if kty == "RSA":
-        return _rsa_pem_from_jwk(key)
-    if kty == "EC":
-        return _ec_pem_from_jwk(key)
-    raise ValueError(f"Unsupported jwk kty={kty!r}")
+def _cache_key(token: str) -> str:
+    return hashlib.sha256(token.encode("utf-8", errors="ignore")).hexdigest()
 
 
-def verify_supabase_jwt(token: str) -> dict | None:
-    """Verify JWT signed by Supabase and return payload (sub, email, etc.) or None."""
+def _verify_supabase_jwt(token: str) -> dict | None:
     global _warned_missing_secret
     fp = _token_fingerprint(token)
 
@@ -154,35 +130,22 @@ def verify_supabase_jwt(token: str) -> dict | None:
             return payload
 
         if alg in {"RS256", "ES256"}:
-            jwks = _load_jwks()
-            keys = jwks.get("keys") if isinstance(jwks, dict) else None
-            if not isinstance(keys, list) or not keys:
-                logger.warning("JWKS not available; cannot verify %s fp=%s", alg, fp)
-                return None
-
-            key = None
-            if kid:
-                key = next((k for k in keys if isinstance(k, dict) and k.get("kid") == kid), None)
+            key = _jwks_store.get(kid)
             if key is None:
-                key = next((k for k in keys if isinstance(k, dict)), None)
-            if not isinstance(key, dict):
                 logger.warning("JWKS has no matching key fp=%s kid=%r", fp, kid)
                 return None
-
-            try:
-                pem = _public_pem_from_jwk(key)
-            except Exception as e:
+            if key.alg != alg:
                 logger.warning(
-                    "JWKS key parse failed fp=%s kid=%r kty=%r err=%s",
+                    "JWT alg does not match key fp=%s kid=%r alg=%r key_alg=%r",
                     fp,
                     kid,
-                    key.get("kty"),
-                    type(e).__name__,
+                    alg,
+                    key.alg,
                 )
                 return None
             payload = jwt.decode(
                 token,
-                pem,
+                key.key,
                 algorithms=[alg],
                 options={"verify_aud": False, "verify_exp": True},
             )
@@ -0,0 +1,149 @@
+"""In-process LRU cache bounded by the total size of its values, with optional TTL."""
+
+from __future__ import annotations
+
+import heapq
+import itertools
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from dataclasses import dataclass
+from typing import Generic, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+@dataclass(frozen=True)
+class CacheStats:
+    hits: int
+    misses: int
+    evictions: int
+    expired: int
+    items: int
+    bytes: int
+    max_bytes: int
+
+
+class ByteBudgetLRU(Generic[K, V]):
+    """
+    Thread-safe LRU keyed by K. Every entry is charged `sizeof(value)` bytes; the least
+    recently used entries are evicted once the total exceeds `max_bytes`. Values larger
+    than the whole budget are not stored. `max_bytes <= 0` disables the cache.
+
+    With `ttl_sec` (default, or per put), an entry expires that long after it was stored.
+    Expired entries are dropped when looked up, and every put first drops all entries whose
+    deadline has passed. Deadlines are kept in a min-heap, so a put costs O(log n) amortized
+    whatever the mix of TTLs. `clock` is the time source for deadlines.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int,
+        sizeof: Callable[[V], int] = len,  # type: ignore[assignment]
+        ttl_sec: float | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.max_bytes = max_bytes
+        self.ttl_sec = ttl_sec
+        self._sizeof = sizeof
+        self._clock = clock
+        # key -> (value, size, expires_at)
+        self._entries: OrderedDict[K, tuple[V, int, float]] = OrderedDict()
+        # (expires_at, seq, key) for entries with a TTL. Entries that were replaced, evicted
+        # or popped leave stale items behind; they are skipped and compacted lazily.
+        self._deadlines: list[tuple[float, int, K]] = []
+        self._seq = itertools.count()
+        self._bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expired = 0
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0
+
+    def get(self, key: K) -> V | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[2] <= self._clock():
+                self._drop(key)
+                self._expired += 1
+                entry = None
+            if entry is None:
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return entry[0]
+
+    def put(self, key: K, value: V, ttl_sec: float | None = None) -> bool:
+        """Store `value` (`ttl_sec` overrides the default TTL); False if it does not fit."""
+        size = self._sizeof(value)
+        if not self.enabled or size > self.max_bytes:
+            return False
+        now = self._clock()
+        ttl = ttl_sec if ttl_sec is not None else self.ttl_sec
+        expires_at = now + ttl if ttl else float("inf")
+        with self._lock:
+            self._drop(key)
+            self._drop_expired(now)
+            self._entries[key] = (value, size, expires_at)
+            self._bytes += size
+            if ttl:
+                heapq.heappush(self._deadlines, (expires_at, next(self._seq), key))
+                if len(self._deadlines) > 2 * len(self._entries) + 64:
+                    self._compact_deadlines()
+            while self._bytes > self.max_bytes:
+                _, (_, evicted_size, _) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+                self._evictions += 1
+        return True
+
+    def _drop_expired(self, now: float) -> None:
+        while self._deadlines and self._deadlines[0][0] <= now:
+            expires_at, _, key = heapq.heappop(self._deadlines)
+            entry = self._entries.get(key)
+            # Skip stale deadlines: the key is gone or was stored again since.
+            if entry is not None and entry[2] == expires_at:
+                self._drop(key)
+                self._expired += 1
+
+    def _compact_deadlines(self) -> None:
+        self._deadlines = [d for d in self._deadlines if (e := self._entries.get(d[2])) and e[2] == d[0]]
+        heapq.heapify(self._deadlines)
+
+    def _drop(self, key: K) -> tuple[V, int, float] | None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry[1]
+        return entry
+
+    def pop(self, key: K) -> V | None:
+        with self._lock:
+            entry = self._drop(key)
+            return entry[0] if entry else None
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._deadlines.clear()
+            self._bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return CacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                expired=self._expired,
+                items=len(self._entries),
+                bytes=self._bytes,
+                max_bytes=self.max_bytes,
+            )
@@ -0,0 +1,71 @@
+"""Cooperative cancellation: a flag one side sets and long-running work polls between steps."""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections.abc import Callable
+from typing import Any
+
+
+class OperationCancelled(Exception):
+    """Raised at a checkpoint once the token has been cancelled."""
+
+
+class DeadlineExceeded(OperationCancelled):
+    """
+    Raised at a checkpoint once the token's deadline has passed. Work that can stop with
+    a usable prefix attaches it as `partial` before re-raising.
+    """
+
+    def __init__(self, message: str = "Time budget exceeded.") -> None:
+        super().__init__(message)
+        self.partial: Any = None
+
+
+class CancellationToken:
+    """
+    Thread-safe cancellation flag. Set from anywhere (e.g. the event loop noticing a client
+    disconnect); the worker doing the job checks it between units of work (pages, chunks).
+
+    A token made by `with_timeout` is also cancelled once its deadline passes, or when the
+    token it was made from is cancelled.
+    """
+
+    def __init__(
+        self,
+        parent: CancellationToken | None = None,
+        deadline: float | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._event = threading.Event()
+        self._parent = parent
+        self._deadline = deadline
+        self._clock = clock
+        self.reason = "Cancelled."
+
+    def with_timeout(self, seconds: float) -> CancellationToken:
+        """Child token that is also cancelled `seconds` from now."""
+        return CancellationToken(parent=self, deadline=self._clock() + seconds, clock=self._clock)
+
+    def cancel(self, reason: str = "Cancelled.") -> None:
+        if not self._event.is_set():
+            self.reason = reason
+            self._event.set()
+
+    def _expired(self) -> bool:
+        return self._deadline is not None and self._clock() >= self._deadline
+
+    @property
+    def cancelled(self) -> bool:
+        if self._event.is_set() or self._expired():
+            return True
+        return self._parent is not None and self._parent.cancelled
+
+    def raise_if_cancelled(self) -> None:
+        if self._event.is_set():
+            raise OperationCancelled(self.reason)
+        if self._parent is not None:
+            self._parent.raise_if_cancelled()
+        if self._expired():
+            raise DeadlineExceeded()
@@ -0,0 +1,167 @@
+"""JWKS key store: signing keys by `kid`, parsed once and refreshed off the request path.
+
+Keys are turned into python-jose key objects when a key set is loaded, so verifying a
+token does no JWK/PEM parsing. Once the set is older than its TTL it is still served
+(stale-while-revalidate) while a background thread fetches a fresh copy. A token whose
+`kid` is not in the set (key rotation) triggers an immediate refetch, at most once per
+`refetch_interval_sec`, so a flood of tokens with made-up kids cannot hammer the issuer.
+There is at most one fetch in flight: callers that need fresh keys meanwhile wait for it.
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+from urllib.request import Request, urlopen
+
+from jose import jwk
+from jose.backends.base import Key
+
+from app.logging_config import get_logger
+
+logger = get_logger("app.auth")
+
+# Algorithm assumed for keys that do not carry an "alg" member.
+_DEFAULT_ALG = {"RSA": "RS256", "EC": "ES256"}
+
+
+@dataclass(frozen=True)
+class SigningKey:
+    alg: str
+    key: Key
+
+
+def fetch_jwks_url(url: str, timeout: float = 3.0) -> dict:
+    req = Request(url, headers={"Accept": "application/json"})
+    with urlopen(req, timeout=timeout) as res:  # noqa: S310
+        return json.loads(res.read().decode("utf-8", errors="replace"))
+
+
+def load_jwks_file(path: str) -> dict:
+    """Local stand-in for the issuer's endpoint (tests, offline development)."""
+    return json.loads(Path(path).read_text(encoding="utf-8"))
+
+
+def parse_jwks(data: Any) -> tuple[dict[str, SigningKey], SigningKey | None]:
+    """Signing keys by kid plus the first usable key (for tokens without a kid)."""
+    if not isinstance(data, dict) or not isinstance(data.get("keys"), list):
+        raise ValueError("JWKS document has no 'keys' list")
+    by_kid: dict[str, SigningKey] = {}
+    first: SigningKey | None = None
+    for entry in data["keys"]:
+        if not isinstance(entry, dict) or entry.get("use", "sig") != "sig":
+            continue
+        alg = entry.get("alg") or _DEFAULT_ALG.get(str(entry.get("kty")))
+        if alg not in ("RS256", "ES256"):
+            continue
+        try:
+            key = SigningKey(alg=alg, key=jwk.construct(entry, algorithm=alg))
+        except Exception as e:
+            logger.warning(
+                "JWKS key parse failed kid=%r kty=%r err=%s",
+                entry.get("kid"),
+                entry.get("kty"),
+                type(e).__name__,
+            )
+            continue
+        if first is None:
+            first = key
+        if isinstance(entry.get("kid"), str):
+            by_kid[entry["kid"]] = key
+    return by_kid, first
+
+
+class JwksKeyStore:
+    """
+    Thread-safe kid -> key map over a JWKS source (`fetch` returns the parsed document).
+
+    Only the very first load, and refetches for an unknown kid, block the caller; TTL
+    expiry is handled in the background. A failed fetch keeps the previous keys.
+    Concurrent callers share one fetch (single flight) instead of each starting their own.
+    """
+
+    def __init__(
+        self,
+        fetch: Callable[[], Any],
+        ttl_sec: float,
+        refetch_interval_sec: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._fetch = fetch
+        self._ttl = ttl_sec
+        self._refetch_interval = refetch_interval_sec
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._keys: dict[str, SigningKey] = {}
+        self._first: SigningKey | None = None
+        self._loaded_at: float | None = None
+        self._attempted_at: float | None = None
+        # Set once the fetch in flight has finished; None when no fetch is running.
+        self._in_flight: threading.Event | None = None
+        self._refresher: threading.Thread | None = None
+
+    def get(self, kid: str | None) -> SigningKey | None:
+        if self._loaded_at is None:
+            self._refresh_now()
+        elif self._clock() - self._loaded_at >= self._ttl:
+            self._refresh_in_background()
+
+        key = self._lookup(kid)
+        if key is None and kid is not None:
+            self._refresh_now()
+            key = self._lookup(kid)
+        return key
+
+    def _lookup(self, kid: str | None) -> SigningKey | None:
+        with self._lock:
+            return self._keys.get(kid) if kid is not None else self._first
+
+    def _start_fetch(self) -> threading.Event | None:
+        """Claim the next fetch if none is in flight and the refetch interval allows one (lock held)."""
+        if self._in_flight is not None:
+            return None
+        if self._attempted_at is not None and self._clock() - self._attempted_at < self._refetch_interval:
+            return None
+        self._attempted_at = self._clock()
+        self._in_flight = threading.Event()
+        return self._in_flight
+
+    def _refresh_now(self) -> None:
+        """Fetch now, or wait for the fetch already in flight."""
+        with self._lock:
+            in_flight = self._in_flight
+            claimed = self._start_fetch() if in_flight is None else None
+        if claimed is not None:
+            self._fetch_into(claimed)
+        elif in_flight is not None:
+            in_flight.wait()
+
+    def _refresh_in_background(self) -> None:
+        with self._lock:
+            claimed = self._start_fetch()
+            if claimed is None:
+                return  # already refreshing, or the last attempt failed recently
+            self._refresher = threading.Thread(
+                target=self._fetch_into, args=(claimed,), name="jwks-refresh", daemon=True
+            )
+            self._refresher.start()
+
+    def _fetch_into(self, in_flight: threading.Event) -> None:
+        keys: dict[str, SigningKey] | None = None
+        first: SigningKey | None = None
+        try:
+            keys, first = parse_jwks(self._fetch())
+        except Exception as e:
+            logger.warning("JWKS fetch failed err=%s", type(e).__name__)
+        finally:
+            with self._lock:
+                if keys is not None:
+                    self._keys, self._first = keys, first
+                    self._loaded_at = self._clock()
+                self._in_flight = None
+            in_flight.set()
@@ -0,0 +1,60 @@
+"""ASGI middleware: cut oversized upload bodies off with 413 before they are buffered."""
+
+from fastapi import HTTPException, status
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Room for multipart boundaries, part headers and small form fields around the PDF.
+_MULTIPART_OVERHEAD_BYTES = 64 * 1024
+
+
+class UploadSizeLimitMiddleware:
+    """
+    Enforce a body size cap on POST requests under `path_prefix`.
+
+    Requests with a larger Content-Length are rejected without reading the body; chunked
+    bodies are counted as they arrive and rejected once the cap is crossed. The exact
+    per-file limit is still enforced when the endpoint reads the upload.
+    """
+
+    def __init__(self, app: ASGIApp, max_file_bytes: int, path_prefix: str) -> None:
+        self.app = app
+        self.max_file_bytes = max_file_bytes
+        self.max_body_bytes = max_file_bytes + _MULTIPART_OVERHEAD_BYTES
+        self.path_prefix = path_prefix
+
+    def _detail(self, path: str) -> object:
+        message = f"File too large. Maximum size is {self.max_file_bytes // (1024 * 1024)} MB."
+        # Match the 413 shape each endpoint returns itself.
+        return {"message": message} if path.endswith("/pdf-info") else message
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            scope["type"] != "http"
+            or scope["method"] != "POST"
+            or not scope["path"].startswith(self.path_prefix)
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        detail = self._detail(scope["path"])
+        for name, value in scope["headers"]:
+            if name == b"content-length":
+                if value.isdigit() and int(value) > self.max_body_bytes:
+                    response = JSONResponse({"detail": detail}, status_code=status.HTTP_413_CONTENT_TOO_LARGE)
+                    await response(scope, receive, send)
+                    return
+                break
+
+        received = 0
+
+        async def limited_receive() -> Message:
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_body_bytes:
+                    raise HTTPException(status_code=status.HTTP_413_CONTENT_TOO_LARGE, detail=detail)
+            return message
+
+        await self.app(scope, limited_receive, send)
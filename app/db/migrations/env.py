@@ -8,6 +8,7 @@ from app.models.base import Base
 from app.models.user import User
 from app.models.conversion import Conversion
 from app.models.audit_log import AuditLog
+from app.models.usage_counter import UsageCounter
 
 config = context.config
 
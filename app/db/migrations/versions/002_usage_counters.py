@@ -0,0 +1,42 @@
+"""usage counters
+
+Revision ID: 002
+Revises: 001
+Create Date: 2026-10-16
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision: str = "002"
+down_revision: Union[str, Sequence[str], None] = "001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "usage_counters",
+        sa.Column("user_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("users.id"), primary_key=True),
+        sa.Column("period_start", sa.DateTime(timezone=True), primary_key=True),
+        sa.Column("used", sa.Integer(), nullable=False, server_default="0"),
+    )
+    # Seed from history: successes and pending jobs per UTC calendar month (the quota window).
+    op.execute(
+        """
+        INSERT INTO usage_counters (user_id, period_start, used)
+        SELECT user_id,
+               date_trunc('month', created_at AT TIME ZONE 'UTC') AT TIME ZONE 'UTC',
+               count(*)
+        FROM conversions
+        WHERE status IN ('success', 'pending') AND created_at IS NOT NULL
+        GROUP BY 1, 2
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("usage_counters")
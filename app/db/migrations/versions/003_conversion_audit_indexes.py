@@ -0,0 +1,56 @@
+"""composite indexes for conversions and audit_logs
+
+Revision ID: 003
+Revises: 002
+Create Date: 2026-10-16
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "003"
+down_revision: Union[str, Sequence[str], None] = "002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # CONCURRENTLY keeps conversions/audit_logs writable while the indexes build; it
+    # cannot run inside a transaction.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_conversions_user_id_created_at",
+            "conversions",
+            ["user_id", sa.text("created_at DESC")],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            "ix_conversions_user_id_created_at_success",
+            "conversions",
+            ["user_id", "created_at"],
+            postgresql_where=sa.text("status = 'success'"),
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            "ix_audit_logs_user_id_created_at",
+            "audit_logs",
+            ["user_id", "created_at"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        # Leading user_id columns of the composites cover these.
+        op.drop_index("ix_conversions_user_id", "conversions", postgresql_concurrently=True, if_exists=True)
+        op.drop_index("ix_audit_logs_user_id", "audit_logs", postgresql_concurrently=True, if_exists=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index("ix_audit_logs_user_id", "audit_logs", ["user_id"], postgresql_concurrently=True)
+        op.create_index("ix_conversions_user_id", "conversions", ["user_id"], postgresql_concurrently=True)
+        op.drop_index("ix_audit_logs_user_id_created_at", "audit_logs", postgresql_concurrently=True)
+        op.drop_index("ix_conversions_user_id_created_at_success", "conversions", postgresql_concurrently=True)
+        op.drop_index("ix_conversions_user_id_created_at", "conversions", postgresql_concurrently=True)
@@ -0,0 +1,42 @@
+"""conversions keyset pagination index
+
+Revision ID: 004
+Revises: 003
+Create Date: 2026-10-16
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "004"
+down_revision: Union[str, Sequence[str], None] = "003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # History pages order by (created_at, id); with id in the index the tie-break needs no sort.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_conversions_user_id_created_at_id",
+            "conversions",
+            ["user_id", sa.text("created_at DESC"), sa.text("id DESC")],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.drop_index(
+            "ix_conversions_user_id_created_at", "conversions", postgresql_concurrently=True, if_exists=True
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_conversions_user_id_created_at",
+            "conversions",
+            ["user_id", sa.text("created_at DESC")],
+            postgresql_concurrently=True,
+        )
+        op.drop_index("ix_conversions_user_id_created_at_id", "conversions", postgresql_concurrently=True)
@@ -0,0 +1,106 @@
+"""Connection pool metrics: checkouts, time spent waiting for a connection, exhaustion.
+
+`metered(pool_cls, metrics)` returns a subclass of a SQLAlchemy pool class whose checkouts
+are timed. A checkout counts as *saturated* when every connection the pool may open
+(`pool_size + max_overflow`) was already checked out, so the caller had to queue; one
+that gives up after `pool_timeout` is an *exhaustion*. Steady saturation means the pool is
+smaller than the concurrency using it (threadpool threads or async requests per worker).
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any
+
+from sqlalchemy import exc
+from sqlalchemy.pool import Pool, QueuePool
+
+from app.logging_config import get_logger
+
+logger = get_logger("app.db")
+
+
+@dataclass(frozen=True)
+class PoolStats:
+    checkouts: int
+    saturated: int
+    exhausted: int
+    wait_ms_total: float
+    wait_ms_max: float
+    # Current state (QueuePool only; None for pools without a fixed size, e.g. NullPool)
+    size: int | None
+    checked_out: int | None
+    overflow: int | None
+    max_overflow: int | None
+
+
+class PoolMetrics:
+    """Thread-safe counters shared by every pool an engine creates (dispose recreates it)."""
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self._lock = threading.Lock()
+        self._pool: Pool | None = None
+        self._checkouts = 0
+        self._saturated = 0
+        self._exhausted = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+
+    def _bind(self, pool: Pool) -> None:
+        self._pool = pool
+
+    def _record(self, wait_sec: float, saturated: bool, exhausted: bool = False) -> None:
+        with self._lock:
+            if exhausted:
+                self._exhausted += 1
+            else:
+                self._checkouts += 1
+            if saturated:
+                self._saturated += 1
+                self._wait_total += wait_sec
+                self._wait_max = max(self._wait_max, wait_sec)
+
+    def stats(self) -> PoolStats:
+        pool = self._pool
+        queue = pool if isinstance(pool, QueuePool) else None
+        with self._lock:
+            return PoolStats(
+                checkouts=self._checkouts,
+                saturated=self._saturated,
+                exhausted=self._exhausted,
+                wait_ms_total=round(self._wait_total * 1000, 3),
+                wait_ms_max=round(self._wait_max * 1000, 3),
+                size=queue.size() if queue else None,
+                checked_out=queue.checkedout() if queue else None,
+                overflow=queue.overflow() if queue else None,
+                max_overflow=queue._max_overflow if queue else None,
+            )
+
+
+def metered(pool_cls: type[Pool], metrics: PoolMetrics) -> type[Pool]:
+    """`pool_cls` with timed checkouts recorded in `metrics` (pass as `poolclass=`)."""
+
+    class MeteredPool(pool_cls):  # type: ignore[valid-type, misc]
+        def __init__(self, *args: Any, **kwargs: Any) -> None:
+            super().__init__(*args, **kwargs)
+            metrics._bind(self)
+
+        def _do_get(self) -> Any:
+            saturated = isinstance(self, QueuePool) and self._max_overflow > -1 and (
+                self.checkedout() >= self.size() + self._max_overflow
+            )
+            start = time.perf_counter()
+            try:
+                conn = super()._do_get()
+            except exc.TimeoutError:
+                metrics._record(time.perf_counter() - start, saturated=True, exhausted=True)
+                logger.warning("Connection pool exhausted pool=%s %s", metrics.name, self.status())
+                raise
+            metrics._record(time.perf_counter() - start, saturated)
+            return conn
+
+    MeteredPool.__name__ = MeteredPool.__qualname__ = f"Metered{pool_cls.__name__}"
+    return MeteredPool
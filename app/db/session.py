@@ -1,17 +1,68 @@
+import uuid
+from collections.abc import AsyncIterator
+from typing import Any
+
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, Session
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool, Pool, QueuePool
 from app.config import settings
+from app.db.pool_metrics import PoolMetrics, metered
 from app.models.base import Base
 from app.models.user import User
 from app.models.conversion import Conversion
 from app.models.audit_log import AuditLog
+from app.models.usage_counter import UsageCounter
+
+# Checkout counters by engine, reported by GET /health/pool.
+pool_metrics = {"sync": PoolMetrics("sync"), "async": PoolMetrics("async")}
+
+
+def _pool_options(queue_cls: type[Pool], metrics: PoolMetrics) -> dict[str, Any]:
+    """poolclass and sizing for DB_POOL_MODE ("null": one connection per checkout)."""
+    if settings.db_pool_mode == "null":
+        return {"poolclass": metered(NullPool, metrics)}
+    return {
+        "poolclass": metered(queue_cls, metrics),
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout_sec,
+        "pool_recycle": settings.db_pool_recycle_sec,
+    }
+
+
+def _asyncpg_connect_args() -> dict[str, Any]:
+    if not settings.database_pgbouncer or not settings.database_url_async.startswith("postgresql+asyncpg"):
+        return {}
+    # A transaction-mode pooler hands each transaction to any server connection, where a
+    # statement prepared on another one does not exist: no statement caches, and unique
+    # names for the unnamed statements asyncpg still prepares.
+    return {
+        "statement_cache_size": 0,
+        "prepared_statement_cache_size": 0,
+        "prepared_statement_name_func": lambda: f"__asyncpg_{uuid.uuid4()}__",
+    }
+
 
 engine = create_engine(
     settings.database_url_psycopg2,
     pool_pre_ping=True,
+    **_pool_options(QueuePool, pool_metrics["sync"]),
 )
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# asyncpg engine for the async routes: a query awaits on the event loop instead of holding
+# a threadpool thread. No connection is opened until the first async request.
+async_engine = create_async_engine(
+    settings.database_url_async,
+    pool_pre_ping=True,
+    connect_args=_asyncpg_connect_args(),
+    **_pool_options(AsyncAdaptedQueuePool, pool_metrics["async"]),
+)
+# Attributes stay loaded after commit: an expired attribute would need a lazy load, which
+# AsyncSession cannot do implicitly.
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
 
 def get_db() -> Session:
     db = SessionLocal()
@@ -19,3 +70,8 @@ def get_db() -> Session:
         yield db
     finally:
         db.close()
+
+
+async def get_async_db() -> AsyncIterator[AsyncSession]:
+    async with AsyncSessionLocal() as db:
+        yield db
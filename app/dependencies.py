@@ -1,21 +1,50 @@
+import asyncio
+import hmac
+from collections.abc import AsyncIterator, Iterator
+from typing import cast
 from uuid import UUID
 from fastapi import Depends, HTTPException, Request, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
-from sqlalchemy.orm import Session
+from sqlalchemy import event, inspect as sa_inspect
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, make_transient_to_detached
 
-from app.core.auth import verify_supabase_jwt
+from app.config import settings
+from app.core.auth import cached_supabase_jwt, verify_supabase_jwt
+from app.core.cache import ByteBudgetLRU
+from app.core.cancellation import CancellationToken
 from app.logging_config import get_logger
-from app.db.session import get_db
+from app.db.session import get_async_db, get_db
 from app.models.user import User
-from app.repositories.user_repository import UserRepository
-from app.repositories.conversion_repository import ConversionRepository
+from app.repositories.user_repository import AsyncUserRepository, UserRepository
+from app.repositories.conversion_repository import AsyncConversionRepository, ConversionRepository
 from app.repositories.audit_log_repository import AuditLogRepository
-from app.services.conversion import ConversionService
-from app.strategies.table_extraction import PdfplumberTableExtractor
+from app.repositories.usage_counter_repository import AsyncUsageCounterRepository, UsageCounterRepository
+from app.services.conversion import ConversionService, result_cache
+from app.services.unit_of_work import ConversionUnitOfWork
+from app.strategies.table_extraction import (
+    PageCache,
+    PdfplumberTableExtractor,
+    TableExtractorStrategy,
+    tables_size,
+)
+from app.strategies.parallel_extraction import ProcessPoolTableExtractor
 
 security = HTTPBearer(auto_error=False)
 logger = get_logger("app.auth")
 
+# Shared by every extractor of this process (see PdfplumberTableExtractor).
+page_cache: PageCache = ByteBudgetLRU(settings.page_cache_max_bytes, sizeof=tables_size)
+
+# Detached User snapshots by id. The short TTL bounds staleness for changes made by other
+# processes; updates flushed through this process's ORM drop the entry (`_forget_user`).
+user_cache: ByteBudgetLRU[UUID, User] = ByteBudgetLRU(
+    settings.user_cache_max_entries,
+    sizeof=lambda _u: 1,
+    ttl_sec=settings.user_cache_ttl_sec,
+)
+
 
 def get_user_repo(db: Session = Depends(get_db)) -> UserRepository:
     return UserRepository(db)
@@ -29,14 +58,70 @@ def get_audit_repo(db: Session = Depends(get_db)) -> AuditLogRepository:
     return AuditLogRepository(db)
 
 
+def get_usage_repo(db: Session = Depends(get_db)) -> UsageCounterRepository:
+    return UsageCounterRepository(db)
+
+
+async def get_async_user_repo(db: AsyncSession = Depends(get_async_db)) -> AsyncUserRepository:
+    return AsyncUserRepository(db)
+
+
+async def get_async_conversion_repo(db: AsyncSession = Depends(get_async_db)) -> AsyncConversionRepository:
+    return AsyncConversionRepository(db)
+
+
+async def get_async_usage_repo(db: AsyncSession = Depends(get_async_db)) -> AsyncUsageCounterRepository:
+    return AsyncUsageCounterRepository(db)
+
+
+def get_unit_of_work(db: Session = Depends(get_db)) -> Iterator[ConversionUnitOfWork]:
+    """Staged conversion writes, committed in one transaction once the response is sent."""
+    uow = ConversionUnitOfWork(db)
+    try:
+        yield uow
+    finally:
+        uow.close()
+
+
+def get_table_extractor() -> TableExtractorStrategy:
+    if settings.extraction_workers > 0:
+        return ProcessPoolTableExtractor(
+            workers=settings.extraction_workers,
+            chunk_pages=settings.extraction_chunk_pages,
+            memory_mb=settings.extraction_worker_memory_mb,
+            cpu_seconds=settings.extraction_worker_cpu_seconds,
+            page_cache=page_cache,
+            prescreen=settings.extraction_prescreen,
+        )
+    return PdfplumberTableExtractor(page_cache=page_cache, prescreen=settings.extraction_prescreen)
+
+
 def get_conversion_service() -> ConversionService:
-    return ConversionService(table_extractor=PdfplumberTableExtractor())
+    return ConversionService(table_extractor=get_table_extractor(), result_cache=result_cache)
 
 
-def _user_id_from_credentials(
-    credentials: HTTPAuthorizationCredentials | None,
-    request: Request | None = None,
-) -> UUID:
+async def get_disconnect_token(request: Request) -> AsyncIterator[CancellationToken]:
+    """
+    Token cancelled when the client disconnects. Listens for `http.disconnect` from
+    after the body has been read until the response is done (request-scoped dependency).
+    """
+    token = CancellationToken()
+
+    async def watch() -> None:
+        while True:
+            message = await request.receive()
+            if message["type"] == "http.disconnect":
+                token.cancel("Client disconnected.")
+                return
+
+    task = asyncio.create_task(watch())
+    try:
+        yield token
+    finally:
+        task.cancel()
+
+
+def _bearer_token(credentials: HTTPAuthorizationCredentials | None, request: Request | None = None) -> str:
     if not credentials or not credentials.credentials:
         if request:
             logger.info("Auth missing credentials %s %s", request.method, request.url.path)
@@ -45,7 +130,11 @@ def _user_id_from_credentials(
             detail="Not authenticated",
             headers={"WWW-Authenticate": "Bearer"},
         )
-    payload = verify_supabase_jwt(credentials.credentials)
+    return credentials.credentials
+
+
+def _claims(payload: dict | None, request: Request | None = None) -> tuple[UUID, dict]:
+    """User id and payload of a verified token, or 401."""
     if not payload:
         if request:
             logger.info("Auth invalid token %s %s", request.method, request.url.path)
@@ -64,7 +153,7 @@ def _user_id_from_credentials(
             headers={"WWW-Authenticate": "Bearer"},
         )
     try:
-        return UUID(user_id_raw)
+        return UUID(user_id_raw), payload
     except (ValueError, TypeError):
         if request:
             logger.info("Auth invalid sub uuid %s %s sub=%r", request.method, request.url.path, user_id_raw)
@@ -75,13 +164,68 @@ def _user_id_from_credentials(
         )
 
 
+def _verified_claims(
+    credentials: HTTPAuthorizationCredentials | None,
+    request: Request | None = None,
+) -> tuple[UUID, dict]:
+    """Verify the bearer token once; return the user id and the verified payload."""
+    token = _bearer_token(credentials, request)
+    return _claims(verify_supabase_jwt(token), request)
+
+
+async def _verified_claims_async(
+    credentials: HTTPAuthorizationCredentials | None,
+    request: Request | None = None,
+) -> tuple[UUID, dict]:
+    """_verified_claims for async routes: signature checks and JWKS fetches run in the threadpool."""
+    token = _bearer_token(credentials, request)
+    payload = cached_supabase_jwt(token)
+    if payload is None:
+        payload = await run_in_threadpool(verify_supabase_jwt, token)
+    return _claims(payload, request)
+
+
+def _snapshot(user: User) -> User:
+    """Detached copy of the loaded columns, safe to share between sessions."""
+    copy = User(**{attr.key: getattr(user, attr.key) for attr in sa_inspect(User).column_attrs})
+    make_transient_to_detached(copy)
+    return copy
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _forget_user(_mapper, _connection, target: User) -> None:
+    # Plan or limit changes flushed by this process are visible on the next request.
+    user_cache.pop(cast(UUID, target.id))
+
+
+def _load_user(repo: UserRepository, user_id: UUID) -> User | None:
+    snapshot = user_cache.get(user_id)
+    if snapshot is not None:
+        return repo.attach(snapshot)
+    user = repo.get_by_id(user_id)
+    if user is not None:
+        user_cache.put(user_id, _snapshot(user))
+    return user
+
+
+async def _load_user_async(repo: AsyncUserRepository, user_id: UUID) -> User | None:
+    snapshot = user_cache.get(user_id)
+    if snapshot is not None:
+        return await repo.attach(snapshot)
+    user = await repo.get_by_id(user_id)
+    if user is not None:
+        user_cache.put(user_id, _snapshot(user))
+    return user
+
+
 def get_current_user(
     request: Request,
     repo: UserRepository = Depends(get_user_repo),
     credentials: HTTPAuthorizationCredentials | None = Depends(security),
 ) -> User:
-    user_id = _user_id_from_credentials(credentials, request=request)
-    user = repo.get_by_id(user_id)
+    user_id, _ = _verified_claims(credentials, request=request)
+    user = _load_user(repo, user_id)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -95,27 +239,33 @@ def get_or_create_current_user(
     repo: UserRepository = Depends(get_user_repo),
     credentials: HTTPAuthorizationCredentials | None = Depends(security),
 ) -> User:
-    user_id = _user_id_from_credentials(credentials, request=request)
-    user = repo.get_by_id(user_id)
+    user_id, payload = _verified_claims(credentials, request=request)
+    user = _load_user(repo, user_id)
     if user:
         return user
-    # `_user_id_from_credentials` has already validated credentials/token. This is defensive.
-    if not credentials or not credentials.credentials:
-        logger.info("Auth missing credentials (post-validate) %s %s", request.method, request.url.path)
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Not authenticated",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
+    email = payload.get("email") or payload.get("email_address")
+    user = User(
+        id=user_id,
+        email=email,
+        plan="FREE",
+        conversions_limit=10,
+        conversions_used=0,
+    )
+    user = repo.create(user)
+    user_cache.put(user_id, _snapshot(user))
+    return user
 
-    payload = verify_supabase_jwt(credentials.credentials)
-    if payload is None:
-        logger.info("Auth invalid token (post-validate) %s %s", request.method, request.url.path)
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid or expired token",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
+
+async def get_or_create_current_user_async(
+    request: Request,
+    repo: AsyncUserRepository = Depends(get_async_user_repo),
+    credentials: HTTPAuthorizationCredentials | None = Depends(security),
+) -> User:
+    """get_or_create_current_user for async routes."""
+    user_id, payload = await _verified_claims_async(credentials, request=request)
+    user = await _load_user_async(repo, user_id)
+    if user:
+        return user
     email = payload.get("email") or payload.get("email_address")
     user = User(
         id=user_id,
@@ -124,4 +274,22 @@ def get_or_create_current_user(
         conversions_limit=10,
         conversions_used=0,
     )
-    return repo.create(user)
+    user = await repo.create(user)
+    user_cache.put(user_id, _snapshot(user))
+    return user
+
+
+def require_ops_token(credentials: HTTPAuthorizationCredentials | None = Depends(security)) -> None:
+    """
+    Guard for operational endpoints (/health/pool, /health/cache): a bearer token equal to OPS_TOKEN.
+    With OPS_TOKEN unset they are disabled and answer 404, as if they did not exist.
+    """
+    if not settings.ops_token:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    token = _bearer_token(credentials)
+    if not hmac.compare_digest(token.encode("utf-8"), settings.ops_token.encode("utf-8")):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
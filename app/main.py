@@ -1,11 +1,21 @@
 import time
+from dataclasses import asdict
 
-from fastapi import FastAPI, Request
+import anyio.to_thread
+from fastapi import Depends, FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.config import settings
+from app.core.upload_limit import UploadSizeLimitMiddleware
 from app.api.v1 import auth, convert, history, usage
+from app.db.session import async_engine, pool_metrics
+from app.dependencies import page_cache, require_ops_token
 from app.logging_config import setup_logging, get_logger
+from app.services import download_cache
+from app.services.audit import shutdown_audit_sink
+from app.services.conversion import result_cache
+from app.services.conversion_jobs import fail_stale_jobs, shutdown_job_runner
+from app.strategies import parallel_extraction
 
 setup_logging()
 logger = get_logger()
@@ -24,6 +34,11 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(
+    UploadSizeLimitMiddleware,
+    max_file_bytes=settings.max_pdf_bytes,
+    path_prefix="/api/v1/convert",
+)
 
 
 @app.middleware("http")
@@ -58,6 +73,26 @@ async def log_requests(request: Request, call_next):
 @app.on_event("startup")
 def startup():
     logger.info("Tabularis API starting")
+    try:
+        fail_stale_jobs()
+    except Exception:
+        logger.exception("Could not fail stale conversion jobs")
+    if settings.extraction_workers > 0:
+        parallel_extraction.warm_pool(settings.extraction_workers, settings.extraction_worker_memory_mb)
+        logger.info("Extraction pool ready workers=%s", settings.extraction_workers)
+
+
+@app.on_event("shutdown")
+def shutdown():
+    shutdown_job_runner()
+    parallel_extraction.shutdown_pool()
+    # Last: the steps above may still log audit events.
+    shutdown_audit_sink()
+
+
+@app.on_event("shutdown")
+async def close_async_engine():
+    await async_engine.dispose()
 
 
 @app.get("/health")
@@ -66,6 +101,41 @@ def health():
     return {"status": "ok"}
 
 
+@app.get("/health/pool", dependencies=[Depends(require_ops_token)])
+async def health_pool():
+    """
+    Connection pool state and checkout counters per engine. `saturated` checkouts had to
+    queue for a connection and `exhausted` ones timed out: size DB_POOL_SIZE +
+    DB_MAX_OVERFLOW against `threadpool_size` (sync routes) and async concurrency, times
+    the number of workers, within the server's connection limit. Requires OPS_TOKEN.
+    """
+    return {
+        "mode": settings.db_pool_mode,
+        "pgbouncer": settings.database_pgbouncer,
+        "threadpool_size": anyio.to_thread.current_default_thread_limiter().total_tokens,
+        "pools": {name: asdict(metrics.stats()) for name, metrics in pool_metrics.items()},
+    }
+
+
+@app.get("/health/cache", dependencies=[Depends(require_ops_token)])
+def health_cache():
+    """
+    Counters of this worker's result and page caches, and of the download cache's store
+    (shared by every worker with a local/redis backend; null if it keeps none). A low
+    hit rate with steady evictions means the byte budget is too small. Requires OPS_TOKEN.
+    """
+    try:
+        downloads = download_cache.stats()
+    except Exception:
+        logger.exception("Download cache stats unavailable")
+        downloads = None
+    return {
+        "result": asdict(result_cache.stats()),
+        "page": asdict(page_cache.stats()),
+        "download": asdict(downloads) if downloads is not None else None,
+    }
+
+
 @app.exception_handler(Exception)
 async def unhandled_exception_handler(request: Request, exc: Exception):
     """Log unhandled exceptions (not HTTPException) and return 500."""
@@ -2,5 +2,6 @@ from app.models.base import Base
 from app.models.user import User
 from app.models.conversion import Conversion
 from app.models.audit_log import AuditLog
+from app.models.usage_counter import UsageCounter
 
-__all__ = ["Base", "User", "Conversion", "AuditLog"]
+__all__ = ["Base", "User", "Conversion", "AuditLog", "UsageCounter"]
@@ -1,5 +1,5 @@
 import uuid
-from sqlalchemy import Column, String, Integer, BigInteger, DateTime, ForeignKey
+from sqlalchemy import Column, String, Integer, BigInteger, DateTime, ForeignKey, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.sql import func
 from app.models.base import Base
@@ -9,10 +9,23 @@ class Conversion(Base):
     __tablename__ = "conversions"
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False, index=True)
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
     filename = Column(String(512), nullable=False)
     size_bytes = Column(BigInteger, nullable=False)
-    status = Column(String(20), nullable=False)  # success | failed
+    status = Column(String(20), nullable=False)  # success | failed | cancelled (client went away) | pending (queued/running job)
     duration_ms = Column(Integer, nullable=True)
     error_message = Column(String(1024), nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    __table_args__ = (
+        # History pages (newest first, keyset on created_at, id) and per-user counts/deletes.
+        Index("ix_conversions_user_id_created_at_id", user_id, created_at.desc(), id.desc()),
+        # Successful conversions in a window (usage counter seed, reporting).
+        Index(
+            "ix_conversions_user_id_created_at_success",
+            user_id,
+            created_at,
+            postgresql_where=status == "success",
+            sqlite_where=status == "success",
+        ),
+    )
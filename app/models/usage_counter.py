@@ -0,0 +1,13 @@
+from sqlalchemy import Column, DateTime, ForeignKey, Integer
+from sqlalchemy.dialects.postgresql import UUID
+from app.models.base import Base
+
+
+class UsageCounter(Base):
+    """Billable conversions per user and monthly window: successes plus slots held by running conversions."""
+
+    __tablename__ = "usage_counters"
+
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), primary_key=True)
+    period_start = Column(DateTime(timezone=True), primary_key=True)
+    used = Column(Integer, default=0, nullable=False)
@@ -2,6 +2,7 @@
 
 from abc import ABC, abstractmethod
 
+from app.config import settings
 from app.models.user import User
 
 
@@ -13,11 +14,21 @@ class UsagePolicy(ABC):
         """Return True if user has remaining conversions under this plan."""
         ...
 
+    @abstractmethod
+    def monthly_limit(self, user: User) -> int:
+        """Conversions allowed per monthly window (0 = unlimited)."""
+        ...
+
     @abstractmethod
     def limit_exceeded_message(self) -> str:
         """Message to show when user hits the limit."""
         ...
 
+    @abstractmethod
+    def conversion_time_budget_sec(self) -> float:
+        """Wall-clock budget for extracting one conversion (0 = unbounded)."""
+        ...
+
 
 class FreePlanPolicy(UsagePolicy):
     """FREE plan: fixed limit (e.g. 10 conversions)."""
@@ -25,9 +36,15 @@ class FreePlanPolicy(UsagePolicy):
     def can_convert(self, user: User) -> bool:
         return (user.conversions_used or 0) < (user.conversions_limit or 10)
 
+    def monthly_limit(self, user: User) -> int:
+        return user.conversions_limit or 10
+
     def limit_exceeded_message(self) -> str:
         return "Usage limit reached. Please upgrade to Pro to continue converting."
 
+    def conversion_time_budget_sec(self) -> float:
+        return settings.free_conversion_time_budget_sec
+
 
 class ProPlanPolicy(UsagePolicy):
     """PRO plan: use user's conversions_limit (0 = unlimited)."""
@@ -38,9 +55,15 @@ class ProPlanPolicy(UsagePolicy):
             return True  # unlimited
         return (user.conversions_used or 0) < limit
 
+    def monthly_limit(self, user: User) -> int:
+        return max(user.conversions_limit or 0, 0)
+
     def limit_exceeded_message(self) -> str:
         return "Usage limit reached for your plan."
 
+    def conversion_time_budget_sec(self) -> float:
+        return settings.pro_conversion_time_budget_sec
+
 
 def get_usage_policy(plan: str) -> UsagePolicy:
     """Return the policy for the given plan name."""
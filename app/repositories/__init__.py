@@ -1,5 +1,6 @@
 from app.repositories.user_repository import UserRepository
 from app.repositories.conversion_repository import ConversionRepository
 from app.repositories.audit_log_repository import AuditLogRepository
+from app.repositories.usage_counter_repository import UsageCounterRepository
 
-__all__ = ["UserRepository", "ConversionRepository", "AuditLogRepository"]
+__all__ = ["UserRepository", "ConversionRepository", "AuditLogRepository", "UsageCounterRepository"]
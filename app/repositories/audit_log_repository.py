@@ -1,7 +1,10 @@
 """Repository: data access for AuditLog."""
 
 import uuid
+from typing import Any
 from uuid import UUID
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.models.audit_log import AuditLog
@@ -28,3 +31,44 @@ class AuditLogRepository:
         self._db.add(entry)
         self._db.commit()
         return entry
+
+    def create_many(self, rows: list[dict[str, Any]], commit: bool = True) -> None:
+        """Insert AuditLog rows (column -> value dicts) as one multi-row INSERT."""
+        if not rows:
+            return
+        self._db.execute(insert(AuditLog).values(rows))
+        if commit:
+            self._db.commit()
+
+
+class AsyncAuditLogRepository:
+    """AuditLogRepository for the async routes."""
+
+    def __init__(self, db: AsyncSession) -> None:
+        self._db = db
+
+    async def create(
+        self,
+        user_id: UUID | None,
+        action: str,
+        ip: str | None = None,
+        user_agent: str | None = None,
+    ) -> AuditLog:
+        entry = AuditLog(
+            id=uuid.uuid4(),
+            user_id=user_id,
+            action=action,
+            ip=ip,
+            user_agent=user_agent,
+        )
+        self._db.add(entry)
+        await self._db.commit()
+        return entry
+
+    async def create_many(self, rows: list[dict[str, Any]], commit: bool = True) -> None:
+        """Insert AuditLog rows (column -> value dicts) as one multi-row INSERT."""
+        if not rows:
+            return
+        await self._db.execute(insert(AuditLog).values(rows))
+        if commit:
+            await self._db.commit()
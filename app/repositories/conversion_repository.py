@@ -1,17 +1,41 @@
 """Repository: data access for Conversion."""
 
+import json
 from datetime import datetime
 from uuid import UUID
-from sqlalchemy import func
+from typing import Any
+from sqlalchemy import Select, delete, func, select, text, tuple_, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.models.conversion import Conversion
 
+_ESTIMATE_BY_USER = text("EXPLAIN (FORMAT JSON) SELECT 1 FROM conversions WHERE user_id = :user_id")
+
+
+def _plan_rows(plan: Any) -> int:
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+def _page_by_user(
+    user_id: UUID, *, limit: int, offset: int, before: tuple[datetime, UUID] | None
+) -> Select[tuple[Conversion]]:
+    query = select(Conversion).where(Conversion.user_id == user_id)
+    if before is not None:
+        query = query.where(tuple_(Conversion.created_at, Conversion.id) < tuple_(*before))
+    return query.order_by(Conversion.created_at.desc(), Conversion.id.desc()).offset(offset).limit(limit)
+
 
 class ConversionRepository:
     def __init__(self, db: Session) -> None:
         self._db = db
 
+    def add(self, conversion: Conversion) -> None:
+        """Stage a new row in the current transaction (the caller commits)."""
+        self._db.add(conversion)
+
     def create(self, conversion: Conversion) -> Conversion:
         self._db.add(conversion)
         self._db.commit()
@@ -36,21 +60,59 @@ class ConversionRepository:
             or 0
         )
 
+    def finish(
+        self,
+        conversion_id: UUID,
+        *,
+        status: str,
+        duration_ms: int,
+        error_message: str | None = None,
+        commit: bool = True,
+    ) -> None:
+        """Record the outcome of a pending conversion (async job)."""
+        self._db.query(Conversion).filter(Conversion.id == conversion_id).update(
+            {"status": status, "duration_ms": duration_ms, "error_message": error_message},
+            synchronize_session=False,
+        )
+        if commit:
+            self._db.commit()
+
+    def fail_pending_before(self, cutoff: datetime, error_message: str) -> list[tuple[UUID, datetime]]:
+        """
+        Mark "pending" rows created before `cutoff` as failed (jobs lost with the process that
+        ran them). Returns (user_id, created_at) of each row, in the caller's transaction.
+        """
+        rows = self._db.execute(
+            update(Conversion)
+            .where(Conversion.status == "pending", Conversion.created_at < cutoff)
+            .values(status="failed", duration_ms=0, error_message=error_message)
+            .returning(Conversion.user_id, Conversion.created_at)
+        )
+        return [(row.user_id, row.created_at) for row in rows]
+
+    def estimate_count_by_user(self, user_id: UUID) -> int:
+        """
+        Planner row estimate for the user's conversions (PostgreSQL): no scan, but only as
+        good as the table statistics. Other databases fall back to an exact count.
+        """
+        if self._db.get_bind().dialect.name != "postgresql":
+            return self.count_by_user(user_id)
+        plan = self._db.execute(_ESTIMATE_BY_USER, {"user_id": user_id}).scalar()
+        return _plan_rows(plan)
+
     def list_by_user(
         self,
         user_id: UUID,
         *,
         limit: int = 20,
         offset: int = 0,
+        before: tuple[datetime, UUID] | None = None,
     ) -> list[Conversion]:
-        return (
-            self._db.query(Conversion)
-            .filter(Conversion.user_id == user_id)
-            .order_by(Conversion.created_at.desc())
-            .offset(offset)
-            .limit(limit)
-            .all()
-        )
+        """
+        Newest first, ties broken by id. `before` is the (created_at, id) of the last row
+        of the previous page (keyset pagination: the index seeks there, nothing is skipped).
+        """
+        return list(self._db.scalars(_page_by_user(user_id, limit=limit, offset=offset, before=before)))
 
     def delete_by_id_and_user(self, conversion_id: UUID, user_id: UUID) -> bool:
         """Delete conversion if it belongs to user. Returns True if deleted."""
@@ -70,3 +132,49 @@ class ConversionRepository:
         deleted = self._db.query(Conversion).filter(Conversion.user_id == user_id).delete()
         self._db.commit()
         return deleted
+
+
+class AsyncConversionRepository:
+    """ConversionRepository for the async routes (history, download)."""
+
+    def __init__(self, db: AsyncSession) -> None:
+        self._db = db
+
+    async def get_by_id(self, conversion_id: UUID) -> Conversion | None:
+        return await self._db.get(Conversion, conversion_id)
+
+    async def count_by_user(self, user_id: UUID) -> int:
+        count = await self._db.scalar(select(func.count(Conversion.id)).where(Conversion.user_id == user_id))
+        return count or 0
+
+    async def estimate_count_by_user(self, user_id: UUID) -> int:
+        """See ConversionRepository.estimate_count_by_user."""
+        if self._db.get_bind().dialect.name != "postgresql":
+            return await self.count_by_user(user_id)
+        plan = await self._db.scalar(_ESTIMATE_BY_USER, {"user_id": user_id})
+        return _plan_rows(plan)
+
+    async def list_by_user(
+        self,
+        user_id: UUID,
+        *,
+        limit: int = 20,
+        offset: int = 0,
+        before: tuple[datetime, UUID] | None = None,
+    ) -> list[Conversion]:
+        """See ConversionRepository.list_by_user."""
+        return list(await self._db.scalars(_page_by_user(user_id, limit=limit, offset=offset, before=before)))
+
+    async def delete_by_id_and_user(self, conversion_id: UUID, user_id: UUID) -> bool:
+        """Delete conversion if it belongs to user. Returns True if deleted."""
+        result = await self._db.execute(
+            delete(Conversion).where(Conversion.id == conversion_id, Conversion.user_id == user_id)
+        )
+        await self._db.commit()
+        return result.rowcount > 0
+
+    async def delete_all_by_user(self, user_id: UUID) -> int:
+        """Delete all conversions for user. Returns count deleted."""
+        result = await self._db.execute(delete(Conversion).where(Conversion.user_id == user_id))
+        await self._db.commit()
+        return result.rowcount
@@ -0,0 +1,70 @@
+"""Repository: data access for UsageCounter (monthly quota, reserved atomically)."""
+
+from datetime import datetime
+from uuid import UUID
+from sqlalchemy import Select, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.models.usage_counter import UsageCounter
+
+
+def _used_in(user_id: UUID, period_start: datetime) -> Select[tuple[int]]:
+    return select(UsageCounter.used).where(
+        UsageCounter.user_id == user_id,
+        UsageCounter.period_start == period_start,
+    )
+
+
+class UsageCounterRepository:
+    def __init__(self, db: Session) -> None:
+        self._db = db
+
+    def get_used(self, user_id: UUID, period_start: datetime) -> int:
+        return self._db.execute(_used_in(user_id, period_start)).scalar() or 0
+
+    def reserve(self, user_id: UUID, period_start: datetime, limit: int) -> int | None:
+        """
+        Take one slot if fewer than `limit` are used (limit <= 0: unlimited). Returns the new
+        count, or None when the limit is reached. One upsert whose UPDATE branch is
+        conditional, so concurrent requests cannot both take the last slot.
+        """
+        dialect = postgresql if self._db.get_bind().dialect.name == "postgresql" else sqlite
+        stmt = (
+            dialect.insert(UsageCounter)
+            .values(user_id=user_id, period_start=period_start, used=1)
+            .on_conflict_do_update(
+                index_elements=[UsageCounter.user_id, UsageCounter.period_start],
+                set_={"used": UsageCounter.used + 1},
+                where=UsageCounter.used < limit if limit > 0 else None,
+            )
+            .returning(UsageCounter.used)
+        )
+        used = self._db.execute(stmt).scalar()
+        self._db.commit()
+        return used
+
+    def release(self, user_id: UUID, period_start: datetime, commit: bool = True) -> None:
+        """Give back a slot taken by `reserve` (the conversion did not succeed)."""
+        self._db.execute(
+            update(UsageCounter)
+            .where(
+                UsageCounter.user_id == user_id,
+                UsageCounter.period_start == period_start,
+                UsageCounter.used > 0,
+            )
+            .values(used=UsageCounter.used - 1)
+        )
+        if commit:
+            self._db.commit()
+
+
+class AsyncUsageCounterRepository:
+    """Read side of UsageCounterRepository for the async routes (/me, /usage)."""
+
+    def __init__(self, db: AsyncSession) -> None:
+        self._db = db
+
+    async def get_used(self, user_id: UUID, period_start: datetime) -> int:
+        return await self._db.scalar(_used_in(user_id, period_start)) or 0
@@ -1,6 +1,7 @@
 """Repository: data access for User."""
 
 from uuid import UUID
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.models.user import User
@@ -13,6 +14,10 @@ class UserRepository:
     def get_by_id(self, user_id: UUID) -> User | None:
         return self._db.query(User).filter(User.id == user_id).first()
 
+    def attach(self, snapshot: User) -> User:
+        """Session-bound copy of a detached snapshot, without a SELECT."""
+        return self._db.merge(snapshot, load=False)
+
     def create(self, user: User) -> User:
         self._db.add(user)
         self._db.commit()
@@ -23,3 +28,23 @@ class UserRepository:
         user.conversions_used = (user.conversions_used or 0) + 1
         self._db.add(user)
         self._db.commit()
+
+
+class AsyncUserRepository:
+    """UserRepository for the async routes."""
+
+    def __init__(self, db: AsyncSession) -> None:
+        self._db = db
+
+    async def get_by_id(self, user_id: UUID) -> User | None:
+        return await self._db.get(User, user_id)
+
+    async def attach(self, snapshot: User) -> User:
+        """Session-bound copy of a detached snapshot, without a SELECT."""
+        return await self._db.merge(snapshot, load=False)
+
+    async def create(self, user: User) -> User:
+        self._db.add(user)
+        await self._db.commit()
+        await self._db.refresh(user)
+        return user
@@ -17,6 +17,23 @@ class ConversionItem(BaseModel):
     model_config = {"from_attributes": True}
 
 
+class ConversionJobStatus(BaseModel):
+    id: str
+    status: str
+    filename: str
+    output_format: str
+    pages_done: int
+    pages_total: int
+    conversion_id: UUID | None
+    error: str | None
+    skipped_pages: list[int] = []
+    missing_pages: list[int] = []
+
+
 class ConversionList(BaseModel):
     items: list[ConversionItem]
-    total: int
+    # None when not requested (total=none); a planner estimate when total_is_estimate.
+    total: int | None
+    total_is_estimate: bool = False
+    # Opaque; pass as `cursor` for the next page. None on the last page.
+    next_cursor: str | None = None
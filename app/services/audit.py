@@ -1,9 +1,138 @@
-"""Audit: delegate to AuditLogRepository."""
+"""Audit: events go to a buffered background writer, or straight to AuditLogRepository.
 
+`BufferedAuditSink` queues events in memory and a single thread writes them as multi-row
+INSERTs, once `batch_size` events are waiting or `flush_interval_sec` after the first one.
+The queue is bounded: when it stays full for `enqueue_timeout_sec`, `log_audit` writes
+the event through the caller's repository instead (the old synchronous path), so a slow
+database slows producers down rather than growing memory or dropping events. Shutdown
+drains the queue.
+"""
+
+from __future__ import annotations
+
+import queue
+import threading
+import time
+import uuid
+from collections.abc import Callable
+from datetime import datetime, timezone
+from typing import Any
 from uuid import UUID
 
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.db.session import SessionLocal
+from app.logging_config import get_logger
 from app.repositories.audit_log_repository import AuditLogRepository
 
+logger = get_logger("app.audit")
+
+
+class BufferedAuditSink:
+    """Bounded in-memory queue of audit rows drained by one writer thread."""
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        queue_size: int,
+        batch_size: int,
+        flush_interval_sec: float,
+        enqueue_timeout_sec: float,
+    ) -> None:
+        self._session_factory = session_factory
+        self._batch_size = max(1, batch_size)
+        self._flush_interval = flush_interval_sec
+        self._enqueue_timeout = enqueue_timeout_sec
+        self._queue: queue.Queue[dict[str, Any] | None] = queue.Queue(maxsize=queue_size)
+        self._thread = threading.Thread(target=self._run, name="audit-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, row: dict[str, Any]) -> bool:
+        """Queue a row; False if the queue stayed full (the caller writes it instead)."""
+        try:
+            self._queue.put(row, timeout=self._enqueue_timeout)
+        except queue.Full:
+            return False
+        return True
+
+    def close(self, timeout: float | None = 10.0) -> None:
+        """Write everything queued so far and stop the writer."""
+        self._queue.put(None)
+        self._thread.join(timeout)
+
+    def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            first = self._queue.get()
+            if first is None:
+                break
+            batch = [first]
+            deadline = time.monotonic() + self._flush_interval
+            while len(batch) < self._batch_size:
+                try:
+                    row = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+                if row is None:
+                    stopping = True
+                    break
+                batch.append(row)
+            self._write(batch)
+
+    def _write(self, batch: list[dict[str, Any]]) -> None:
+        db = self._session_factory()
+        try:
+            AuditLogRepository(db).create_many(batch)
+        except Exception:
+            logger.exception("Audit batch insert failed; %s events lost", len(batch))
+        finally:
+            db.close()
+
+
+_sink: BufferedAuditSink | None = None
+_sink_closed = False
+_sink_lock = threading.Lock()
+
+
+def get_audit_sink() -> BufferedAuditSink | None:
+    """Process-wide sink (created on first use); None when AUDIT_QUEUE_SIZE is 0 or after shutdown."""
+    global _sink
+    if settings.audit_queue_size <= 0 or _sink_closed:
+        return None
+    with _sink_lock:
+        if _sink is None and not _sink_closed:
+            _sink = BufferedAuditSink(
+                SessionLocal,
+                queue_size=settings.audit_queue_size,
+                batch_size=settings.audit_batch_size,
+                flush_interval_sec=settings.audit_flush_interval_sec,
+                enqueue_timeout_sec=settings.audit_enqueue_timeout_sec,
+            )
+        return _sink
+
+
+def shutdown_audit_sink() -> None:
+    """Flush and stop the sink; events logged afterwards are written synchronously."""
+    global _sink, _sink_closed
+    with _sink_lock:
+        sink, _sink = _sink, None
+        _sink_closed = True
+    if sink is not None:
+        sink.close()
+
+
+def audit_row(user_id: UUID | None, action: str, ip: str | None = None, user_agent: str | None = None) -> dict[str, Any]:
+    """AuditLog column values for one event, stamped with the event time."""
+    return {
+        "id": uuid.uuid4(),
+        "user_id": user_id,
+        "action": action,
+        "ip": ip,
+        "user_agent": user_agent,
+        "created_at": datetime.now(timezone.utc),
+    }
+
 
 def log_audit(
     repo: AuditLogRepository,
@@ -12,4 +141,10 @@ def log_audit(
     ip: str | None = None,
     user_agent: str | None = None,
 ) -> None:
-    repo.create(user_id=user_id, action=action, ip=ip, user_agent=user_agent)
+    sink = get_audit_sink()
+    if sink is None:
+        repo.create(user_id=user_id, action=action, ip=ip, user_agent=user_agent)
+        return
+    if not sink.submit(audit_row(user_id, action, ip=ip, user_agent=user_agent)):
+        logger.warning("Audit queue full; writing %s synchronously", action)
+        repo.create(user_id=user_id, action=action, ip=ip, user_agent=user_agent)
@@ -1,11 +1,35 @@
-"""Conversion service: PDF to Excel using Strategy (extraction) + Builder (Excel)."""
+"""Conversion service: PDF to Excel (or another export format) using Strategy (extraction) + Builder (output)."""
 
 import io
 import time
+from collections.abc import Callable, Iterator
+from typing import cast
 
 from app.config import settings
-from app.strategies.table_extraction import TableExtractorStrategy, TablesByPageNumber
-from app.builders.excel_builder import ExcelExportBuilder
+from app.builders.base import ExportBuilder
+from app.builders.formats import DEFAULT_EXPORT_FORMAT, ExportFormat, get_export_format
+from app.core.cache import ByteBudgetLRU
+from app.core.cancellation import CancellationToken, DeadlineExceeded, OperationCancelled
+from app.logging_config import get_logger
+from app.services.page_selection import format_pages
+from app.strategies.pdf_probe import PdfEncrypted
+from app.strategies.table_extraction import (
+    ExtractionAborted,
+    ParsedDocument,
+    PdfBytes,
+    ProgressCallback,
+    TableExtractorStrategy,
+    TablesByPageNumber,
+)
+
+logger = get_logger("app.conversion")
+
+# (pdf sha256, pages, extractor cache key, output format, xlsx writer, deflate level)
+ResultKey = tuple[str, str, str, str, str, str]
+
+# Shared by all ConversionService instances of this process. Holds derived output only
+# (never the PDF), in memory.
+result_cache: ByteBudgetLRU[ResultKey, bytes] = ByteBudgetLRU(settings.result_cache_max_bytes)
 
 
 class ConversionError(Exception):
@@ -20,15 +44,36 @@ class ConversionError(Exception):
 class ConversionService:
     """Orchestrates PDF validation, table extraction (Strategy), and Excel build (Builder)."""
 
-    def __init__(self, table_extractor: TableExtractorStrategy) -> None:
+    def __init__(
+        self,
+        table_extractor: TableExtractorStrategy,
+        result_cache: ByteBudgetLRU[ResultKey, bytes] | None = None,
+    ) -> None:
         self._extractor = table_extractor
+        self._result_cache = result_cache
+
+    def open_document(self, content: PdfBytes) -> ParsedDocument:
+        """
+        Parse PDF bytes once. The returned handle is shared by validation, page count
+        and extraction; callers close it (it is a context manager). Opening only probes
+        the document structure; pages are parsed when tables are extracted.
+        """
+        if not content or len(content) < 100:
+            raise ConversionError("File is empty or too small to be a valid PDF.", "PDF_CORRUPTED")
+        try:
+            return self._extractor.open_document(content)
+        except PdfEncrypted as e:
+            raise ConversionError(str(e), "PDF_ENCRYPTED") from e
+        except Exception as e:
+            raise ConversionError("Unsupported or corrupted PDF.", "PDF_CORRUPTED") from e
 
-    def get_page_count(self, content: bytes) -> int:
-        return self._extractor.get_page_count(content)
+    def get_page_count(self, document: ParsedDocument) -> int:
+        """Page count from the structural probe (does not touch the extractor)."""
+        return document.page_count
 
     def validate_pdf(
         self,
-        content: bytes,
+        document: ParsedDocument,
         content_type: str | None,
         max_bytes: int | None = None,
         max_pages: int | None = None,
@@ -38,15 +83,13 @@ class ConversionService:
             raise ConversionError("Only application/pdf is accepted.", "UNSUPPORTED_MIME")
         if max_bytes is None:
             max_bytes = settings.max_pdf_bytes
-        if len(content) > max_bytes:
+        if len(document.content) > max_bytes:
             raise ConversionError(
                 f"File too large. Maximum size is {max_bytes // (1024 * 1024)} MB.",
                 "FILE_TOO_LARGE",
             )
-        if not content or len(content) < 100:
-            raise ConversionError("File is empty or too small to be a valid PDF.", "PDF_CORRUPTED")
         try:
-            num_pages = self.get_page_count(content)
+            num_pages = self.get_page_count(document)
         except Exception as e:
             raise ConversionError("Unsupported or corrupted PDF.", "PDF_CORRUPTED") from e
         if max_pages is None:
@@ -57,21 +100,82 @@ class ConversionService:
                 "PAGE_LIMIT_EXCEEDED",
             )
 
-    def convert_to_excel(
+    def _resolve_format(self, output_format: str) -> ExportFormat:
+        try:
+            fmt = get_export_format(output_format)
+        except ValueError as e:
+            raise ConversionError(str(e), "UNSUPPORTED_FORMAT") from e
+        if not fmt.available:
+            raise ConversionError(
+                f"Output format '{fmt.name}' is not available on this server.", "UNSUPPORTED_FORMAT"
+            )
+        return fmt
+
+    def _result_key(
+        self, document: ParsedDocument, pages: list[int] | None, fmt: ExportFormat
+    ) -> ResultKey | None:
+        """Cache key for the output: PDF hash, pages, extractor identity and output settings."""
+        if self._result_cache is None or not self._result_cache.enabled:
+            return None
+        page_numbers = pages or list(range(1, document.page_count + 1))
+        return (
+            document.digest,
+            format_pages(page_numbers),
+            self._extractor.cache_key,
+            fmt.name,
+            settings.xlsx_writer,
+            str(settings.xlsx_deflate_level),
+        )
+
+    def _tee_when_complete(
         self,
-        content: bytes,
-        filename: str,
-        content_type: str | None = "application/pdf",
-        pages: list[int] | None = None,
-    ) -> tuple[bytes, float]:
+        chunks: Iterator[bytes],
+        key: ResultKey | None,
+        on_complete: Callable[[bytes], None] | None,
+    ) -> Iterator[bytes]:
         """
-        Validate PDF, extract tables (Strategy), build XLSX (Builder).
-        Returns (xlsx_bytes, duration_seconds). Raises ConversionError on failure.
+        The single place output is collected: the joined bytes go to the result cache and
+        to `on_complete` as the same object (download_cache.put keeps it uncopied in
+        memory). An abandoned stream never gets that far.
         """
-        self.validate_pdf(content, content_type)
-        start = time.perf_counter()
-        tables_by_page: TablesByPageNumber = self._extractor.extract_tables(content, pages=pages)
-        builder = ExcelExportBuilder()
+        parts: list[bytes] = []
+        for chunk in chunks:
+            parts.append(chunk)
+            yield chunk
+        data = parts[0] if len(parts) == 1 else b"".join(parts)
+        parts.clear()
+        if key is not None:
+            cast(ByteBudgetLRU[ResultKey, bytes], self._result_cache).put(key, data)
+        if on_complete is not None:
+            # The client already has every byte: a failing hook must not fail the conversion.
+            try:
+                on_complete(data)
+            except Exception:
+                logger.exception("on_complete hook failed")
+
+    def _extract_into_builder(
+        self,
+        document: ParsedDocument,
+        pages: list[int] | None,
+        progress: ProgressCallback | None,
+        fmt: ExportFormat,
+        cancellation: CancellationToken | None = None,
+        allow_partial: bool = False,
+    ) -> ExportBuilder:
+        builder = fmt.new_builder()
+        deadline_error = ConversionError("Conversion exceeded its time budget.", "DEADLINE_EXCEEDED")
+        try:
+            tables_by_page: TablesByPageNumber = self._extractor.extract_tables(
+                document, pages=pages, progress=progress, cancellation=cancellation
+            )
+        except ExtractionAborted as e:
+            raise ConversionError(str(e), "EXTRACTION_ABORTED") from e
+        except DeadlineExceeded as e:
+            if not allow_partial:
+                raise deadline_error from e
+            tables_by_page = e.partial or []
+        except OperationCancelled as e:
+            raise ConversionError(str(e), "CANCELLED") from e
         sheet_count = 0
         for page_num, tables in tables_by_page:
             if not tables:
@@ -82,7 +186,95 @@ class ConversionService:
                     builder.add_table(table)
             sheet_count += 1
         if sheet_count == 0:
+            if document.missing_pages:
+                raise deadline_error
             raise ConversionError("No table detected in PDF.", "NO_TABLE_DETECTED")
-        xlsx_bytes = builder.build()
+        return builder
+
+    def convert_to_excel(
+        self,
+        document: ParsedDocument,
+        filename: str,
+        content_type: str | None = "application/pdf",
+        pages: list[int] | None = None,
+        progress: ProgressCallback | None = None,
+        output_format: str = DEFAULT_EXPORT_FORMAT,
+        cancellation: CancellationToken | None = None,
+        time_budget_sec: float = 0,
+        allow_partial: bool = False,
+    ) -> tuple[bytes, float]:
+        """
+        Validate PDF, extract tables (Strategy), build XLSX (Builder).
+        Returns (xlsx_bytes, duration_seconds). Raises ConversionError on failure.
+        `progress(pages_done, pages_total)` is reported while pages are extracted.
+        `output_format` selects another builder (see app.builders.formats).
+        Once `cancellation` is set, extraction stops at the next page and ConversionError
+        is raised with code "CANCELLED".
+
+        With `time_budget_sec` (> 0), extraction also stops at the first page boundary past
+        the deadline: ConversionError "DEADLINE_EXCEEDED", or with `allow_partial` an output
+        of the pages finished so far (the others are in `document.missing_pages`).
+        """
+        start = time.perf_counter()
+        outputs: list[bytes] = []
+        chunks, _ = self.convert_to_excel_stream(
+            document,
+            filename,
+            content_type,
+            pages,
+            progress,
+            output_format,
+            on_complete=outputs.append,
+            cancellation=cancellation,
+            time_budget_sec=time_budget_sec,
+            allow_partial=allow_partial,
+        )
+        for _ in chunks:
+            pass
+        duration = time.perf_counter() - start
+        return outputs[0], duration
+
+    def convert_to_excel_stream(
+        self,
+        document: ParsedDocument,
+        filename: str,
+        content_type: str | None = "application/pdf",
+        pages: list[int] | None = None,
+        progress: ProgressCallback | None = None,
+        output_format: str = DEFAULT_EXPORT_FORMAT,
+        on_complete: Callable[[bytes], None] | None = None,
+        cancellation: CancellationToken | None = None,
+        time_budget_sec: float = 0,
+        allow_partial: bool = False,
+    ) -> tuple[Iterator[bytes], float]:
+        """
+        Like convert_to_excel, but the XLSX is rendered while the returned iterator is
+        consumed. Extraction and validation errors are raised before it is returned; the
+        duration covers extraction only. The iterator no longer needs `document`.
+
+        Outputs are cached by content (see `_result_key`): a repeated conversion returns
+        the cached bytes without extracting or building. `on_complete(data)` receives the
+        whole output once the iterator is exhausted, so callers need not keep a copy.
+        """
+        start = time.perf_counter()
+        self.validate_pdf(document, content_type)
+        fmt = self._resolve_format(output_format)
+        key = self._result_key(document, pages, fmt)
+        if key is not None:
+            cached = cast(ByteBudgetLRU[ResultKey, bytes], self._result_cache).get(key)
+            if cached is not None:
+                if progress:
+                    total = len(pages) if pages else document.page_count
+                    progress(total, total)
+                hit = self._tee_when_complete(iter((cached,)), None, on_complete)
+                return hit, time.perf_counter() - start
+        if time_budget_sec > 0:
+            cancellation = (cancellation or CancellationToken()).with_timeout(time_budget_sec)
+        builder = self._extract_into_builder(document, pages, progress, fmt, cancellation, allow_partial)
+        if document.missing_pages:
+            key = None  # a partial output must not answer later full conversions
         duration = time.perf_counter() - start
-        return xlsx_bytes, duration
+        chunks = builder.iter_bytes()
+        if key is not None or on_complete is not None:
+            chunks = self._tee_when_complete(chunks, key, on_complete)
+        return chunks, duration
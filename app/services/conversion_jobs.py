@@ -0,0 +1,421 @@
+"""Asynchronous conversion jobs: submit, poll, fetch.
+
+A job owns an already opened and validated `ParsedDocument`. It runs on a bounded
+in-process worker queue, reuses `ConversionService` and records the same `Conversion`
+row and audit events as the synchronous endpoint. Job state and the finished XLSX live in
+a `KeyValueStore`: in-memory by default, or the node-local KV server so any uvicorn worker
+can answer status/result polls.
+
+On shutdown running jobs are cancelled and queued ones failed, each releasing its quota
+slot; `fail_stale_jobs` does the same at startup for rows a killed process left pending.
+"""
+
+from __future__ import annotations
+
+import queue
+import threading
+import time
+import uuid
+from dataclasses import asdict, dataclass, field, replace
+from datetime import datetime, timedelta, timezone
+from typing import Callable, cast
+from uuid import UUID
+
+from app.config import settings
+from app.core.cancellation import CancellationToken
+from app.db.session import SessionLocal
+from app.dependencies import get_conversion_service
+from app.logging_config import get_logger
+from app.repositories.conversion_repository import ConversionRepository
+from app.repositories.usage_counter_repository import UsageCounterRepository
+from app.services import download_cache
+from app.services.conversion import ConversionError, ConversionService
+from app.services.local_kv import KeyValueStore, make_key_value_store
+from app.services.page_selection import format_pages
+from app.services.unit_of_work import ConversionUnitOfWork
+from app.services.usage_limits import QuotaReservation
+from app.services.usage_window import current_month_window
+from app.strategies.table_extraction import ParsedDocument
+
+logger = get_logger("app.jobs")
+
+
+class JobQueueFull(Exception):
+    """Raised when the bounded job queue cannot take another job."""
+
+
+@dataclass
+class ConversionJob:
+    id: str
+    user_id: str
+    filename: str
+    output_format: str = "xlsx"
+    status: str = "queued"  # queued | running | success | failed
+    pages_done: int = 0
+    pages_total: int = 0
+    conversion_id: str | None = None
+    error: str | None = None
+    # Pages the extraction pre-screen skipped (no table candidates).
+    skipped_pages: list[int] = field(default_factory=list)
+    # Pages not reached within the time budget (partial result, or the failure's cause).
+    missing_pages: list[int] = field(default_factory=list)
+    created_at: float = field(default_factory=time.time)
+    updated_at: float = field(default_factory=time.time)
+
+
+class JobStore:
+    """Job state and results on top of a KeyValueStore."""
+
+    def __init__(self, kv: KeyValueStore, ttl_sec: float) -> None:
+        self._kv = kv
+        self._ttl_sec = ttl_sec
+
+    def save(self, job: ConversionJob) -> None:
+        job.updated_at = time.time()
+        self._kv.set(f"job:{job.id}", asdict(job), self._ttl_sec)
+
+    def get(self, job_id: str) -> ConversionJob | None:
+        data = self._kv.get(f"job:{job_id}")
+        return ConversionJob(**data) if data else None
+
+    def put_result(self, job_id: str, data: bytes) -> None:
+        self._kv.set(f"job-result:{job_id}", data, self._ttl_sec)
+
+    def get_result(self, job_id: str) -> bytes | None:
+        return self._kv.get(f"job-result:{job_id}")
+
+
+@dataclass(eq=False)
+class _QueuedJob:
+    job: ConversionJob
+    document: ParsedDocument
+    pages: list[int] | None
+    content_type: str | None
+    size_bytes: int
+    ip: str | None
+    user_agent: str | None
+    time_budget_sec: float = 0
+    allow_partial: bool = False
+    reservation: QuotaReservation | None = None
+    # The outcome is committed: a later crash must not rewrite it or release the slot.
+    # Set under record_lock, so a worker and shutdown cannot both record an outcome.
+    recorded: bool = False
+    record_lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+
+class ConversionJobRunner:
+    """Fixed set of worker threads draining a bounded queue."""
+
+    def __init__(
+        self,
+        store: JobStore,
+        service_factory: Callable[[], ConversionService],
+        workers: int,
+        queue_size: int,
+    ) -> None:
+        self.store = store
+        self._service_factory = service_factory
+        self._workers = workers
+        self._queue: queue.Queue[_QueuedJob | None] = queue.Queue(maxsize=queue_size)
+        self._threads: list[threading.Thread] = []
+        self._lock = threading.Lock()
+        self._running: set[_QueuedJob] = set()
+        self._stopping = CancellationToken()
+
+    def _ensure_started(self) -> None:
+        with self._lock:
+            if self._threads:
+                return
+            for i in range(self._workers):
+                t = threading.Thread(target=self._worker, name=f"conversion-job-{i}", daemon=True)
+                t.start()
+                self._threads.append(t)
+
+    def submit(
+        self,
+        *,
+        document: ParsedDocument,
+        user_id: UUID,
+        filename: str,
+        pages: list[int] | None,
+        content_type: str | None,
+        size_bytes: int,
+        conversion_id: UUID,
+        output_format: str = "xlsx",
+        ip: str | None = None,
+        user_agent: str | None = None,
+        time_budget_sec: float = 0,
+        allow_partial: bool = False,
+        reservation: QuotaReservation | None = None,
+    ) -> ConversionJob:
+        """
+        Queue a conversion. The runner takes ownership of `document` and closes it.
+        The caller has already recorded `conversion_id` as a "pending" Conversion row
+        and taken its quota slot (`reservation`); the runner records the outcome there and
+        releases the slot if the job fails. If the queue is full the caller keeps both.
+        `time_budget_sec` and `allow_partial` are passed to ConversionService.convert_to_excel.
+        """
+        self._ensure_started()
+        job = ConversionJob(
+            id=str(uuid.uuid4()),
+            user_id=str(user_id),
+            filename=filename,
+            output_format=output_format,
+            pages_total=len(pages) if pages else document.page_count,
+            conversion_id=str(conversion_id),
+        )
+        self.store.save(job)
+        # Workers mutate their own copy; the caller gets the state as queued.
+        snapshot = replace(job)
+        item = _QueuedJob(
+            job,
+            document,
+            pages,
+            content_type,
+            size_bytes,
+            ip,
+            user_agent,
+            time_budget_sec,
+            allow_partial,
+            reservation,
+        )
+        try:
+            self._queue.put_nowait(item)
+        except queue.Full:
+            job.status = "failed"
+            job.error = "Conversion queue is full."
+            self.store.save(job)
+            raise JobQueueFull(job.error)
+        return snapshot
+
+    def shutdown(self, timeout_sec: float = 10.0) -> None:
+        """
+        Stop the workers without leaking pending rows or quota slots: queued jobs are failed
+        here, running ones are cancelled (they record the failure at their next page), and
+        any still running after `timeout_sec` are failed here too.
+        """
+        with self._lock:
+            threads, self._threads = self._threads, []
+        self._stopping.cancel("Server shutting down. Please try again.")
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is not None:
+                with item.document:
+                    self._mark_crashed(item, "Job not started before shutdown.")
+        for _ in threads:
+            self._queue.put(None)
+        deadline = time.monotonic() + timeout_sec
+        for t in threads:
+            t.join(max(0.0, deadline - time.monotonic()))
+        with self._lock:
+            stuck = list(self._running)
+        for item in stuck:
+            self._mark_crashed(item, "Job still running at shutdown.")
+
+    def _worker(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            with self._lock:
+                self._running.add(item)
+            try:
+                with item.document:
+                    self._run(item)
+            except Exception:
+                logger.exception("Conversion job crashed job=%s", item.job.id)
+                self._mark_crashed(item)
+            finally:
+                with self._lock:
+                    self._running.discard(item)
+
+    @staticmethod
+    def _commit_outcome(item: _QueuedJob, uow: ConversionUnitOfWork) -> bool:
+        """Commit the staged outcome unless shutdown already failed the job."""
+        with item.record_lock:
+            if item.recorded:
+                return False
+            uow.commit()
+            item.recorded = True
+            return True
+
+    def _run(self, item: _QueuedJob) -> None:
+        job = item.job
+        job.status = "running"
+        self.store.save(job)
+
+        def on_progress(done: int, total: int) -> None:
+            job.pages_done = done
+            job.pages_total = total
+            self.store.save(job)
+
+        user_id = UUID(job.user_id)
+        conversion_id = UUID(cast(str, job.conversion_id))
+        start = time.perf_counter()
+        db = SessionLocal()
+        try:
+            uow = ConversionUnitOfWork(db)
+            try:
+                xlsx_bytes, duration_sec = self._service_factory().convert_to_excel(
+                    item.document,
+                    job.filename,
+                    content_type=item.content_type,
+                    pages=item.pages,
+                    progress=on_progress,
+                    output_format=job.output_format,
+                    time_budget_sec=item.time_budget_sec,
+                    allow_partial=item.allow_partial,
+                    cancellation=self._stopping,
+                )
+            except ConversionError as e:
+                job.missing_pages = item.document.missing_pages
+                self._record_failure(item, uow, start, e.message or str(e), e.message)
+                return
+            except Exception as e:
+                self._record_failure(
+                    item,
+                    uow,
+                    start,
+                    str(e),
+                    "Conversion failed. The PDF may be unsupported or corrupted.",
+                )
+                return
+
+            job.missing_pages = item.document.missing_pages
+            uow.finish_conversion(
+                conversion_id,
+                status="success",
+                duration_ms=int(duration_sec * 1000),
+                error_message=(
+                    f"Time budget exceeded; pages not converted: {format_pages(job.missing_pages)}"
+                    if job.missing_pages
+                    else None
+                ),
+            )
+            uow.audit(user_id, "CONVERSION_SUCCESS", ip=item.ip, user_agent=item.user_agent)
+            if not self._commit_outcome(item, uow):
+                return
+        finally:
+            db.close()
+
+        download_cache.put(conversion_id, xlsx_bytes, output_format=job.output_format)
+        self.store.put_result(job.id, xlsx_bytes)
+        job.status = "success"
+        job.pages_done = job.pages_total
+        job.skipped_pages = item.document.skipped_pages
+        self.store.save(job)
+
+    def _record_failure(
+        self,
+        item: _QueuedJob,
+        uow: ConversionUnitOfWork,
+        start: float,
+        error_message: str,
+        public_message: str,
+    ) -> None:
+        job = item.job
+        user_id = UUID(job.user_id)
+        uow.finish_conversion(
+            UUID(cast(str, job.conversion_id)),
+            status="failed",
+            duration_ms=int((time.perf_counter() - start) * 1000),
+            error_message=error_message[:1024],
+        )
+        if item.reservation is not None:
+            uow.release_quota(item.reservation)
+        uow.audit(user_id, "CONVERSION_FAILED", ip=item.ip, user_agent=item.user_agent)
+        if not self._commit_outcome(item, uow):
+            return
+        job.status = "failed"
+        job.error = public_message
+        self.store.save(job)
+
+    def _mark_crashed(self, item: _QueuedJob, reason: str = "Job crashed before completion.") -> None:
+        """
+        Fail a job that died outside conversion (DB, cache or store error) or was cut off by
+        shutdown, so polling ends. An outcome already committed is left as is, slot included.
+        """
+        job = item.job
+        if job.status in ("success", "failed"):
+            return
+        job.status = "failed"
+        job.error = "Conversion failed. Please try again."
+        try:
+            self.store.save(job)
+        except Exception:
+            logger.exception("Could not record crashed job=%s", job.id)
+        if item.recorded:
+            return
+        db = SessionLocal()
+        try:
+            uow = ConversionUnitOfWork(db)
+            uow.finish_conversion(
+                UUID(cast(str, job.conversion_id)),
+                status="failed",
+                duration_ms=0,
+                error_message=reason,
+            )
+            if item.reservation is not None:
+                uow.release_quota(item.reservation)
+            self._commit_outcome(item, uow)
+        except Exception:
+            logger.exception("Could not mark conversion failed job=%s", job.id)
+        finally:
+            db.close()
+
+
+_runner: ConversionJobRunner | None = None
+_runner_lock = threading.Lock()
+
+
+def _build_store() -> JobStore:
+    return JobStore(make_key_value_store(settings.jobs_backend), ttl_sec=settings.jobs_ttl_sec)
+
+
+def get_job_runner() -> ConversionJobRunner:
+    """Process-wide job runner (created on first use)."""
+    global _runner
+    with _runner_lock:
+        if _runner is None:
+            _runner = ConversionJobRunner(
+                store=_build_store(),
+                service_factory=get_conversion_service,
+                workers=settings.jobs_workers,
+                queue_size=settings.jobs_queue_size,
+            )
+        return _runner
+
+
+def shutdown_job_runner() -> None:
+    global _runner
+    with _runner_lock:
+        runner, _runner = _runner, None
+    if runner is not None:
+        runner.shutdown()
+
+
+def fail_stale_jobs() -> int:
+    """
+    Fail "pending" conversions older than JOBS_TTL_SEC and give back their quota slots, in
+    one transaction. Those are jobs a previous process lost (killed, or crashed before its
+    shutdown ran); their status has expired from the job store too. Returns the count.
+    """
+    cutoff = datetime.now(timezone.utc) - timedelta(seconds=settings.jobs_ttl_sec)
+    db = SessionLocal()
+    try:
+        stale = ConversionRepository(db).fail_pending_before(cutoff, "Job lost by a server restart.")
+        counters = UsageCounterRepository(db)
+        for user_id, created_at in stale:
+            counters.release(user_id, current_month_window(created_at).period_start, commit=False)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+    if stale:
+        logger.warning("Failed %s stale pending conversion jobs", len(stale))
+    return len(stale)
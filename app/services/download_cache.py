@@ -1,55 +1,99 @@
-"""In-memory cache for conversion outputs (XLSX bytes).
+"""Short-lived cache for conversion outputs (XLSX, or the requested export format).
 
 Tabularis-server does not store PDFs or XLSX on disk. This cache enables a short-lived
 "download again" experience from the UI after a conversion is completed.
 
 Notes:
-- Best effort: data is lost on process restart.
-- TTL-based eviction to keep memory bounded.
+- Best effort: data is lost on restart of the process (or of the shared store).
+- DOWNLOAD_CACHE_BACKEND picks where entries live (see app.services.local_kv):
+  "memory" (this process: LRU bounded by total bytes, with TTL, thread-safe),
+  "local" (node-local KV server, shared by every uvicorn worker on the node) or
+  "redis" (Redis-compatible server, shared across nodes).
+- Entries can be zlib-compressed (DOWNLOAD_CACHE_COMPRESS_LEVEL); only kept compressed
+  when that actually saves space (XLSX/Parquet are already compressed).
+- The payload and its metadata are stored under two keys, so an in-process store keeps
+  the caller's bytes object itself instead of a header-prefixed copy.
 """
 
 from __future__ import annotations
 
 import time
+import zlib
 from dataclasses import dataclass
+from typing import Any
 from uuid import UUID
 
+from app.config import settings
+from app.core.cache import CacheStats
+from app.logging_config import get_logger
+from app.services.local_kv import KeyValueStore, make_key_value_store
+
+logger = get_logger("app.cache")
+
+# Keep the compressed form only if it is at most this fraction of the original.
+_MIN_COMPRESSION_RATIO = 0.9
+
 
 @dataclass(frozen=True)
 class CacheItem:
     created_at: float
     data: bytes
+    output_format: str = "xlsx"
+
+
+def _build_store() -> KeyValueStore:
+    return make_key_value_store(settings.download_cache_backend, settings.download_cache_max_bytes)
+
 
+_store: KeyValueStore = _build_store()
 
-_store: dict[UUID, CacheItem] = {}
 
-# Conservative defaults; can be made configurable later.
-_TTL_SEC = 10 * 60
-_MAX_ITEMS = 200
+def _key(conversion_id: UUID) -> str:
+    return f"download:{conversion_id}"
 
 
-def _cleanup(now: float) -> None:
-    # TTL eviction
-    expired = [k for k, v in _store.items() if (now - v.created_at) > _TTL_SEC]
-    for k in expired:
-        _store.pop(k, None)
+def _meta_key(conversion_id: UUID) -> str:
+    return f"download-meta:{conversion_id}"
 
-    # Size-based eviction (oldest first)
-    if len(_store) <= _MAX_ITEMS:
-        return
-    items = sorted(_store.items(), key=lambda kv: kv[1].created_at)
-    for k, _ in items[: max(0, len(_store) - _MAX_ITEMS)]:
-        _store.pop(k, None)
 
+def _encode(data: bytes, output_format: str) -> tuple[dict[str, Any], bytes]:
+    """(metadata, payload): `data` itself unless its compressed form pays."""
+    payload, compressed = data, False
+    level = settings.download_cache_compress_level
+    if level > 0:
+        packed = zlib.compress(data, level)
+        if len(packed) <= len(data) * _MIN_COMPRESSION_RATIO:
+            payload, compressed = packed, True
+    return {"created_at": time.time(), "output_format": output_format, "compressed": compressed}, payload
 
-def put(conversion_id: UUID, data: bytes) -> None:
-    now = time.monotonic()
-    _cleanup(now)
-    _store[conversion_id] = CacheItem(created_at=now, data=data)
+
+def put(conversion_id: UUID, data: bytes, output_format: str = "xlsx") -> None:
+    """Best effort: a backend error is logged, never raised (the conversion already succeeded)."""
+    try:
+        meta, payload = _encode(data, output_format)
+        ttl = settings.download_cache_ttl_sec
+        _store.set(_key(conversion_id), payload, ttl)
+        _store.set(_meta_key(conversion_id), meta, ttl)
+    except Exception:
+        logger.exception("Download cache put failed conversion=%s", conversion_id)
+
+
+def get_item(conversion_id: UUID) -> CacheItem | None:
+    meta = _store.get(_meta_key(conversion_id))
+    if meta is None:
+        return None
+    payload = _store.get(_key(conversion_id))
+    if payload is None:  # evicted on its own
+        return None
+    data = zlib.decompress(payload) if meta["compressed"] else payload
+    return CacheItem(created_at=meta["created_at"], data=data, output_format=meta["output_format"])
 
 
 def get(conversion_id: UUID) -> bytes | None:
-    now = time.monotonic()
-    _cleanup(now)
-    item = _store.get(conversion_id)
+    item = get_item(conversion_id)
     return item.data if item else None
+
+
+def stats() -> CacheStats | None:
+    """Hits, misses, evictions, expirations and resident bytes (None if the backend has no counters)."""
+    return _store.stats()
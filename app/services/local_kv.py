@@ -0,0 +1,201 @@
+"""Key-value store with per-key TTL, in-process or shared by all workers on a node.
+
+`MemoryKeyValueStore` lives in the current process; `BoundedMemoryKeyValueStore` is the
+same with an LRU byte budget. `LocalServerKeyValueStore` talks to a single bounded store
+hosted by a local socket server (multiprocessing manager), so every uvicorn worker on the
+node sees the same keys. Run the server with:
+
+    python -m app.services.local_kv
+
+Values must be picklable. Like the rest of the service, nothing is written to disk. For
+several nodes, `RespKeyValueStore` (app.services.resp_kv) uses a Redis-compatible server;
+`make_key_value_store` picks a backend by name.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from abc import ABC, abstractmethod
+from multiprocessing.managers import BaseManager
+from typing import Any
+
+from app.config import settings
+from app.core.cache import ByteBudgetLRU, CacheStats
+from app.logging_config import get_logger
+
+logger = get_logger("app.kv")
+
+# Expired keys are also dropped on read; the sweep only bounds memory for keys never read again.
+_SWEEP_INTERVAL_SEC = 30.0
+# Budget charge for values that are not bytes (job status dicts and the like).
+_OBJECT_VALUE_BYTES = 512
+
+
+class KeyValueStore(ABC):
+    """Minimal TTL key-value interface used by job and result backends."""
+
+    @abstractmethod
+    def get(self, key: str) -> Any | None:
+        ...
+
+    @abstractmethod
+    def set(self, key: str, value: Any, ttl_sec: float) -> None:
+        ...
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        ...
+
+    def stats(self) -> CacheStats | None:
+        """Cache counters, if the backend keeps them."""
+        return None
+
+
+class MemoryKeyValueStore(KeyValueStore):
+    """Thread-safe dict with expiry timestamps."""
+
+    def __init__(self) -> None:
+        self._data: dict[str, tuple[float, Any]] = {}
+        self._lock = threading.Lock()
+        self._last_sweep = time.monotonic()
+
+    def get(self, key: str) -> Any | None:
+        now = time.monotonic()
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            if item[0] <= now:
+                del self._data[key]
+                return None
+            return item[1]
+
+    def set(self, key: str, value: Any, ttl_sec: float) -> None:
+        now = time.monotonic()
+        with self._lock:
+            self._data[key] = (now + ttl_sec, value)
+            if now - self._last_sweep >= _SWEEP_INTERVAL_SEC:
+                self._last_sweep = now
+                for k in [k for k, (expires, _) in self._data.items() if expires <= now]:
+                    del self._data[k]
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+
+def _value_size(value: Any) -> int:
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return len(value)
+    return _OBJECT_VALUE_BYTES
+
+
+class BoundedMemoryKeyValueStore(KeyValueStore):
+    """In-process store bounded by total value bytes (least recently used keys go first)."""
+
+    def __init__(self, max_bytes: int) -> None:
+        self._lru: ByteBudgetLRU[str, Any] = ByteBudgetLRU(max_bytes, sizeof=_value_size)
+
+    def get(self, key: str) -> Any | None:
+        return self._lru.get(key)
+
+    def set(self, key: str, value: Any, ttl_sec: float) -> None:
+        self._lru.put(key, value, ttl_sec=ttl_sec)
+
+    def delete(self, key: str) -> None:
+        self._lru.pop(key)
+
+    def stats(self) -> CacheStats | None:
+        return self._lru.stats()
+
+
+class _KVManager(BaseManager):
+    pass
+
+
+def _require_authkey(authkey: str) -> bytes:
+    # Manager connections exchange pickles: an empty or well-known key would let any local
+    # process run code in the server and, through returned values, in every API worker.
+    if not authkey:
+        raise ValueError("LOCAL_KV_AUTHKEY must be set to use the local KV server.")
+    return authkey.encode("utf-8")
+
+
+def _parse_address(address: str) -> tuple[str, int]:
+    host, _, port = address.rpartition(":")
+    return host or "127.0.0.1", int(port)
+
+
+class LocalServerKeyValueStore(KeyValueStore):
+    """Client for the node-local KV server (see `serve`)."""
+
+    def __init__(self, address: str, authkey: str) -> None:
+        self._address = _parse_address(address)
+        self._authkey = _require_authkey(authkey)
+        self._proxy: Any = None
+        self._lock = threading.Lock()
+
+    def _store(self) -> Any:
+        with self._lock:
+            if self._proxy is None:
+                _KVManager.register("store")
+                manager = _KVManager(address=self._address, authkey=self._authkey)
+                manager.connect()
+                self._proxy = manager.store()  # type: ignore[attr-defined]
+            return self._proxy
+
+    def _call(self, method: str, *args: Any) -> Any:
+        try:
+            return getattr(self._store(), method)(*args)
+        except (ConnectionError, EOFError, BrokenPipeError):
+            # Server restarted: reconnect once.
+            with self._lock:
+                self._proxy = None
+            return getattr(self._store(), method)(*args)
+
+    def get(self, key: str) -> Any | None:
+        return self._call("get", key)
+
+    def set(self, key: str, value: Any, ttl_sec: float) -> None:
+        self._call("set", key, value, ttl_sec)
+
+    def delete(self, key: str) -> None:
+        self._call("delete", key)
+
+    def stats(self) -> CacheStats | None:
+        return self._call("stats")
+
+
+def make_key_value_store(backend: str, max_bytes: int = 0) -> KeyValueStore:
+    """
+    Build a store by name: "memory" (this process; bounded by `max_bytes` when > 0),
+    "local" (node-local KV server) or "redis" (Redis-compatible server at settings.redis_url).
+    """
+    if backend == "local":
+        return LocalServerKeyValueStore(settings.local_kv_address, settings.local_kv_authkey)
+    if backend == "redis":
+        from app.services.resp_kv import RespKeyValueStore
+
+        return RespKeyValueStore(settings.redis_url)
+    if max_bytes > 0:
+        return BoundedMemoryKeyValueStore(max_bytes)
+    return MemoryKeyValueStore()
+
+
+def serve(address: str, authkey: str, max_bytes: int = 0) -> None:
+    """Host one in-memory store (bounded by `max_bytes` when > 0) on a local socket until interrupted."""
+    key = _require_authkey(authkey)
+    store: KeyValueStore = BoundedMemoryKeyValueStore(max_bytes) if max_bytes > 0 else MemoryKeyValueStore()
+    _KVManager.register("store", callable=lambda: store)
+    manager = _KVManager(address=_parse_address(address), authkey=key)
+    server = manager.get_server()
+    logger.info("Local KV server listening on %s", address)
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    from app.logging_config import setup_logging
+
+    setup_logging()
+    serve(settings.local_kv_address, settings.local_kv_authkey, settings.local_kv_max_bytes)
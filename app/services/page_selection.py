@@ -49,3 +49,19 @@ def validate_pages(pages: list[int], *, total_pages: int, max_selected: int | No
         raise ValueError("Selected pages out of range")
     if max_selected is not None and len(pages) > max_selected:
         raise ValueError("Too many pages selected")
+
+
+def format_pages(pages: list[int]) -> str:
+    """Compact spec for a sorted page list, e.g. [1, 2, 3, 5] -> '1-3,5' (inverse of parse_pages)."""
+    parts: list[str] = []
+    start = prev = None
+    for p in pages:
+        if prev is not None and p == prev + 1:
+            prev = p
+            continue
+        if start is not None:
+            parts.append(str(start) if start == prev else f"{start}-{prev}")
+        start = prev = p
+    if start is not None:
+        parts.append(str(start) if start == prev else f"{start}-{prev}")
+    return ",".join(parts)
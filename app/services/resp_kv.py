@@ -0,0 +1,133 @@
+"""KeyValueStore over the Redis protocol (RESP2), for result/job state shared across nodes.
+
+Any Redis-compatible server works (Redis, Valkey, KeyDB, or a local stand-in speaking
+GET / SET PX / DEL). Only those commands plus AUTH/SELECT are used, so no client library
+is needed. Values are stored with a one-byte tag: raw bytes as-is, anything else as JSON
+(job status dicts); nothing is unpickled from the network.
+
+URL form: redis://[:password@]host[:port][/db]
+"""
+
+from __future__ import annotations
+
+import json
+import socket
+import threading
+from typing import Any
+from urllib.parse import unquote, urlparse
+
+from app.services.local_kv import KeyValueStore
+
+_TAG_BYTES = b"b"
+_TAG_JSON = b"j"
+_CONNECT_TIMEOUT_SEC = 2.0
+_IO_TIMEOUT_SEC = 10.0
+
+
+class RespError(Exception):
+    """Error reply from the server (e.g. wrong password)."""
+
+
+class _Connection:
+    def __init__(self, host: str, port: int) -> None:
+        self._sock = socket.create_connection((host, port), timeout=_CONNECT_TIMEOUT_SEC)
+        self._sock.settimeout(_IO_TIMEOUT_SEC)
+        self._sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self._reader = self._sock.makefile("rb")
+
+    def close(self) -> None:
+        self._reader.close()
+        self._sock.close()
+
+    def command(self, *args: bytes | str | int) -> Any:
+        parts = [b"*%d\r\n" % len(args)]
+        for arg in args:
+            data = arg if isinstance(arg, bytes) else str(arg).encode("utf-8")
+            parts.append(b"$%d\r\n" % len(data))
+            parts.append(data)
+            parts.append(b"\r\n")
+        self._sock.sendall(b"".join(parts))
+        return self._read_reply()
+
+    def _read_reply(self) -> Any:
+        line = self._reader.readline()
+        if not line.endswith(b"\r\n"):
+            raise ConnectionError("Connection closed by RESP server")
+        kind, rest = line[:1], line[1:-2]
+        if kind == b"+":
+            return rest
+        if kind == b"-":
+            raise RespError(rest.decode("utf-8", "replace"))
+        if kind == b":":
+            return int(rest)
+        if kind == b"$":
+            n = int(rest)
+            if n < 0:
+                return None
+            data = self._reader.read(n + 2)
+            if len(data) != n + 2:
+                raise ConnectionError("Connection closed by RESP server")
+            return data[:-2]
+        if kind == b"*":
+            n = int(rest)
+            return None if n < 0 else [self._read_reply() for _ in range(n)]
+        raise ConnectionError(f"Unexpected RESP reply: {line[:32]!r}")
+
+
+class RespKeyValueStore(KeyValueStore):
+    """One connection per thread (sync endpoints run in a threadpool); reconnects once on error."""
+
+    def __init__(self, url: str, key_prefix: str = "tabularis:") -> None:
+        parsed = urlparse(url)
+        if parsed.scheme not in ("redis", ""):
+            raise ValueError(f"Unsupported RESP URL scheme: {parsed.scheme}")
+        self._host = parsed.hostname or "127.0.0.1"
+        self._port = parsed.port or 6379
+        self._password = unquote(parsed.password) if parsed.password else None
+        path = parsed.path.strip("/")
+        self._db = int(path) if path else 0
+        self._prefix = key_prefix
+        self._local = threading.local()
+
+    def _connect(self) -> _Connection:
+        conn = _Connection(self._host, self._port)
+        try:
+            if self._password:
+                conn.command("AUTH", self._password)
+            if self._db:
+                conn.command("SELECT", self._db)
+        except Exception:
+            conn.close()
+            raise
+        return conn
+
+    def _call(self, *args: bytes | str | int) -> Any:
+        conn: _Connection | None = getattr(self._local, "conn", None)
+        for attempt in (1, 2):
+            if conn is None:
+                conn = self._local.conn = self._connect()
+            try:
+                return conn.command(*args)
+            except (ConnectionError, OSError):
+                conn.close()
+                conn = self._local.conn = None
+                if attempt == 2:
+                    raise
+        return None  # pragma: no cover
+
+    def get(self, key: str) -> Any | None:
+        raw = self._call("GET", self._prefix + key)
+        if raw is None:
+            return None
+        tag, body = raw[:1], raw[1:]
+        return body if tag == _TAG_BYTES else json.loads(body)
+
+    def set(self, key: str, value: Any, ttl_sec: float) -> None:
+        if isinstance(value, (bytes, bytearray, memoryview)):
+            raw = _TAG_BYTES + bytes(value)
+        else:
+            raw = _TAG_JSON + json.dumps(value, separators=(",", ":")).encode("utf-8")
+        self._call("SET", self._prefix + key, raw, "PX", max(1, int(ttl_sec * 1000)))
+
+    def delete(self, key: str) -> None:
+        self._call("DEL", self._prefix + key)
@@ -0,0 +1,110 @@
+"""Unit of work: a conversion's outcome written in a single transaction.
+
+The conversion endpoints stage what they have to persist (the Conversion row or the
+outcome of a pending one, the outcome's audit event, giving back a quota slot) and
+nothing touches the database until `commit`, which applies it all with one COMMIT. The request-scoped
+dependency (`get_unit_of_work`) commits on teardown, which FastAPI runs after the response
+has been sent, so recording a conversion adds no latency to it. Reserving the quota slot
+is not staged: it must be committed before extraction starts. Events that are not part of
+the outcome (CONVERSION_REQUEST) go through `log_audit` and its buffered writer instead.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy.orm import Session
+
+from app.logging_config import get_logger
+from app.models.conversion import Conversion
+from app.repositories.audit_log_repository import AuditLogRepository
+from app.repositories.conversion_repository import ConversionRepository
+from app.repositories.usage_counter_repository import UsageCounterRepository
+from app.services.audit import audit_row
+from app.services.usage_limits import QuotaReservation
+
+logger = get_logger("app.uow")
+
+
+class ConversionUnitOfWork:
+    def __init__(self, db: Session) -> None:
+        self._db = db
+        self._conversions: list[Conversion] = []
+        self._finished: list[dict[str, Any]] = []
+        self._audits: list[dict[str, Any]] = []
+        self._releases: list[QuotaReservation] = []
+        self._closed = False
+
+    def add_conversion(self, conversion: Conversion) -> None:
+        self._conversions.append(conversion)
+        self._after_stage()
+
+    def finish_conversion(
+        self,
+        conversion_id: UUID,
+        *,
+        status: str,
+        duration_ms: int,
+        error_message: str | None = None,
+    ) -> None:
+        """Outcome of a pending conversion row (async job)."""
+        self._finished.append(
+            {"conversion_id": conversion_id, "status": status, "duration_ms": duration_ms, "error_message": error_message}
+        )
+        self._after_stage()
+
+    def audit(self, user_id: UUID | None, action: str, ip: str | None = None, user_agent: str | None = None) -> None:
+        self._audits.append(audit_row(user_id, action, ip=ip, user_agent=user_agent))
+        self._after_stage()
+
+    def release_quota(self, reservation: QuotaReservation) -> None:
+        self._releases.append(reservation)
+        self._after_stage()
+
+    @property
+    def pending(self) -> bool:
+        return bool(self._conversions or self._finished or self._audits or self._releases)
+
+    def commit(self) -> None:
+        """Write everything staged so far in one transaction (rolled back as a whole on error)."""
+        if not self.pending:
+            return
+        conversions, self._conversions = self._conversions, []
+        finished, self._finished = self._finished, []
+        audits, self._audits = self._audits, []
+        releases, self._releases = self._releases, []
+        try:
+            conversion_repo = ConversionRepository(self._db)
+            for conversion in conversions:
+                conversion_repo.add(conversion)
+            for outcome in finished:
+                conversion_repo.finish(outcome.pop("conversion_id"), commit=False, **outcome)
+            AuditLogRepository(self._db).create_many(audits, commit=False)
+            usage_repo = UsageCounterRepository(self._db)
+            for reservation in releases:
+                usage_repo.release(reservation.user_id, reservation.period_start, commit=False)
+            self._db.commit()
+        except Exception:
+            self._db.rollback()
+            raise
+
+    def close(self) -> None:
+        """Commit what is staged; anything staged later is committed right away."""
+        try:
+            self.commit()
+        except Exception:
+            logger.exception("Could not record conversion outcome")
+        finally:
+            self._closed = True
+
+    def _after_stage(self) -> None:
+        # Late writers (e.g. a response generator finalised after the request ended) still
+        # get their outcome recorded, on a session the request no longer owns.
+        if self._closed:
+            try:
+                self.commit()
+            except Exception:
+                logger.exception("Could not record conversion outcome")
+            finally:
+                self._db.close()
@@ -0,0 +1,73 @@
+"""Upload ingestion: copy a PDF upload into an anonymous in-memory spool, enforcing size as it streams.
+
+The spool is a memfd (RAM-backed, never linked on disk) where available, else an unlinked
+temporary file. Once complete it is exposed as a read-only mmap so extractors read the PDF
+without another copy of the bytes.
+"""
+
+from __future__ import annotations
+
+import mmap
+import os
+import tempfile
+from typing import BinaryIO
+
+from fastapi import UploadFile
+
+_CHUNK_BYTES = 1024 * 1024
+
+
+class UploadTooLarge(Exception):
+    """Raised as soon as an upload crosses the size limit."""
+
+    def __init__(self, max_bytes: int) -> None:
+        self.max_bytes = max_bytes
+        super().__init__(f"File too large. Maximum size is {max_bytes // (1024 * 1024)} MB.")
+
+
+def _anonymous_file() -> BinaryIO:
+    if hasattr(os, "memfd_create"):
+        fd = os.memfd_create("pdf-upload", os.MFD_CLOEXEC)
+        return os.fdopen(fd, "w+b", buffering=0)
+    return tempfile.TemporaryFile(buffering=0)
+
+
+class PdfUpload:
+    """A fully received upload. `buffer` is read-only and valid until `close()`."""
+
+    def __init__(self, spool: BinaryIO, size: int) -> None:
+        self._spool = spool
+        self.size = size
+        self.buffer: bytes | mmap.mmap = (
+            mmap.mmap(spool.fileno(), size, access=mmap.ACCESS_READ) if size else b""
+        )
+
+    def close(self) -> None:
+        if isinstance(self.buffer, mmap.mmap):
+            self.buffer.close()
+        self._spool.close()
+
+    def __enter__(self) -> "PdfUpload":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+
+def read_pdf_upload(file: UploadFile, max_bytes: int) -> PdfUpload:
+    """Stream `file` into a spool in chunks. Raises UploadTooLarge once `max_bytes` is crossed."""
+    spool = _anonymous_file()
+    size = 0
+    try:
+        while chunk := file.file.read(_CHUNK_BYTES):
+            size += len(chunk)
+            if size > max_bytes:
+                raise UploadTooLarge(max_bytes)
+            spool.write(chunk)
+        return PdfUpload(spool, size)
+    except BaseException:
+        spool.close()
+        raise
+    finally:
+        # Starlette's own spool for this part is no longer needed.
+        file.file.close()
@@ -1,13 +1,15 @@
 """Usage limits: monthly conversion enforcement (Free/Pro)."""
 
+from dataclasses import dataclass
+from datetime import datetime
 from fastapi import HTTPException, status
 from typing import cast
 from uuid import UUID
 
 from app.models.user import User
 from app.policies.usage_policy import get_usage_policy
-from app.repositories.conversion_repository import ConversionRepository
-from app.services.usage_window import current_month_window
+from app.repositories.usage_counter_repository import UsageCounterRepository
+from app.services.usage_window import UsageWindow, current_month_window
 
 
 class UsageLimitExceeded(HTTPException):
@@ -22,38 +24,52 @@ class UsageLimitExceeded(HTTPException):
         super().__init__(status_code=status.HTTP_403_FORBIDDEN, detail=payload)
 
 
-def check_can_convert(user: User, conversion_repo: ConversionRepository) -> None:
-    """Raise UsageLimitExceeded if user cannot convert under current monthly window."""
+@dataclass(frozen=True)
+class QuotaReservation:
+    """A quota slot taken for one conversion; released if the conversion does not succeed."""
+
+    user_id: UUID
+    period_start: datetime
+
+
+def monthly_limit(user: User) -> int:
+    """Conversions allowed per monthly window under the user's plan (0 = unlimited)."""
+    return get_usage_policy(cast(str, user.plan) or "FREE").monthly_limit(user)
+
+
+def _limit_exceeded(user: User, window: UsageWindow, used: int, limit: int) -> UsageLimitExceeded:
+    return UsageLimitExceeded(
+        message=get_usage_policy(cast(str, user.plan) or "FREE").limit_exceeded_message(),
+        reset_at_iso=window.reset_at.isoformat(),
+        used=used,
+        limit=limit,
+    )
+
+
+def check_can_convert(user: User, usage_repo: UsageCounterRepository) -> None:
+    """Raise UsageLimitExceeded if user cannot convert under current monthly window (read only)."""
+    limit = monthly_limit(user)
+    if limit <= 0:
+        return
+    window = current_month_window()
+    used = usage_repo.get_used(cast(UUID, user.id), window.period_start)
+    if used >= limit:
+        raise _limit_exceeded(user, window, used, limit)
+
+
+def reserve_conversion(user: User, usage_repo: UsageCounterRepository) -> QuotaReservation:
+    """
+    Take a quota slot before converting, or raise UsageLimitExceeded. The slot counts as
+    used from now on (so parallel requests cannot overshoot the limit); hand the
+    reservation to `release_conversion` if the conversion fails or is cancelled.
+    """
     window = current_month_window()
     user_id = cast(UUID, user.id)
-    used = conversion_repo.count_success_by_user_since(user_id, window.period_start)
-
-    plan_raw = cast(str, user.plan)
-    plan = plan_raw or "FREE"
-    policy = get_usage_policy(plan)
-
-    # Pro policy can still use conversions_limit when configured.
-    if plan.upper() == "PRO":
-        limit_raw = cast(int, user.conversions_limit)
-        limit = limit_raw or 0
-        if limit <= 0:
-            return
-        if used >= limit:
-            raise UsageLimitExceeded(
-                message=policy.limit_exceeded_message(),
-                reset_at_iso=window.reset_at.isoformat(),
-                used=used,
-                limit=limit,
-            )
-        return
+    limit = monthly_limit(user)
+    if usage_repo.reserve(user_id, window.period_start, limit) is None:
+        raise _limit_exceeded(user, window, usage_repo.get_used(user_id, window.period_start), limit)
+    return QuotaReservation(user_id=user_id, period_start=window.period_start)
 
-    # Free: fixed 10/month by default.
-    limit_raw = cast(int, user.conversions_limit)
-    limit = limit_raw or 10
-    if used >= limit:
-        raise UsageLimitExceeded(
-            message=policy.limit_exceeded_message(),
-            reset_at_iso=window.reset_at.isoformat(),
-            used=used,
-            limit=limit,
-        )
+
+def release_conversion(reservation: QuotaReservation, usage_repo: UsageCounterRepository) -> None:
+    usage_repo.release(reservation.user_id, reservation.period_start)
@@ -1,3 +1,17 @@
-from app.strategies.table_extraction import TableExtractorStrategy, PdfplumberTableExtractor
+from app.strategies.table_extraction import (
+    TableExtractorStrategy,
+    PdfplumberTableExtractor,
+    ParsedDocument,
+    PdfplumberDocument,
+    ExtractionAborted,
+)
+from app.strategies.parallel_extraction import ProcessPoolTableExtractor
 
-__all__ = ["TableExtractorStrategy", "PdfplumberTableExtractor"]
+__all__ = [
+    "TableExtractorStrategy",
+    "PdfplumberTableExtractor",
+    "ParsedDocument",
+    "PdfplumberDocument",
+    "ExtractionAborted",
+    "ProcessPoolTableExtractor",
+]
@@ -0,0 +1,79 @@
+"""Page pre-screen: find pages that cannot contain a table before running table detection.
+
+pdfplumber's default table settings ("lines" strategy) build cells only from ruling
+edges: line segments and rectangle sides, at least two horizontal and two vertical. The
+screen tokenizes the page content stream (no font, glyph or layout work) and counts the
+edges that path operators draw. A page is skipped only when that count proves no cell
+can be formed. Anything the screen cannot judge cheaply (curves, rotated or skewed
+coordinate systems, form XObjects) keeps the page, so the screen errs towards
+extraction. Text alignment plays no part: the "lines" strategy ignores text when it
+looks for tables.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+from pdfminer.pdfinterp import PDFContentParser
+from pdfminer.pdfpage import PDFPage
+from pdfminer.pdftypes import PDFStream, resolve1
+from pdfminer.psparser import PSEOF, PSKeyword, PSLiteral
+
+# Path operators that draw curves; their edges depend on the control points.
+_CURVE_OPS = frozenset((b"c", b"v", b"y"))
+
+
+def _is_image(xobjects: Any, operand: object) -> bool:
+    if not isinstance(operand, PSLiteral) or not isinstance(xobjects, dict):
+        return False
+    xobject = resolve1(xobjects.get(operand.name))
+    if not isinstance(xobject, PDFStream):
+        return False
+    subtype = resolve1(xobject.get("Subtype"))
+    return isinstance(subtype, PSLiteral) and subtype.name == "Image"
+
+
+def has_table_candidates(page: PDFPage) -> bool:
+    """False only if the page provably draws fewer than 2 horizontal or 2 vertical edges."""
+    if not page.contents:
+        return False
+    resources: Any = resolve1(page.resources)
+    xobjects = resolve1(resources.get("XObject")) if isinstance(resources, dict) else None
+
+    parser = PDFContentParser(page.contents)
+    operands: list[object] = []
+    horizontal = vertical = 0
+    current = start = None
+    while True:
+        try:
+            _, token = parser.nextobject()
+        except PSEOF:
+            break
+        if not isinstance(token, PSKeyword):
+            operands.append(token)
+            continue
+        op = token.name
+        args, operands = operands, []
+        if op == b"re":
+            horizontal += 2
+            vertical += 2
+        elif op == b"m" and len(args) >= 2:
+            current = start = (args[-2], args[-1])
+        elif op in (b"l", b"h"):
+            end = (args[-2], args[-1]) if op == b"l" and len(args) >= 2 else start
+            if current is not None and end is not None:
+                # pdfplumber calls every edge that is not exactly horizontal vertical.
+                if current[1] == end[1]:
+                    horizontal += 1
+                else:
+                    vertical += 1
+            current = end
+        elif op in _CURVE_OPS:
+            return True
+        elif op == b"cm" and len(args) >= 6 and (args[-5] != 0 or args[-4] != 0):
+            return True
+        elif op == b"Do" and not (args and _is_image(xobjects, args[-1])):
+            return True
+        if horizontal >= 2 and vertical >= 2:
+            return True
+    return False
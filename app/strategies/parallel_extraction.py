@@ -0,0 +1,332 @@
+"""Strategy: pdfplumber extraction spread across a warm process pool.
+
+Pages are split into contiguous chunks; each chunk runs in a pool worker that opens the
+document once and keeps it open for further chunks of the same document. Results are
+reassembled in page order.
+
+The PDF bytes cross the process boundary once: they are copied into an anonymous
+in-memory file (memfd) and workers map it through /proc/<api pid>/fd/<n>. Tasks only
+carry that reference and a page list. Where memfd is unavailable the bytes are pickled
+with each task instead.
+
+Workers run under per-process rlimits: RLIMIT_AS caps memory and RLIMIT_CPU caps CPU
+time per chunk. Crossing either fails only that task (MemoryError / SIGXCPU turned into
+`CpuBudgetExceeded`); the worker and the other conversions sharing the pool carry on. A
+worker that still dies (a crash, or a task that ignores the CPU abort) breaks the pool:
+it is replaced by a warm one and the unfinished chunks of every affected call are
+retried once.
+
+A cancelled call stops waiting within `_CANCEL_POLL_SECONDS` and drops its queued chunks;
+chunks already running in a worker finish there and are discarded.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import math
+import mmap
+import multiprocessing
+import os
+import resource
+import signal
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+
+from app.core.cancellation import CancellationToken, DeadlineExceeded
+from app.logging_config import get_logger
+from app.strategies.table_extraction import (
+    ExtractionAborted,
+    PageCache,
+    ParsedDocument,
+    PdfBytes,
+    PdfplumberDocument,
+    PdfplumberTableExtractor,
+    ProgressCallback,
+    TablesByPageNumber,
+    extract_pages,
+)
+
+logger = get_logger("app.extraction")
+
+_pool: ProcessPoolExecutor | None = None
+_pool_lock = threading.Lock()
+
+# CPU seconds a task may keep running after its budget-exceeded exception before the
+# default SIGXCPU action kills the worker.
+_CPU_GRACE_SECONDS = 5
+# How often a caller waiting on a chunk checks its cancellation token.
+_CANCEL_POLL_SECONDS = 0.2
+
+# Worker-process state: the document currently open in this worker, keyed by content digest.
+_worker_doc: tuple[str, PdfplumberDocument] | None = None
+# Set when the current task crossed its CPU budget (pdfplumber may wrap the exception).
+_cpu_budget_hit = False
+
+
+class CpuBudgetExceeded(Exception):
+    """Raised inside a worker when a task crosses its RLIMIT_CPU soft limit."""
+
+
+@dataclass(frozen=True)
+class SharedPdf:
+    """Reference to PDF bytes held in a memfd of the API process."""
+
+    pid: int
+    fd: int
+    size: int
+    digest: str
+
+
+def _init_worker(memory_mb: int) -> None:
+    if memory_mb > 0:
+        limit = memory_mb * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+
+
+def _noop() -> None:
+    return None
+
+
+def _extend_cpu_soft_limit(seconds: int) -> None:
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    # Whole seconds only: round usage up so the task gets at least `seconds` of CPU.
+    soft = math.ceil(usage.ru_utime + usage.ru_stime) + seconds
+    _, hard = resource.getrlimit(resource.RLIMIT_CPU)
+    if hard != resource.RLIM_INFINITY:
+        soft = min(soft, hard)
+    resource.setrlimit(resource.RLIMIT_CPU, (soft, hard))
+
+
+def _on_cpu_limit(signum: int, frame: object) -> None:
+    # Abort the task, not the worker. If the task keeps burning CPU through the grace
+    # period (the exception was swallowed), the default action kills the process.
+    global _cpu_budget_hit
+    _cpu_budget_hit = True
+    _extend_cpu_soft_limit(_CPU_GRACE_SECONDS)
+    signal.signal(signal.SIGXCPU, signal.SIG_DFL)
+    raise CpuBudgetExceeded("Document exceeded extraction CPU limit.")
+
+
+def _set_cpu_budget(cpu_seconds: int) -> None:
+    # RLIMIT_CPU counts the lifetime of the process, so move the soft limit forward per task.
+    global _cpu_budget_hit
+    _cpu_budget_hit = False
+    if cpu_seconds <= 0:
+        return
+    signal.signal(signal.SIGXCPU, _on_cpu_limit)
+    _extend_cpu_soft_limit(cpu_seconds)
+
+
+def _clear_cpu_budget(cpu_seconds: int) -> None:
+    # Between tasks the worker runs pool bookkeeping; a late SIGXCPU there would kill it.
+    if cpu_seconds <= 0:
+        return
+    signal.signal(signal.SIGXCPU, signal.SIG_IGN)
+    _, hard = resource.getrlimit(resource.RLIMIT_CPU)
+    resource.setrlimit(resource.RLIMIT_CPU, (hard, hard))
+
+
+def _map_shared(source: SharedPdf) -> mmap.mmap:
+    with open(f"/proc/{source.pid}/fd/{source.fd}", "rb") as f:
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    # The fd number could have been reused once the caller gave up on this call.
+    if len(mm) != source.size or hashlib.sha256(mm).hexdigest() != source.digest:
+        mm.close()
+        raise ExtractionAborted("Shared document changed before it was opened.")
+    return mm
+
+
+def _drop_worker_doc() -> None:
+    global _worker_doc
+    if _worker_doc is not None:
+        _worker_doc[1].close()
+        _worker_doc = None
+
+
+def _open_in_worker(source: SharedPdf | bytes, digest: str) -> PdfplumberDocument:
+    global _worker_doc
+    if _worker_doc is not None and _worker_doc[0] == digest:
+        return _worker_doc[1]
+    _drop_worker_doc()
+    if isinstance(source, SharedPdf):
+        mm = _map_shared(source)
+        try:
+            document = PdfplumberDocument(mm)
+        except Exception:
+            mm.close()
+            raise
+        document.resources.callback(mm.close)
+    else:
+        document = PdfplumberDocument(source)
+    _worker_doc = (digest, document)
+    return document
+
+
+def _extract_chunk(
+    source: SharedPdf | bytes, digest: str, pages: list[int], cpu_seconds: int
+) -> TablesByPageNumber:
+    _set_cpu_budget(cpu_seconds)
+    try:
+        return extract_pages(_open_in_worker(source, digest).pdf, pages)
+    except MemoryError:
+        # Do not keep a document that blew the budget around for the next task.
+        _drop_worker_doc()
+        raise
+    except Exception:
+        if not _cpu_budget_hit:
+            raise
+        _drop_worker_doc()
+        raise CpuBudgetExceeded("Document exceeded extraction CPU limit.") from None
+    finally:
+        _clear_cpu_budget(cpu_seconds)
+
+
+def _mp_context() -> multiprocessing.context.BaseContext:
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        ctx = multiprocessing.get_context("forkserver")
+        ctx.set_forkserver_preload(["app.strategies.parallel_extraction"])
+        return ctx
+    return multiprocessing.get_context("spawn")
+
+
+def get_pool(workers: int, memory_mb: int) -> ProcessPoolExecutor:
+    """Return the shared extraction pool, creating it on first use."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=_mp_context(),
+                initializer=_init_worker,
+                initargs=(memory_mb,),
+            )
+        return _pool
+
+
+def warm_pool(workers: int, memory_mb: int) -> None:
+    """Start all pool workers up front so the first conversion does not pay for it."""
+    pool = get_pool(workers, memory_mb)
+    for f in [pool.submit(_noop) for _ in range(workers)]:
+        f.result()
+
+
+def _replace_broken_pool(pool: ProcessPoolExecutor, workers: int, memory_mb: int) -> ProcessPoolExecutor:
+    """Swap a broken pool for a warm one (once, however many callers saw it break)."""
+    global _pool
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+    warm_pool(workers, memory_mb)
+    return get_pool(workers, memory_mb)
+
+
+def shutdown_pool() -> None:
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+def _wait_result(
+    future: Future[TablesByPageNumber], cancellation: CancellationToken | None
+) -> TablesByPageNumber:
+    """future.result(), giving up once `cancellation` is set (the chunk itself runs on)."""
+    if cancellation is None:
+        return future.result()
+    while True:
+        try:
+            return future.result(timeout=_CANCEL_POLL_SECONDS)
+        except TimeoutError:
+            cancellation.raise_if_cancelled()
+
+
+def _share_content(content: PdfBytes, digest: str) -> tuple[SharedPdf | bytes, int | None]:
+    """Copy the PDF into a memfd workers can map; returns (task source, fd to close)."""
+    if not hasattr(os, "memfd_create"):
+        return (content if isinstance(content, bytes) else bytes(content)), None
+    fd = os.memfd_create("tabularis-pdf", getattr(os, "MFD_CLOEXEC", 0))
+    try:
+        view = memoryview(content)
+        written = 0
+        while written < len(view):
+            written += os.write(fd, view[written:])
+        view.release()
+    except BaseException:
+        os.close(fd)
+        raise
+    return SharedPdf(pid=os.getpid(), fd=fd, size=len(content), digest=digest), fd
+
+
+class ProcessPoolTableExtractor(PdfplumberTableExtractor):
+    """pdfplumber extraction with page ranges fanned out to a warm process pool."""
+
+    def __init__(
+        self,
+        workers: int,
+        chunk_pages: int = 10,
+        memory_mb: int = 0,
+        cpu_seconds: int = 0,
+        page_cache: PageCache | None = None,
+        prescreen: bool = False,
+    ) -> None:
+        super().__init__(page_cache=page_cache, prescreen=prescreen)
+        self._workers = workers
+        self._chunk_pages = max(1, chunk_pages)
+        self._memory_mb = memory_mb
+        self._cpu_seconds = cpu_seconds
+
+    def _extract_pages(
+        self,
+        document: ParsedDocument,
+        page_numbers: list[int],
+        progress: ProgressCallback | None,
+        cancellation: CancellationToken | None = None,
+    ) -> TablesByPageNumber:
+        if len(page_numbers) <= self._chunk_pages:
+            # A single chunk is cheaper in-process on the already opened document.
+            return super()._extract_pages(document, page_numbers, progress, cancellation)
+
+        chunks = [page_numbers[i : i + self._chunk_pages] for i in range(0, len(page_numbers), self._chunk_pages)]
+        digest = document.digest
+        source, fd = _share_content(document.content, digest)
+        done: list[TablesByPageNumber] = []
+        pages_done = 0
+        retried = False
+        pool = get_pool(self._workers, self._memory_mb)
+        try:
+            while len(done) < len(chunks):
+                futures: list[Future[TablesByPageNumber]] = []
+                try:
+                    for chunk in chunks[len(done) :]:
+                        futures.append(pool.submit(_extract_chunk, source, digest, chunk, self._cpu_seconds))
+                    for future in futures:
+                        chunk_result = _wait_result(future, cancellation)
+                        done.append(chunk_result)
+                        pages_done += len(chunk_result)
+                        if progress:
+                            progress(pages_done, len(page_numbers))
+                except BrokenProcessPool as e:
+                    if retried:
+                        logger.warning("Extraction pool broke again; aborting pages=%s", len(page_numbers))
+                        raise ExtractionAborted("Document exceeded extraction resource limits.") from e
+                    logger.warning("Extraction worker died; re-warming pool pages=%s", len(page_numbers))
+                    retried = True
+                    pool = _replace_broken_pool(pool, self._workers, self._memory_mb)
+                finally:
+                    for future in futures:
+                        future.cancel()
+        except DeadlineExceeded as e:
+            e.partial = [page for chunk_result in done for page in chunk_result]
+            raise
+        except CpuBudgetExceeded as e:
+            raise ExtractionAborted(str(e)) from e
+        except MemoryError as e:
+            raise ExtractionAborted("Document exceeded extraction memory limit.") from e
+        finally:
+            if fd is not None:
+                os.close(fd)
+        return [page for chunk_result in done for page in chunk_result]
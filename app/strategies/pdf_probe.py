@@ -0,0 +1,122 @@
+"""Structural PDF probe: page count, encryption and basic integrity without building pages.
+
+Only the header, the xref table/trailer and the catalog's page tree root are read (via
+pdfminer's lazy object resolution), so a probe takes milliseconds even for large files.
+Layout analysis and table extraction are left to the extraction strategies.
+"""
+
+from __future__ import annotations
+
+import io
+import mmap
+from dataclasses import dataclass
+from typing import Any
+
+from pdfminer.pdfdocument import (
+    PDFDocument,
+    PDFEncryptionError,
+    PDFPasswordIncorrect,
+    PDFXRefFallback,
+)
+from pdfminer.pdfpage import PDFPage
+from pdfminer.pdfparser import PDFParser
+from pdfminer.pdftypes import resolve1
+
+# Raw PDF bytes: an in-memory bytes object or a read-only mapping of the upload spool.
+PdfBytes = bytes | mmap.mmap
+
+# The spec allows some bytes before the header; readers look this far.
+_HEADER_SEARCH_BYTES = 1024
+
+
+class PdfProbeError(Exception):
+    """Raised when the bytes are not a readable PDF."""
+
+
+class PdfEncrypted(PdfProbeError):
+    """Raised for documents that cannot be opened without a password."""
+
+
+@dataclass(frozen=True)
+class PdfProbe:
+    page_count: int
+    version: str
+    encrypted: bool  # has an /Encrypt dictionary (opened with the empty user password)
+    repaired: bool  # the xref table was unreadable and was rebuilt by scanning the file
+
+
+class BufferStream(io.RawIOBase):
+    """Seekable read-only stream over a buffer, so parsers can read it without a copy."""
+
+    def __init__(self, buffer: PdfBytes) -> None:
+        self._view = memoryview(buffer)
+        self._pos = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def readinto(self, b) -> int:  # type: ignore[no-untyped-def]
+        n = max(0, min(len(b), len(self._view) - self._pos))
+        b[:n] = self._view[self._pos : self._pos + n]
+        self._pos += n
+        return n
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_CUR:
+            offset += self._pos
+        elif whence == io.SEEK_END:
+            offset += len(self._view)
+        if offset < 0:
+            raise ValueError("negative seek position")
+        self._pos = offset
+        return self._pos
+
+    def tell(self) -> int:
+        return self._pos
+
+    def close(self) -> None:
+        # Release the export so the underlying mmap can be closed.
+        self._view.release()
+        super().close()
+
+
+def _header_version(content: PdfBytes) -> str:
+    head = bytes(content[:_HEADER_SEARCH_BYTES])
+    at = head.find(b"%PDF-")
+    if at < 0:
+        raise PdfProbeError("Missing %PDF header.")
+    return head[at + 5 : at + 8].decode("latin-1")
+
+
+def _page_count(document: PDFDocument, repaired: bool) -> int:
+    pages: Any = resolve1(document.catalog.get("Pages"))
+    count = resolve1(pages.get("Count")) if isinstance(pages, dict) else None
+    if isinstance(count, int) and count >= 0 and not repaired:
+        return count
+    # No usable /Count (or a rebuilt xref we do not trust): walk the page tree instead.
+    return sum(1 for _ in PDFPage.create_pages(document))
+
+
+def probe_pdf(content: PdfBytes) -> PdfProbe:
+    """Read the document structure. Raises PdfEncrypted or PdfProbeError."""
+    version = _header_version(content)
+    stream = BufferStream(content)
+    try:
+        document = PDFDocument(PDFParser(stream))
+        repaired = any(isinstance(xref, PDFXRefFallback) for xref in document.xrefs)
+        page_count = _page_count(document, repaired)
+        encrypted = document.encryption is not None
+    except (PDFPasswordIncorrect, PDFEncryptionError) as e:
+        raise PdfEncrypted("Password-protected PDFs are not supported.") from e
+    except PdfProbeError:
+        raise
+    except Exception as e:
+        raise PdfProbeError(f"Unreadable PDF structure: {e}") from e
+    finally:
+        stream.close()
+    if page_count == 0:
+        raise PdfProbeError("Document has no pages.")
+    return PdfProbe(page_count=page_count, version=version, encrypted=encrypted, repaired=repaired)
@@ -1,46 +1,254 @@
 """Strategy: extraction of tables from PDF. Different algorithms can be swapped."""
 
-import io
+import contextlib
+import functools
+import hashlib
 from abc import ABC, abstractmethod
+from collections.abc import Callable, Sequence
+from typing import cast
 
 import pdfplumber
 
+from app.core.cache import ByteBudgetLRU
+from app.core.cancellation import CancellationToken, DeadlineExceeded
+from app.logging_config import get_logger
+from app.strategies.page_screen import has_table_candidates
+from app.strategies.pdf_probe import BufferStream, PdfBytes, PdfProbe, probe_pdf
+
 # Type: list of pages, each page = list of tables, each table = list of rows, each row = list of cells
 TablesOnPage = list[list[list[str | None]]]
 TablesByPageNumber = list[tuple[int, TablesOnPage]]
+# Called as progress(pages_done, pages_total) while extraction advances.
+ProgressCallback = Callable[[int, int], None]
+# Extracted tables per page, keyed by (document digest, extractor cache key, page number).
+PageCache = ByteBudgetLRU[tuple[str, str, int], TablesOnPage]
+
+logger = get_logger("app.extraction")
+
+
+def tables_size(tables: TablesOnPage) -> int:
+    """Rough in-memory footprint of one page's tables, charged against a PageCache budget."""
+    return 64 + sum(56 + sum(50 + len(cell or "") for cell in row) for table in tables for row in table)
+
+
+class ExtractionAborted(Exception):
+    """Raised when extraction is stopped by a resource limit (e.g. a killed pool worker)."""
+
+
+class ParsedDocument(ABC):
+    """A PDF parsed once per request and shared by validation, page count and extraction."""
+
+    def __init__(self, content: PdfBytes) -> None:
+        self.content = content
+        # Pages the last extract_tables call ruled out without running table detection.
+        self.skipped_pages: list[int] = []
+        # Pages the last extract_tables call did not reach before its deadline.
+        self.missing_pages: list[int] = []
+        # Released together with the document (e.g. the upload spool backing `content`).
+        self.resources = contextlib.ExitStack()
+
+    @property
+    @abstractmethod
+    def page_count(self) -> int:
+        """Number of pages in the document."""
+        ...
+
+    @functools.cached_property
+    def digest(self) -> str:
+        """SHA-256 of the PDF bytes (computed once, used for cache keys)."""
+        return hashlib.sha256(self.content).hexdigest()
+
+    def close(self) -> None:
+        """Release the underlying parser resources."""
+        self.resources.close()
+
+    def __enter__(self) -> "ParsedDocument":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+
+class PdfplumberDocument(ParsedDocument):
+    """
+    Document handle backed by a single `pdfplumber.PDF`.
+
+    Opening only probes the structure (see app.strategies.pdf_probe); validation and page
+    count need nothing more. pdfplumber is opened on first access to `pdf`, i.e. when
+    tables are extracted.
+    """
+
+    def __init__(self, content: PdfBytes, probe: PdfProbe | None = None) -> None:
+        super().__init__(content)
+        self.probe = probe if probe is not None else probe_pdf(content)
+
+    @property
+    def page_count(self) -> int:
+        return self.probe.page_count
+
+    @functools.cached_property
+    def pdf(self) -> pdfplumber.PDF:
+        stream = BufferStream(self.content)
+        try:
+            pdf = pdfplumber.open(stream)
+        except Exception:
+            stream.close()
+            raise
+        self.resources.callback(stream.close)
+        self.resources.callback(pdf.close)
+        return pdf
 
 
 class TableExtractorStrategy(ABC):
     """Abstract strategy for extracting tables from PDF content."""
 
+    # Bump when a change alters extracted output, so cached results are not reused.
+    version = "1"
+
+    @property
+    def cache_key(self) -> str:
+        """Identify the algorithm and settings that determine the extracted output."""
+        return f"{type(self).__name__}:{self.version}"
+
     @abstractmethod
-    def get_page_count(self, content: bytes) -> int:
-        """Return number of pages (for validation without full extraction)."""
+    def open_document(self, content: PdfBytes) -> ParsedDocument:
+        """Parse PDF bytes into a document handle reused for the rest of the request."""
         ...
 
     @abstractmethod
-    def extract_tables(self, content: bytes, pages: list[int] | None = None) -> TablesByPageNumber:
-        """Extract tables from PDF bytes. Returns (page_number, tables) tuples."""
+    def extract_tables(
+        self,
+        document: ParsedDocument,
+        pages: list[int] | None = None,
+        progress: ProgressCallback | None = None,
+        cancellation: CancellationToken | None = None,
+    ) -> TablesByPageNumber:
+        """
+        Extract tables from an opened document. Returns (page_number, tables) tuples.
+        Raises OperationCancelled between pages once `cancellation` is cancelled. On
+        DeadlineExceeded, `partial` holds the pages finished so far (in page order) and
+        `document.missing_pages` the rest.
+        """
         ...
 
 
 class PdfplumberTableExtractor(TableExtractorStrategy):
-    """Extract tables using pdfplumber (line-based / structured PDFs)."""
-
-    def get_page_count(self, content: bytes) -> int:
-        with pdfplumber.open(io.BytesIO(content)) as pdf:
-            return len(pdf.pages)
-
-    def extract_tables(self, content: bytes, pages: list[int] | None = None) -> TablesByPageNumber:
-        result: TablesByPageNumber = []
-        with pdfplumber.open(io.BytesIO(content)) as pdf:
-            if pages:
-                for page_num in pages:
-                    page = pdf.pages[page_num - 1]
-                    tables = page.extract_tables()
-                    result.append((page_num, tables or []))
+    """
+    Extract tables using pdfplumber (line-based / structured PDFs).
+
+    With a `page_cache`, tables are remembered per (document, page): a later call with an
+    overlapping page selection only extracts the pages it has not seen.
+
+    With `prescreen`, pages whose content stream cannot form a ruled cell (see
+    app.strategies.page_screen) are skipped without running table detection and listed
+    in `document.skipped_pages`. Skipped pages are not page-cached, so every call that
+    needs them screens and reports them again.
+    """
+
+    def __init__(self, page_cache: PageCache | None = None, prescreen: bool = False) -> None:
+        self._page_cache = page_cache
+        self._prescreen = prescreen
+
+    @property
+    def cache_key(self) -> str:
+        # Pool and in-process extraction produce the same tables, so they share a key.
+        key = f"pdfplumber-{pdfplumber.__version__}:default-table-settings:{self.version}"
+        # Screened output should match, but stays apart in case the screen ever misses a table.
+        return f"{key}:prescreen" if self._prescreen else key
+
+    def open_document(self, content: PdfBytes) -> PdfplumberDocument:
+        return PdfplumberDocument(content)
+
+    def extract_tables(
+        self,
+        document: ParsedDocument,
+        pages: list[int] | None = None,
+        progress: ProgressCallback | None = None,
+        cancellation: CancellationToken | None = None,
+    ) -> TablesByPageNumber:
+        page_numbers = list(pages or range(1, document.page_count + 1))
+        document.skipped_pages = []
+        document.missing_pages = []
+        cache = self._page_cache if self._page_cache is not None and self._page_cache.enabled else None
+        key = (document.digest, self.cache_key)
+        found: dict[int, TablesOnPage] = {}
+        if cache is not None:
+            for page_num in page_numbers:
+                tables = cache.get((*key, page_num))
+                if tables is not None:
+                    found[page_num] = tables
+        missing = [p for p in page_numbers if p not in found]
+        if missing and self._prescreen:
+            missing = self._screen(document, missing)
+            for page_num in document.skipped_pages:
+                found[page_num] = []
+        if missing:
+            def on_progress(done: int, _total: int) -> None:
+                if progress:
+                    progress(len(found) + done, len(page_numbers))
+
+            deadline_hit: DeadlineExceeded | None = None
+            try:
+                extracted = self._extract_pages(document, missing, on_progress, cancellation)
+            except DeadlineExceeded as e:
+                deadline_hit, extracted = e, e.partial or []
+            for page_num, tables in extracted:
+                if cache is not None:
+                    cache.put((*key, page_num), tables)
+                found[page_num] = tables
+            if deadline_hit is not None:
+                document.missing_pages = [p for p in page_numbers if p not in found]
+                deadline_hit.partial = [(p, found[p]) for p in page_numbers if p in found]
+                raise deadline_hit
+        elif progress:
+            progress(len(page_numbers), len(page_numbers))
+        return [(page_num, found[page_num]) for page_num in page_numbers]
+
+    def _screen(self, document: ParsedDocument, page_numbers: list[int]) -> list[int]:
+        """Record pages without table candidates in `document.skipped_pages`; return the rest."""
+        pdf = cast(PdfplumberDocument, document).pdf
+        keep: list[int] = []
+        for page_num in page_numbers:
+            if has_table_candidates(pdf.pages[page_num - 1].page_obj):
+                keep.append(page_num)
             else:
-                for page_num, page in enumerate(pdf.pages, start=1):
-                    tables = page.extract_tables()
-                    result.append((page_num, tables or []))
-        return result
+                document.skipped_pages.append(page_num)
+        if document.skipped_pages:
+            logger.info("Pre-screen skipped %s of %s pages", len(document.skipped_pages), len(page_numbers))
+        return keep
+
+    def _extract_pages(
+        self,
+        document: ParsedDocument,
+        page_numbers: list[int],
+        progress: ProgressCallback | None,
+        cancellation: CancellationToken | None = None,
+    ) -> TablesByPageNumber:
+        """Extract the given pages (no caching); subclasses change where the work runs."""
+        pdf = cast(PdfplumberDocument, document).pdf
+        return extract_pages(pdf, page_numbers, progress=progress, cancellation=cancellation)
+
+
+def extract_pages(
+    pdf: pdfplumber.PDF,
+    page_numbers: Sequence[int],
+    progress: ProgressCallback | None = None,
+    cancellation: CancellationToken | None = None,
+) -> TablesByPageNumber:
+    """Run pdfplumber table extraction on the given 1-based pages of an open PDF."""
+    result: TablesByPageNumber = []
+    for page_num in page_numbers:
+        if cancellation is not None:
+            try:
+                cancellation.raise_if_cancelled()
+            except DeadlineExceeded as e:
+                e.partial = result
+                raise
+        page = pdf.pages[page_num - 1]
+        tables = page.extract_tables()
+        # Drop per-page layout caches; the document handle outlives the loop.
+        page.close()
+        result.append((page_num, tables or []))
+        if progress:
+            progress(len(result), len(page_numbers))
+    return result
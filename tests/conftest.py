@@ -0,0 +1,106 @@
+from collections.abc import AsyncIterator, Callable, Iterator
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+
+from app.models import Base
+
+
+def _grid_pdf(n_pages: int = 4, rows: int = 3, cols: int = 3, table_every: int = 2) -> bytes:
+    """Minimal PDF: a ruled rows x cols grid with cell text on every `table_every`-th page."""
+    objs: list[bytes] = []
+
+    def add(obj: bytes) -> int:
+        objs.append(obj)
+        return len(objs)
+
+    font = add(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+    contents = []
+    for p in range(1, n_pages + 1):
+        ops = []
+        if p % table_every == 0:
+            x0, y0, w, h = 50, 700, 100, 20
+            ops += [f"{x0} {y0 - r * h} m {x0 + cols * w} {y0 - r * h} l S" for r in range(rows + 1)]
+            ops += [f"{x0 + c * w} {y0} m {x0 + c * w} {y0 - rows * h} l S" for c in range(cols + 1)]
+            ops += [
+                f"BT /F1 10 Tf {x0 + c * w + 5} {y0 - (r + 1) * h + 6} Td (p{p}r{r}c{c}) Tj ET"
+                for r in range(rows)
+                for c in range(cols)
+            ]
+        else:
+            ops.append(f"BT /F1 12 Tf 72 720 Td (Text page {p}) Tj ET")
+        data = "\n".join(ops).encode()
+        contents.append(add(b"<< /Length %d >>\nstream\n" % len(data) + data + b"\nendstream"))
+    pages_id = len(objs) + n_pages + 1
+    page_ids = [
+        add(
+            b"<< /Type /Page /Parent %d 0 R /MediaBox [0 0 612 792] /Contents %d 0 R "
+            b"/Resources << /Font << /F1 %d 0 R >> >> >>" % (pages_id, contents[i], font)
+        )
+        for i in range(n_pages)
+    ]
+    kids = b" ".join(b"%d 0 R" % i for i in page_ids)
+    add(b"<< /Type /Pages /Kids [" + kids + b"] /Count %d >>" % n_pages)
+    catalog = add(b"<< /Type /Catalog /Pages %d 0 R >>" % pages_id)
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for i, obj in enumerate(objs, 1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % i + obj + b"\nendobj\n"
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objs) + 1)
+    out += b"".join(b"%010d 00000 n \n" % off for off in offsets)
+    out += b"trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objs) + 1, catalog, xref)
+    return bytes(out)
+
+
+@pytest.fixture
+def make_pdf() -> Callable[..., bytes]:
+    return _grid_pdf
+
+
+@pytest.fixture
+def explained_db() -> Iterator[tuple[Session, list[str]]]:
+    """
+    In-memory SQLite session with the app schema (models' indexes included), plus the
+    EXPLAIN QUERY PLAN of every SELECT it runs, one " | "-joined string per statement.
+    """
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    plans: list[str] = []
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _explain(_conn, cursor, statement, parameters, _context, _executemany) -> None:
+        if statement.lstrip().upper().startswith("SELECT"):
+            rows = cursor.connection.execute("EXPLAIN QUERY PLAN " + statement, parameters).fetchall()
+            plans.append(" | ".join(row[-1] for row in rows))
+
+    with Session(engine) as session:
+        yield session, plans
+    engine.dispose()
+
+
+@pytest.fixture
+def anyio_backend() -> str:
+    # SQLAlchemy's async engine runs on asyncio only.
+    return "asyncio"
+
+
+@pytest.fixture
+async def async_db() -> AsyncIterator[tuple[AsyncSession, list[str]]]:
+    """In-memory SQLite AsyncSession (aiosqlite) with the app schema, plus every statement it runs."""
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    statements: list[str] = []
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def _record(_conn, _cursor, statement, *_args) -> None:
+        statements.append(statement)
+
+    async with AsyncSession(engine, expire_on_commit=False) as session:
+        yield session, statements
+    await engine.dispose()
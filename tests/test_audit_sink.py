@@ -0,0 +1,62 @@
+import threading
+import uuid
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.models.audit_log import AuditLog
+from app.models.base import Base
+from app.repositories.audit_log_repository import AuditLogRepository
+from app.services import audit
+from app.services.audit import BufferedAuditSink
+
+
+def _sessions():
+    engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+    Base.metadata.create_all(engine)
+    inserts = []
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _record(_conn, _cursor, statement, *_args) -> None:
+        if statement.startswith("INSERT INTO audit_logs"):
+            inserts.append(statement)
+
+    return sessionmaker(bind=engine), inserts
+
+
+def test_events_are_written_in_batches_and_flushed_on_close(monkeypatch) -> None:
+    sessions, inserts = _sessions()
+    sink = BufferedAuditSink(sessions, queue_size=100, batch_size=4, flush_interval_sec=5, enqueue_timeout_sec=1)
+    monkeypatch.setattr(audit, "get_audit_sink", lambda: sink)
+    user_id = uuid.uuid4()
+
+    for i in range(10):
+        audit.log_audit(None, user_id, f"ACTION_{i}", ip="127.0.0.1")  # type: ignore[arg-type]
+    sink.close()
+
+    with sessions() as db:
+        actions = sorted(a for (a,) in db.query(AuditLog.action))
+    assert actions == sorted(f"ACTION_{i}" for i in range(10))
+    assert len(inserts) == 3  # 4 + 4 + the remainder flushed on close
+
+
+def test_full_queue_falls_back_to_a_synchronous_insert(monkeypatch) -> None:
+    sessions, _ = _sessions()
+    release = threading.Event()
+
+    def stalled_session():
+        release.wait(5)
+        return sessions()
+
+    sink = BufferedAuditSink(stalled_session, queue_size=1, batch_size=1, flush_interval_sec=0, enqueue_timeout_sec=0.01)
+    monkeypatch.setattr(audit, "get_audit_sink", lambda: sink)
+    with sessions() as db:
+        repo = AuditLogRepository(db)
+        for i in range(4):  # the writer holds one, the queue one, the rest overflow
+            audit.log_audit(repo, None, f"ACTION_{i}")
+        assert db.query(AuditLog).count() >= 2
+    release.set()
+    sink.close()
+    with sessions() as db:
+        assert db.query(AuditLog).count() == 4
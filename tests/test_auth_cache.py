@@ -0,0 +1,36 @@
+import time
+
+from jose import jwt
+
+from app.core import auth
+from app.core.cache import ByteBudgetLRU
+
+
+def _token(secret: str, ttl: int) -> str:
+    return jwt.encode({"sub": "u1", "exp": int(time.time()) + ttl}, secret, algorithm="HS256")
+
+
+def test_verified_tokens_are_reused_until_exp(monkeypatch) -> None:
+    now = [0.0]
+    cache: ByteBudgetLRU[str, dict] = ByteBudgetLRU(2, sizeof=lambda _p: 1, clock=lambda: now[0])
+    monkeypatch.setattr(auth, "_verified_tokens", cache)
+    monkeypatch.setattr(auth.settings, "supabase_jwt_secret", "s3cret")
+    calls = []
+    verify = auth._verify_supabase_jwt
+    monkeypatch.setattr(auth, "_verify_supabase_jwt", lambda token: calls.append(token) or verify(token))
+
+    token = _token("s3cret", ttl=3600)
+    assert auth.verify_supabase_jwt(token)["sub"] == "u1"
+    assert auth.verify_supabase_jwt(token)["sub"] == "u1"
+    assert len(calls) == 1
+
+    now[0] += 3601  # past `exp` on the cache clock
+    auth.verify_supabase_jwt(token)
+    assert len(calls) == 2
+
+
+def test_rejected_tokens_are_not_cached(monkeypatch) -> None:
+    monkeypatch.setattr(auth, "_verified_tokens", ByteBudgetLRU(10, sizeof=lambda _p: 1))
+    monkeypatch.setattr(auth.settings, "supabase_jwt_secret", "s3cret")
+    assert auth.verify_supabase_jwt(_token("other", ttl=3600)) is None
+    assert len(auth._verified_tokens) == 0
@@ -0,0 +1,128 @@
+from app.core.cache import ByteBudgetLRU
+
+
+def test_lru_evicts_least_recently_used_by_bytes() -> None:
+    cache: ByteBudgetLRU[str, bytes] = ByteBudgetLRU(max_bytes=10)
+    cache.put("a", b"1234")
+    cache.put("b", b"1234")
+    assert cache.get("a") == b"1234"  # "b" is now the oldest
+    cache.put("c", b"1234")
+    assert cache.get("b") is None
+    assert not cache.put("huge", b"x" * 11)
+    stats = cache.stats()
+    assert (stats.items, stats.bytes, stats.hits, stats.misses, stats.evictions) == (2, 8, 1, 1, 1)
+
+
+def test_page_cache_only_extracts_unseen_pages() -> None:
+    from app.strategies.table_extraction import PdfplumberTableExtractor, tables_size
+
+    class CountingExtractor(PdfplumberTableExtractor):
+        def __init__(self, page_cache) -> None:
+            super().__init__(page_cache=page_cache)
+            self.extracted: list[int] = []
+
+        def _extract_pages(self, document, page_numbers, progress, cancellation=None):
+            self.extracted.extend(page_numbers)
+            return [(p, [[[str(p)]]]) for p in page_numbers]
+
+    class FakeDocument:
+        digest = "d"
+        page_count = 6
+
+    extractor = CountingExtractor(ByteBudgetLRU(10_000, sizeof=tables_size))
+    extractor.extract_tables(FakeDocument(), pages=[1, 2, 3])  # type: ignore[arg-type]
+    result = extractor.extract_tables(FakeDocument(), pages=[2, 3, 4, 5])  # type: ignore[arg-type]
+    assert extractor.extracted == [1, 2, 3, 4, 5]
+    assert [p for p, _ in result] == [2, 3, 4, 5]
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_entries_expire_after_ttl() -> None:
+    clock = FakeClock()
+    cache: ByteBudgetLRU[str, bytes] = ByteBudgetLRU(max_bytes=100, ttl_sec=10, clock=clock)
+    cache.put("a", b"1")
+    clock.now += 11
+    cache.put("b", b"2")
+    assert cache.get("a") is None
+    assert cache.get("b") == b"2"
+    assert cache.stats().expired == 1
+
+
+def test_put_drops_expired_entries_behind_the_lru_front() -> None:
+    clock = FakeClock()
+    cache: ByteBudgetLRU[str, bytes] = ByteBudgetLRU(max_bytes=100, clock=clock)
+    cache.put("long", b"1", ttl_sec=60)
+    cache.put("short", b"22", ttl_sec=5)  # newer than "long", but expires first
+    clock.now += 6
+    cache.put("c", b"3")
+    stats = cache.stats()
+    assert (stats.items, stats.bytes, stats.expired) == (2, 2, 1)
+    assert cache.get("long") == b"1"
+
+
+def test_download_cache_keeps_compressed_form_only_when_it_pays(monkeypatch) -> None:
+    import os
+    from uuid import uuid4
+
+    from app.services import download_cache
+
+    monkeypatch.setattr(download_cache.settings, "download_cache_compress_level", 6)
+    text = b"page,table,row\n" * 1000
+    noise = os.urandom(1024)
+    assert len(download_cache._encode(text, "csv-zip")[1]) < len(text) // 10
+    meta, payload = download_cache._encode(noise, "xlsx")
+    assert payload is noise and not meta["compressed"]  # stored as is, not copied
+
+    conversion_id = uuid4()
+    download_cache.put(conversion_id, text, output_format="csv-zip")
+    item = download_cache.get_item(conversion_id)
+    assert item is not None
+    assert (item.data, item.output_format) == (text, "csv-zip")
+
+
+def test_download_cache_put_is_best_effort(monkeypatch) -> None:
+    import uuid
+
+    from app.services import download_cache
+    from app.services.conversion import ConversionService
+    from app.strategies.table_extraction import PdfplumberTableExtractor
+
+    class DownStore:
+        def set(self, *_args) -> None:
+            raise ConnectionError("kv down")
+
+    monkeypatch.setattr(download_cache, "_store", DownStore())
+    download_cache.put(uuid.uuid4(), b"data")  # logged, not raised
+
+    # The stream is complete once its last chunk is out: a failing hook cannot fail it.
+    service = ConversionService(PdfplumberTableExtractor())
+    hooked = []
+
+    def on_complete(data: bytes) -> None:
+        hooked.append(data)
+        raise ConnectionError("kv down")
+
+    assert list(service._tee_when_complete(iter([b"a", b"b"]), None, on_complete)) == [b"a", b"b"]
+    assert hooked == [b"ab"]
+
+
+def test_health_cache_reports_each_cache_to_the_ops_token_only(monkeypatch) -> None:
+    from fastapi.testclient import TestClient
+
+    from app.config import settings
+    from app.main import app
+
+    client = TestClient(app)
+    assert client.get("/health/cache").status_code == 404
+
+    monkeypatch.setattr(settings, "ops_token", "s3cret")
+    body = client.get("/health/cache", headers={"Authorization": "Bearer s3cret"}).json()
+    assert set(body) == {"result", "page", "download"}
+    assert {"hits", "misses", "evictions", "bytes", "max_bytes"} <= set(body["result"])
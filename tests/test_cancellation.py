@@ -0,0 +1,52 @@
+import pytest
+
+from app.core.cancellation import CancellationToken, OperationCancelled
+from app.services.conversion import ConversionError, ConversionService
+from app.strategies.table_extraction import PdfplumberTableExtractor
+
+
+def test_extraction_stops_between_pages_once_cancelled(make_pdf) -> None:
+    token = CancellationToken()
+    seen: list[int] = []
+
+    def progress(done: int, total: int) -> None:
+        seen.append(done)
+        if done == 2:
+            token.cancel("Client disconnected.")
+
+    extractor = PdfplumberTableExtractor()
+    with extractor.open_document(make_pdf(n_pages=6, table_every=1)) as document:
+        with pytest.raises(OperationCancelled, match="Client disconnected."):
+            extractor.extract_tables(document, progress=progress, cancellation=token)
+    assert seen == [1, 2]
+
+
+def test_service_reports_cancellation_as_its_own_error_code(make_pdf) -> None:
+    token = CancellationToken()
+    token.cancel()
+    service = ConversionService(PdfplumberTableExtractor())
+    with service.open_document(make_pdf(n_pages=2)) as document:
+        with pytest.raises(ConversionError) as excinfo:
+            service.convert_to_excel(document, "a.pdf", cancellation=token)
+    assert excinfo.value.code == "CANCELLED"
+
+
+@pytest.mark.parametrize("allow_partial", [False, True])
+def test_time_budget_returns_finished_pages_or_fails(make_pdf, allow_partial: bool) -> None:
+    now = [0.0]
+    token = CancellationToken(clock=lambda: now[0])
+
+    def progress(done: int, total: int) -> None:
+        now[0] += 6  # each page "takes" 6 s of a 10 s budget
+
+    service = ConversionService(PdfplumberTableExtractor())
+    with service.open_document(make_pdf(n_pages=5, table_every=1)) as document:
+        if not allow_partial:
+            with pytest.raises(ConversionError) as excinfo:
+                service.convert_to_excel(document, "a.pdf", progress=progress, cancellation=token, time_budget_sec=10)
+            assert excinfo.value.code == "DEADLINE_EXCEEDED"
+        else:
+            service.convert_to_excel(
+                document, "a.pdf", progress=progress, cancellation=token, time_budget_sec=10, allow_partial=True
+            )
+        assert document.missing_pages == [3, 4, 5]
@@ -0,0 +1,35 @@
+import csv
+import io
+import zipfile
+
+import pytest
+
+from app.builders.columnar import ArrowIpcExportBuilder, CsvZipExportBuilder, ParquetExportBuilder
+
+
+def _fill(builder):
+    builder.add_sheet("Page 1").add_table([["a", "b"], ["1", None]]).add_table([["x"]])
+    builder.add_sheet("Page 3").add_table([["p", "q", "r"]])
+    return builder
+
+
+def test_csv_zip_has_one_file_per_table() -> None:
+    archive = zipfile.ZipFile(io.BytesIO(_fill(CsvZipExportBuilder()).build()))
+    assert archive.namelist() == ["page_1_table_1.csv", "page_1_table_2.csv", "page_3_table_1.csv"]
+    rows = list(csv.reader(io.StringIO(archive.read("page_1_table_1.csv").decode())))
+    assert rows == [["a", "b"], ["1", ""]]
+
+
+@pytest.mark.parametrize("builder_cls", [ParquetExportBuilder, ArrowIpcExportBuilder])
+def test_arrow_formats_use_long_layout(builder_cls) -> None:
+    pa = pytest.importorskip("pyarrow")
+    data = _fill(builder_cls()).build()
+    if builder_cls is ParquetExportBuilder:
+        import pyarrow.parquet as pq
+
+        table = pq.read_table(io.BytesIO(data))
+    else:
+        table = pa.ipc.open_stream(data).read_all()
+    assert table.column_names == ["sheet", "table", "row", "c0", "c1", "c2"]
+    assert table.to_pylist()[1] == {"sheet": "Page 1", "table": 1, "row": 1, "c0": "1", "c1": None, "c2": None}
+    assert table.column("table").to_pylist() == [1, 1, 2, 1]
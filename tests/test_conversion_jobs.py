@@ -0,0 +1,107 @@
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.dependencies import get_conversion_service
+from app.models.base import Base
+from app.models.conversion import Conversion
+from app.models.usage_counter import UsageCounter
+from app.models.user import User
+from app.repositories.usage_counter_repository import UsageCounterRepository
+from app.services import conversion_jobs
+from app.services.conversion import ConversionError
+from app.services.conversion_jobs import ConversionJobRunner, JobStore, fail_stale_jobs
+from app.services.local_kv import make_key_value_store
+from app.services.usage_limits import reserve_conversion
+
+
+@pytest.fixture
+def sessions(tmp_path, monkeypatch):
+    engine = create_engine(f"sqlite:///{tmp_path / 'jobs.db'}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(engine)
+    sessions = sessionmaker(bind=engine)
+    monkeypatch.setattr(conversion_jobs, "SessionLocal", sessions)
+    return sessions
+
+
+class _UntilCancelled:
+    """Stands in for ConversionService: blocks until the runner's shutdown cancels it."""
+
+    def __init__(self) -> None:
+        self.started = threading.Event()
+
+    def convert_to_excel(self, document, filename, *, cancellation, **_kwargs):
+        self.started.set()
+        while not cancellation.cancelled:
+            time.sleep(0.01)
+        raise ConversionError(cancellation.reason, "CANCELLED")
+
+
+def _pending_job(sessions, user: User, created_at: datetime | None = None):
+    """A pending Conversion row holding a quota slot, as the submit endpoint leaves it."""
+    with sessions() as db:
+        reservation = reserve_conversion(user, UsageCounterRepository(db))
+        conversion = Conversion(user_id=user.id, filename="a.pdf", size_bytes=1, status="pending")
+        if created_at is not None:
+            conversion.created_at = created_at
+        db.add(conversion)
+        db.commit()
+        return conversion.id, reservation
+
+
+def _user(sessions) -> User:
+    user = User(id=uuid.uuid4(), plan="FREE", conversions_limit=10, conversions_used=0)
+    with sessions(expire_on_commit=False) as db:
+        db.add(user)
+        db.commit()
+    return user
+
+
+def test_shutdown_fails_running_and_queued_jobs_and_releases_their_slots(sessions, make_pdf) -> None:
+    user = _user(sessions)
+    service = _UntilCancelled()
+    runner = ConversionJobRunner(
+        JobStore(make_key_value_store("memory"), ttl_sec=60), lambda: service, workers=1, queue_size=4
+    )
+    jobs = []
+    for _ in range(2):
+        conversion_id, reservation = _pending_job(sessions, user)
+        document = get_conversion_service().open_document(make_pdf(n_pages=1))
+        jobs.append(
+            runner.submit(
+                document=document,
+                user_id=user.id,
+                filename="a.pdf",
+                pages=None,
+                content_type="application/pdf",
+                size_bytes=1,
+                conversion_id=conversion_id,
+                reservation=reservation,
+            )
+        )
+    assert service.started.wait(5)
+
+    runner.shutdown(timeout_sec=5)
+
+    assert [runner.store.get(job.id).status for job in jobs] == ["failed", "failed"]
+    with sessions() as db:
+        assert [c.status for c in db.query(Conversion)] == ["failed", "failed"]
+        assert [u.used for u in db.query(UsageCounter)] == [0]
+
+
+def test_fail_stale_jobs_fails_old_pending_rows_and_releases_their_slots(sessions) -> None:
+    user = _user(sessions)
+    stale_id, _ = _pending_job(sessions, user, created_at=datetime.now(timezone.utc) - timedelta(hours=1))
+    fresh_id, _ = _pending_job(sessions, user)
+
+    assert fail_stale_jobs() == 1
+
+    with sessions() as db:
+        assert db.get(Conversion, stale_id).status == "failed"
+        assert db.get(Conversion, fresh_id).status == "pending"
+        assert [u.used for u in db.query(UsageCounter)] == [1]
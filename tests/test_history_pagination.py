@@ -0,0 +1,67 @@
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi import HTTPException
+
+from app.api.v1.history import history
+from app.models.conversion import Conversion
+from app.models.user import User
+from app.repositories.conversion_repository import AsyncConversionRepository
+
+pytestmark = pytest.mark.anyio
+
+
+async def _page(repo, user, **params):
+    params = {"limit": 2, "cursor": None, "offset": 0, "total": "estimate", **params}
+    return await history(current_user=user, conversion_repo=repo, **params)
+
+
+async def test_cursor_pages_cover_the_history_once_newest_first(async_db) -> None:
+    db, _ = async_db
+    user = User(id=uuid.uuid4(), plan="FREE", conversions_limit=10, conversions_used=0)
+    db.add(user)
+    base = datetime(2026, 10, 1, tzinfo=timezone.utc)
+    # Two rows share a timestamp: the id tie-break keeps them on distinct pages.
+    stamps = [base, base + timedelta(minutes=1), base + timedelta(minutes=1), base + timedelta(minutes=2), base]
+    for stamp in stamps:
+        db.add(
+            Conversion(
+                id=uuid.uuid4(), user_id=user.id, filename="a.pdf", size_bytes=1, status="success", created_at=stamp
+            )
+        )
+    await db.commit()
+    repo = AsyncConversionRepository(db)
+
+    seen, cursor = [], None
+    while True:
+        page = await _page(repo, user, cursor=cursor, total="exact" if cursor is None else "none")
+        seen += page.items
+        if cursor is None:
+            assert (page.total, page.total_is_estimate) == (5, False)
+        else:
+            assert page.total is None
+        cursor = page.next_cursor
+        if cursor is None:
+            break
+    assert len({item.id for item in seen}) == 5
+    keys = [(item.created_at, item.id) for item in seen]
+    assert keys == sorted(keys, reverse=True)
+
+
+async def test_short_history_reports_an_exact_total_for_free(async_db) -> None:
+    db, statements = async_db
+    user = User(id=uuid.uuid4(), plan="FREE", conversions_limit=10, conversions_used=0)
+    db.add(user)
+    await db.commit()
+    statements.clear()
+    page = await _page(AsyncConversionRepository(db), user, limit=20)
+    assert (page.items, page.total, page.total_is_estimate, page.next_cursor) == ([], 0, False, None)
+    assert len(statements) == 1  # the listing only: no COUNT(*)
+
+
+async def test_malformed_cursor_is_rejected(async_db) -> None:
+    db, _ = async_db
+    with pytest.raises(HTTPException) as e:
+        await _page(AsyncConversionRepository(db), User(id=uuid.uuid4()), cursor="not-a-cursor")
+    assert e.value.status_code == 400
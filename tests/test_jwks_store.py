@@ -0,0 +1,90 @@
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec
+from jose import jwk, jwt
+
+from app.core import auth
+from app.core.cache import ByteBudgetLRU
+from app.core.jwks import JwksKeyStore, load_jwks_file
+
+
+def _signing_key(kid: str) -> tuple[str, dict]:
+    private = ec.generate_private_key(ec.SECP256R1())
+    pem = private.private_bytes(
+        serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption()
+    ).decode()
+    public = jwk.construct(pem, algorithm="ES256").public_key().to_dict()
+    return pem, {**public, "kid": kid, "use": "sig"}
+
+
+def _token(pem: str, kid: str) -> str:
+    return jwt.encode({"sub": "u1", "exp": int(time.time()) + 3600}, pem, algorithm="ES256", headers={"kid": kid})
+
+
+def test_es256_tokens_verify_against_a_local_jwks_file(tmp_path, monkeypatch) -> None:
+    old_pem, old_jwk = _signing_key("k1")
+    new_pem, new_jwk = _signing_key("k2")
+    path = tmp_path / "jwks.json"
+    path.write_text(json.dumps({"keys": [old_jwk]}))
+
+    fetches = []
+    now = [0.0]
+    store = JwksKeyStore(
+        lambda: fetches.append(now[0]) or load_jwks_file(str(path)),
+        ttl_sec=600,
+        refetch_interval_sec=30,
+        clock=lambda: now[0],
+    )
+    monkeypatch.setattr(auth, "_jwks_store", store)
+    monkeypatch.setattr(auth, "_verified_tokens", ByteBudgetLRU(0, sizeof=lambda _p: 1))
+
+    assert auth.verify_supabase_jwt(_token(old_pem, "k1"))["sub"] == "u1"
+    assert auth.verify_supabase_jwt(_token(old_pem, "k1"))["sub"] == "u1"
+    assert len(fetches) == 1  # parsed keys are reused
+
+    # Rotation: an unknown kid refetches once, then the new key verifies.
+    path.write_text(json.dumps({"keys": [old_jwk, new_jwk]}))
+    now[0] += 60
+    assert auth.verify_supabase_jwt(_token(new_pem, "k2"))["sub"] == "u1"
+    assert len(fetches) == 2
+
+    # Unknown kids within the refetch interval do not hit the source again.
+    assert auth.verify_supabase_jwt(_token(new_pem, "k3")) is None
+    assert len(fetches) == 2
+
+
+def test_stale_keys_are_served_while_refreshing_in_background(tmp_path) -> None:
+    _, key = _signing_key("k1")
+    path = tmp_path / "jwks.json"
+    path.write_text(json.dumps({"keys": [key]}))
+    now = [0.0]
+    store = JwksKeyStore(lambda: load_jwks_file(str(path)), ttl_sec=600, refetch_interval_sec=30, clock=lambda: now[0])
+    assert store.get("k1") is not None
+
+    path.write_text(json.dumps({"keys": []}))
+    now[0] += 601
+    assert store.get("k1") is not None  # stale copy, refresh started
+    store._refresher.join(timeout=5)
+    assert store.get("k1") is None
+
+
+def test_concurrent_cold_start_shares_one_fetch(tmp_path) -> None:
+    _, key = _signing_key("k1")
+    path = tmp_path / "jwks.json"
+    path.write_text(json.dumps({"keys": [key]}))
+    fetches = []
+
+    def slow_fetch() -> dict:
+        fetches.append(1)
+        time.sleep(0.2)
+        return load_jwks_file(str(path))
+
+    store = JwksKeyStore(slow_fetch, ttl_sec=600, refetch_interval_sec=30)
+    with ThreadPoolExecutor(8) as pool:
+        found = list(pool.map(lambda kid: store.get(kid), ["k1"] * 4 + ["k9"] * 4))
+
+    assert len(fetches) == 1  # everyone else waited for it
+    assert [k is not None for k in found] == [True] * 4 + [False] * 4
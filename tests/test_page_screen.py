@@ -0,0 +1,38 @@
+from types import SimpleNamespace
+
+import pytest
+from pdfminer.pdftypes import PDFStream
+
+from app.strategies.page_screen import has_table_candidates
+from app.strategies.table_extraction import PdfplumberTableExtractor
+
+
+def _page(ops: bytes) -> SimpleNamespace:
+    return SimpleNamespace(contents=[PDFStream({}, ops)], resources={})
+
+
+@pytest.mark.parametrize(
+    ("ops", "expected"),
+    [
+        (b"BT /F1 12 Tf 72 720 Td (Plain text, l re m) Tj ET", False),
+        (b"72 700 m 540 700 l S", False),  # a single rule
+        (b"72 700 m 540 700 l 72 680 m 540 680 l S", False),  # rules without verticals
+        (b"72 600 200 100 re f", True),
+        (b"72 700 m 540 700 l 540 600 l 72 600 l h S", True),
+        (b"72 700 m 100 720 120 720 150 700 c S", True),  # curves are not judged
+        (b"0 1 -1 0 0 0 cm 72 700 m 540 700 l S", True),  # rotated coordinates
+        (b"/Fm0 Do", True),  # form content is not inspected
+    ],
+)
+def test_screen_keeps_any_page_that_could_hold_a_ruled_cell(ops: bytes, expected: bool) -> None:
+    assert has_table_candidates(_page(ops)) is expected  # type: ignore[arg-type]
+
+
+def test_prescreen_skips_pages_without_tables_and_reports_them(make_pdf) -> None:
+    content = make_pdf(n_pages=6, table_every=3)
+    with PdfplumberTableExtractor().open_document(content) as document:
+        full = PdfplumberTableExtractor().extract_tables(document)
+    with PdfplumberTableExtractor(prescreen=True).open_document(content) as document:
+        screened = PdfplumberTableExtractor(prescreen=True).extract_tables(document)
+        assert document.skipped_pages == [1, 2, 4, 5]
+    assert screened == full
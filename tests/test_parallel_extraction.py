@@ -0,0 +1,66 @@
+import os
+import signal
+
+import pytest
+
+from app.strategies import parallel_extraction
+from app.strategies.parallel_extraction import ProcessPoolTableExtractor
+from app.strategies.table_extraction import ExtractionAborted, PdfplumberTableExtractor
+
+
+@pytest.fixture
+def pool_extractor():
+    yield ProcessPoolTableExtractor(workers=2, chunk_pages=2)
+    parallel_extraction.shutdown_pool()
+
+
+def _sequential(pdf: bytes, pages=None):
+    extractor = PdfplumberTableExtractor()
+    with extractor.open_document(pdf) as document:
+        return extractor.extract_tables(document, pages=pages)
+
+
+def test_pool_keeps_page_order_across_chunks(make_pdf, pool_extractor) -> None:
+    pdf = make_pdf(n_pages=9)
+    progress: list[tuple[int, int]] = []
+    with pool_extractor.open_document(pdf) as document:
+        result = pool_extractor.extract_tables(document, progress=lambda d, t: progress.append((d, t)))
+        subset = pool_extractor.extract_tables(document, pages=[2, 3, 7, 8, 9])
+    assert [p for p, _ in result] == list(range(1, 10))
+    assert result == _sequential(pdf)
+    assert subset == _sequential(pdf, pages=[2, 3, 7, 8, 9])
+    assert progress[-1] == (9, 9)
+
+
+def test_single_chunk_runs_in_process(make_pdf, pool_extractor) -> None:
+    pdf = make_pdf(n_pages=4)
+    with pool_extractor.open_document(pdf) as document:
+        assert pool_extractor.extract_tables(document, pages=[1, 2]) == _sequential(pdf, pages=[1, 2])
+    assert parallel_extraction._pool is None
+
+
+def test_killed_workers_are_replaced_and_chunks_retried(make_pdf, pool_extractor) -> None:
+    pdf = make_pdf(n_pages=6)
+    parallel_extraction.warm_pool(2, 0)
+    pool = parallel_extraction._pool
+    for pid in list(pool._processes):  # type: ignore[union-attr]
+        os.kill(pid, signal.SIGKILL)
+    with pool_extractor.open_document(pdf) as document:
+        assert pool_extractor.extract_tables(document) == _sequential(pdf)
+    assert parallel_extraction._pool is not pool
+
+
+def test_cpu_budget_aborts_only_that_document(make_pdf) -> None:
+    extractor = ProcessPoolTableExtractor(workers=1, chunk_pages=2, cpu_seconds=1)
+    try:
+        heavy = make_pdf(n_pages=8, rows=150, cols=8, table_every=1)
+        with extractor.open_document(heavy) as document:
+            with pytest.raises(ExtractionAborted):
+                extractor.extract_tables(document)
+        pool = parallel_extraction._pool
+        small = make_pdf(n_pages=4)
+        with extractor.open_document(small) as document:
+            assert extractor.extract_tables(document) == _sequential(small)
+        assert parallel_extraction._pool is pool
+    finally:
+        parallel_extraction.shutdown_pool()
@@ -0,0 +1,29 @@
+import re
+
+import pytest
+
+from app.strategies.pdf_probe import PdfProbeError, probe_pdf
+from app.strategies.table_extraction import PdfplumberTableExtractor
+
+
+def test_probe_counts_pages_without_opening_pdfplumber(make_pdf) -> None:
+    content = make_pdf(n_pages=7)
+    probe = probe_pdf(content)
+    assert (probe.page_count, probe.version, probe.encrypted, probe.repaired) == (7, "1.4", False, False)
+
+    with PdfplumberTableExtractor().open_document(content) as document:
+        assert document.page_count == 7
+        assert "pdf" not in vars(document)
+        assert len(document.pdf.pages) == 7
+
+
+def test_probe_rebuilds_a_broken_xref(make_pdf) -> None:
+    content = re.sub(rb"startxref\s+\d+", b"startxref\n999999", make_pdf(n_pages=3))
+    probe = probe_pdf(content)
+    assert (probe.page_count, probe.repaired) == (3, True)
+
+
+@pytest.mark.parametrize("content", [b"not a pdf at all" * 10, b"%PDF-1.4\n" + b"\0" * 200])
+def test_probe_rejects_unreadable_documents(content: bytes) -> None:
+    with pytest.raises(PdfProbeError):
+        probe_pdf(content)
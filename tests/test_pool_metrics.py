@@ -0,0 +1,61 @@
+import threading
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, exc
+from sqlalchemy.pool import NullPool, QueuePool
+
+from app.config import settings
+from app.db.pool_metrics import PoolMetrics, metered
+from app.main import app
+
+
+def test_saturated_and_exhausted_checkouts_are_counted(tmp_path) -> None:
+    metrics = PoolMetrics("test")
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'db.sqlite'}",
+        poolclass=metered(QueuePool, metrics),
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=0.3,
+    )
+    held = engine.connect()
+    with pytest.raises(exc.TimeoutError):
+        engine.connect()
+
+    # A checkout that queues until the held connection comes back.
+    threading.Timer(0.1, held.close).start()
+    with engine.connect():
+        pass
+
+    stats = metrics.stats()
+    assert (stats.checkouts, stats.saturated, stats.exhausted) == (2, 2, 1)
+    assert stats.wait_ms_max >= 250  # the timed-out checkout
+    assert (stats.size, stats.checked_out, stats.max_overflow) == (1, 0, 0)
+
+    engine.dispose()  # the recreated pool keeps reporting into the same metrics
+    with engine.connect():
+        assert metrics.stats().checkouts == 3
+        assert metrics.stats().checked_out == 1
+
+
+def test_null_pool_counts_checkouts_without_sizing(tmp_path) -> None:
+    metrics = PoolMetrics("test")
+    engine = create_engine(f"sqlite:///{tmp_path / 'db.sqlite'}", poolclass=metered(NullPool, metrics))
+    with engine.connect():
+        pass
+    stats = metrics.stats()
+    assert (stats.checkouts, stats.saturated, stats.size) == (1, 0, None)
+
+
+def test_health_pool_reports_each_engine_to_the_ops_token_only(monkeypatch) -> None:
+    client = TestClient(app)
+    assert client.get("/health/pool").status_code == 404  # disabled without OPS_TOKEN
+
+    monkeypatch.setattr(settings, "ops_token", "s3cret")
+    assert client.get("/health/pool").status_code == 401
+    assert client.get("/health/pool", headers={"Authorization": "Bearer nope"}).status_code == 401
+    body = client.get("/health/pool", headers={"Authorization": "Bearer s3cret"}).json()
+    assert set(body["pools"]) == {"sync", "async"}
+    assert body["threadpool_size"] > 0
+    assert {"checkouts", "saturated", "exhausted", "wait_ms_max"} <= set(body["pools"]["sync"])
@@ -0,0 +1,40 @@
+import uuid
+from datetime import datetime, timezone
+
+from sqlalchemy import select
+
+from app.models.audit_log import AuditLog
+from app.repositories.conversion_repository import ConversionRepository
+
+SINCE = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+def test_history_listing_walks_the_user_index_without_sorting(explained_db) -> None:
+    db, plans = explained_db
+    ConversionRepository(db).list_by_user(uuid.uuid4(), limit=20)
+    assert "USING INDEX ix_conversions_user_id_created_at_id " in plans[-1]
+    assert "TEMP B-TREE" not in plans[-1]
+
+
+def test_successful_conversions_in_window_use_the_partial_index(explained_db) -> None:
+    db, plans = explained_db
+    ConversionRepository(db).count_success_by_user_since(uuid.uuid4(), SINCE)
+    assert "ix_conversions_user_id_created_at_success (user_id=? AND created_at>?)" in plans[-1]
+
+
+def test_audit_log_by_user_and_time_uses_the_composite_index(explained_db) -> None:
+    db, plans = explained_db
+    db.execute(
+        select(AuditLog)
+        .where(AuditLog.user_id == uuid.uuid4(), AuditLog.created_at >= SINCE)
+        .order_by(AuditLog.created_at)
+    )
+    assert "ix_audit_logs_user_id_created_at (user_id=? AND created_at>?)" in plans[-1]
+    assert "TEMP B-TREE" not in plans[-1]
+
+
+def test_keyset_page_seeks_into_the_history_index(explained_db) -> None:
+    db, plans = explained_db
+    ConversionRepository(db).list_by_user(uuid.uuid4(), limit=20, before=(SINCE, uuid.uuid4()))
+    assert "USING INDEX ix_conversions_user_id_created_at_id (user_id=? AND " in plans[-1]
+    assert "TEMP B-TREE" not in plans[-1]
@@ -0,0 +1,45 @@
+import socketserver
+import threading
+
+from app.services.resp_kv import RespKeyValueStore
+
+
+class _MiniRespHandler(socketserver.StreamRequestHandler):
+    """Just enough of a Redis-compatible server: GET, SET (PX ignored), DEL."""
+
+    def handle(self) -> None:
+        data: dict[bytes, bytes] = self.server.data  # type: ignore[attr-defined]
+        while line := self.rfile.readline():
+            args = []
+            for _ in range(int(line[1:])):
+                n = int(self.rfile.readline()[1:])
+                args.append(self.rfile.read(n + 2)[:-2])
+            cmd = args[0].upper()
+            if cmd == b"GET":
+                value = data.get(args[1])
+                reply = b"$-1\r\n" if value is None else b"$%d\r\n%s\r\n" % (len(value), value)
+            elif cmd == b"SET":
+                data[args[1]] = args[2]
+                reply = b"+OK\r\n"
+            else:
+                reply = b":%d\r\n" % int(data.pop(args[1], None) is not None)
+            self.wfile.write(reply)
+
+
+def test_resp_store_round_trips_bytes_and_json() -> None:
+    server = socketserver.ThreadingTCPServer(("127.0.0.1", 0), _MiniRespHandler)
+    server.daemon_threads = True
+    server.block_on_close = False
+    server.data = {}  # type: ignore[attr-defined]
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        store = RespKeyValueStore(f"redis://127.0.0.1:{server.server_address[1]}")
+        store.set("blob", b"\x00xlsx\r\n", ttl_sec=60)
+        store.set("job", {"id": "1", "status": "queued", "error": None}, ttl_sec=60)
+        assert store.get("blob") == b"\x00xlsx\r\n"
+        assert store.get("job") == {"id": "1", "status": "queued", "error": None}
+        store.delete("blob")
+        assert store.get("blob") is None
+    finally:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,76 @@
+import uuid
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app import dependencies
+from app.core.cache import ByteBudgetLRU
+from app.db.session import get_db
+from app.main import app
+from app.models.audit_log import AuditLog
+from app.models.base import Base
+from app.models.conversion import Conversion
+from app.models.usage_counter import UsageCounter
+from app.models.user import User
+from app.services import audit
+from app.services.audit import BufferedAuditSink
+
+
+@pytest.fixture
+def client(monkeypatch):
+    engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+    Base.metadata.create_all(engine)
+    sessions = sessionmaker(bind=engine)
+    commits = []
+    event.listen(engine, "commit", lambda _conn: commits.append(1))
+
+    def db():
+        with sessions() as session:
+            yield session
+
+    user_id = uuid.uuid4()
+    with sessions() as session:
+        session.add(User(id=user_id, email="a@example.com", plan="FREE"))
+        session.commit()
+    monkeypatch.setattr(dependencies, "verify_supabase_jwt", lambda _t: {"sub": str(user_id)})
+    monkeypatch.setattr(dependencies, "user_cache", ByteBudgetLRU(0, sizeof=lambda _u: 1))
+    monkeypatch.setitem(app.dependency_overrides, get_db, db)
+    # Flushed only on close, so the request's own commits can be counted.
+    sink = BufferedAuditSink(sessions, queue_size=100, batch_size=100, flush_interval_sec=60, enqueue_timeout_sec=1)
+    monkeypatch.setattr(audit, "get_audit_sink", lambda: sink)
+    commits.clear()
+    yield TestClient(app, headers={"Authorization": "Bearer t"}), sessions, commits, sink
+    sink.close()
+
+
+def _convert(client: TestClient, pdf: bytes):
+    return client.post("/api/v1/convert/pdf-to-excel", files={"file": ("a.pdf", pdf, "application/pdf")})
+
+
+def test_conversion_is_recorded_in_one_transaction_after_the_quota_reservation(client, make_pdf) -> None:
+    http, sessions, commits, sink = client
+    response = _convert(http, make_pdf(n_pages=2))
+    assert response.status_code == 200
+
+    assert len(commits) == 2  # reserve the quota slot, then the staged outcome
+    sink.close()  # the request event, buffered
+    with sessions() as db:
+        assert [c.status for c in db.query(Conversion)] == ["success"]
+        assert sorted(a.action for a in db.query(AuditLog)) == ["CONVERSION_REQUEST", "CONVERSION_SUCCESS"]
+        assert [u.used for u in db.query(UsageCounter)] == [1]
+
+
+def test_failed_conversion_releases_the_slot_in_the_same_transaction(client, make_pdf) -> None:
+    http, sessions, commits, sink = client
+    response = _convert(http, make_pdf(n_pages=2, table_every=5))
+    assert response.status_code == 422
+
+    assert len(commits) == 2
+    sink.close()
+    with sessions() as db:
+        assert [c.status for c in db.query(Conversion)] == ["failed"]
+        assert sorted(a.action for a in db.query(AuditLog)) == ["CONVERSION_FAILED", "CONVERSION_REQUEST"]
+        assert [u.used for u in db.query(UsageCounter)] == [0]
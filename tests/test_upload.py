@@ -0,0 +1,61 @@
+import io
+import mmap
+
+import pytest
+from fastapi import FastAPI, Request, UploadFile
+from fastapi.testclient import TestClient
+
+from app.core.upload_limit import UploadSizeLimitMiddleware
+from app.services.upload import UploadTooLarge, read_pdf_upload
+from app.strategies.table_extraction import PdfplumberDocument
+
+
+@pytest.fixture
+def client() -> TestClient:
+    app = FastAPI()
+    app.add_middleware(UploadSizeLimitMiddleware, max_file_bytes=1024, path_prefix="/api/v1/convert")
+
+    @app.post("/api/v1/convert/pdf-to-excel")
+    async def convert(request: Request) -> dict:
+        return {"received": len(await request.body())}
+
+    @app.post("/other")
+    async def other(request: Request) -> dict:
+        return {"received": len(await request.body())}
+
+    return TestClient(app)
+
+
+def test_content_length_over_cap_is_rejected_up_front(client: TestClient) -> None:
+    response = client.post("/api/v1/convert/pdf-to-excel", content=b"x" * (1024 + 64 * 1024 + 1))
+    assert response.status_code == 413
+    assert response.json() == {"detail": "File too large. Maximum size is 0 MB."}
+    assert client.post("/other", content=b"x" * 200_000).json() == {"received": 200_000}
+
+
+def test_chunked_body_is_cut_off_once_it_crosses_the_cap(client: TestClient) -> None:
+    def body():
+        for _ in range(100):
+            yield b"x" * 1024
+
+    response = client.post("/api/v1/convert/pdf-to-excel", content=body())
+    assert response.status_code == 413
+    small = client.post("/api/v1/convert/pdf-to-excel", content=iter([b"x" * 10, b"y" * 10]))
+    assert small.json() == {"received": 20}
+
+
+def test_spool_rejects_uploads_over_max_bytes() -> None:
+    raw = io.BytesIO(b"x" * 3000)
+    with pytest.raises(UploadTooLarge):
+        read_pdf_upload(UploadFile(file=raw), max_bytes=2999)
+    assert raw.closed
+
+
+def test_spooled_upload_backs_the_parsed_document(make_pdf) -> None:
+    pdf = make_pdf(n_pages=3)
+    with read_pdf_upload(UploadFile(file=io.BytesIO(pdf)), max_bytes=len(pdf)) as upload:
+        assert isinstance(upload.buffer, mmap.mmap)
+        assert upload.size == len(pdf) and upload.buffer[:] == pdf
+        with PdfplumberDocument(upload.buffer) as document:
+            assert document.page_count == 3
+            assert document.pdf.pages[1].extract_tables()
@@ -0,0 +1,59 @@
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.models.base import Base
+from app.models.user import User
+from app.repositories.usage_counter_repository import UsageCounterRepository
+from app.services.usage_limits import UsageLimitExceeded, release_conversion, reserve_conversion
+from app.services.usage_window import current_month_window
+
+
+@pytest.fixture
+def sessions(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'usage.db'}", connect_args={"timeout": 30})
+    Base.metadata.create_all(engine)
+    return sessionmaker(bind=engine)
+
+
+def _user(sessions, limit: int) -> User:
+    user = User(id=uuid.uuid4(), plan="FREE", conversions_limit=limit, conversions_used=0)
+    with sessions(expire_on_commit=False) as db:
+        db.add(user)
+        db.commit()
+    return user
+
+
+def test_parallel_reservations_never_exceed_the_limit(sessions) -> None:
+    user = _user(sessions, limit=3)
+
+    def reserve(_: int) -> bool:
+        with sessions() as db:
+            try:
+                reserve_conversion(user, UsageCounterRepository(db))
+                return True
+            except UsageLimitExceeded:
+                return False
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        granted = list(pool.map(reserve, range(8)))
+    assert granted.count(True) == 3
+    with sessions() as db:
+        assert UsageCounterRepository(db).get_used(user.id, current_month_window().period_start) == 3
+
+
+def test_released_slots_can_be_taken_again(sessions) -> None:
+    user = _user(sessions, limit=1)
+    with sessions() as db:
+        repo = UsageCounterRepository(db)
+        reservation = reserve_conversion(user, repo)
+        with pytest.raises(UsageLimitExceeded) as e:
+            reserve_conversion(user, repo)
+        assert (e.value.detail["used"], e.value.detail["limit"]) == (1, 1)
+
+        release_conversion(reservation, repo)
+        assert repo.get_used(user.id, reservation.period_start) == 0
+        reserve_conversion(user, repo)
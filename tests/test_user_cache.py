@@ -0,0 +1,73 @@
+import uuid
+
+import pytest
+from fastapi.security import HTTPAuthorizationCredentials
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from app import dependencies
+from app.core.cache import ByteBudgetLRU
+from app.models.base import Base
+from app.repositories.user_repository import AsyncUserRepository, UserRepository
+
+
+def test_user_is_verified_once_and_served_from_cache(monkeypatch) -> None:
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    sessions = sessionmaker(bind=engine)
+    user_queries = []
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _record(_conn, _cursor, statement, *_args) -> None:
+        if statement.startswith("SELECT") and "FROM users" in statement:
+            user_queries.append(statement)
+
+    user_id = uuid.uuid4()
+    verified = []
+    monkeypatch.setattr(
+        dependencies,
+        "verify_supabase_jwt",
+        lambda token: verified.append(token) or {"sub": str(user_id), "email": "a@example.com"},
+    )
+    monkeypatch.setattr(dependencies, "user_cache", ByteBudgetLRU(10, sizeof=lambda _u: 1, ttl_sec=30))
+    credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials="t")
+
+    def current_user(db):
+        return dependencies.get_or_create_current_user(None, UserRepository(db), credentials)  # type: ignore[arg-type]
+
+    with sessions() as db:
+        created = current_user(db)
+        assert (created.email, created.plan) == ("a@example.com", "FREE")
+    assert verified == ["t"]
+
+    user_queries.clear()
+    with sessions() as db:
+        user = current_user(db)
+        assert (user.id, user.email, user.plan) == (user_id, "a@example.com", "FREE")
+        assert user_queries == []
+
+        # A plan change flushed through the ORM drops the cached row.
+        user.plan = "PRO"
+        db.commit()
+    assert dependencies.user_cache.get(user_id) is None
+    with sessions() as db:
+        assert current_user(db).plan == "PRO"
+
+
+@pytest.mark.anyio
+async def test_async_dependency_shares_the_user_cache(async_db, monkeypatch) -> None:
+    db, statements = async_db
+    user_id = uuid.uuid4()
+    monkeypatch.setattr(dependencies, "verify_supabase_jwt", lambda _t: {"sub": str(user_id), "email": "a@example.com"})
+    monkeypatch.setattr(dependencies, "user_cache", ByteBudgetLRU(10, sizeof=lambda _u: 1, ttl_sec=30))
+    credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials="t")
+    repo = AsyncUserRepository(db)
+
+    created = await dependencies.get_or_create_current_user_async(None, repo, credentials)  # type: ignore[arg-type]
+    assert (created.id, created.email, created.plan) == (user_id, "a@example.com", "FREE")
+
+    statements.clear()
+    db.expunge_all()
+    user = await dependencies.get_or_create_current_user_async(None, repo, credentials)  # type: ignore[arg-type]
+    assert (user.id, user.plan) == (user_id, "FREE")
+    assert statements == []
@@ -0,0 +1,42 @@
+import io
+
+from openpyxl import load_workbook
+
+from app.builders.excel_builder import ExcelExportBuilder, WriteOnlyExcelExportBuilder
+from app.builders.xlsx_stream import StreamingXlsxBuilder
+
+
+def _read(data: bytes) -> dict[str, list[tuple]]:
+    wb = load_workbook(io.BytesIO(data))
+    return {ws.title: [tuple(c.value for c in row) for row in ws.iter_rows()] for ws in wb}
+
+
+def _fill(builder):
+    builder.add_sheet("Page 1").add_table([["a", "b", None], ["c & <d>", None]]).add_table([["x"]])
+    builder.add_sheet("Page 2").add_table([["1", "2"], [" padded ", "4"]])
+    return builder
+
+
+def test_streaming_builder_matches_openpyxl_layout() -> None:
+    assert _read(_fill(StreamingXlsxBuilder()).build()) == _read(_fill(ExcelExportBuilder()).build())
+    assert _read(_fill(StreamingXlsxBuilder(deflate_level=0)).build()) == _read(_fill(ExcelExportBuilder()).build())
+
+
+def test_streaming_builder_rolls_over_full_sheets() -> None:
+    builder = StreamingXlsxBuilder(max_rows=4)
+    builder.add_sheet("Page 7").add_table([[str(i)] for i in range(7)])
+    sheets = _read(builder.build())
+    assert list(sheets) == ["Page 7", "Page 7 (2)", "Page 7 (3)"]
+    assert sheets["Page 7 (2)"] == [(0,), ("3",), ("4",), ("5",)]
+
+
+def test_write_only_builder_matches_openpyxl_layout() -> None:
+    assert _read(_fill(WriteOnlyExcelExportBuilder()).build()) == _read(_fill(ExcelExportBuilder()).build())
+
+
+def test_write_only_builder_rolls_over_full_sheets() -> None:
+    builder = WriteOnlyExcelExportBuilder(max_rows=4)
+    builder.add_sheet("Page 7").add_table([[str(i)] for i in range(7)])
+    sheets = _read(builder.build())
+    assert list(sheets) == ["Page 7", "Page 7 (2)", "Page 7 (3)"]
+    assert sheets["Page 7 (2)"] == [(0,), ("3",), ("4",), ("5",)]